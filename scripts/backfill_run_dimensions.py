@@ -0,0 +1,11 @@
+"""
+Fills the run_train and run_station dimension tables from the log tables, e.g. for
+runs that were logged before the dimension tables existed.
+
+Usage: python scripts/backfill_run_dimensions.py [run id]
+"""
+import sys
+
+from src.logger.run_dimension import backfill_run_dimensions
+
+backfill_run_dimensions(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,16 @@
+"""
+Marks runs whose simulation is no longer running as finished, e.g. runs that were
+logged before the finish time of runs was recorded. Only finished runs can be
+summarized and have their results cached. Celery reports queued simulations like
+simulations whose result expired, so run it while no simulations are queued.
+
+Usage: python scripts/backfill_run_finished_at.py [run id]
+"""
+import sys
+
+from src.implementor.run import backfill_finished_runs
+
+print(
+    f"Marked {backfill_finished_runs(sys.argv[1] if len(sys.argv) > 1 else None)} "
+    "runs as finished"
+)
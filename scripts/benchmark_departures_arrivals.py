@@ -0,0 +1,34 @@
+"""
+Compares the set-based query of `LogCollector.get_departures_arrivals_all_trains`
+with pairing the departures and arrivals train by train.
+
+Usage: python scripts/benchmark_departures_arrivals.py <run id> [repetitions]
+"""
+import sys
+from timeit import timeit
+
+from pandas.testing import assert_frame_equal
+
+from src.logger.log_collector import LogCollector
+
+run_id = sys.argv[1]
+repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+log_collector = LogCollector()
+
+# pylint: disable=protected-access
+assert_frame_equal(
+    log_collector.get_departures_arrivals_all_trains(run_id),
+    log_collector._get_departures_arrivals_all_trains_per_train(run_id),
+)
+
+set_based = timeit(
+    lambda: log_collector.get_departures_arrivals_all_trains(run_id),
+    number=repetitions,
+)
+per_train = timeit(
+    lambda: log_collector._get_departures_arrivals_all_trains_per_train(run_id),
+    number=repetitions,
+)
+print(f"set-based: {set_based / repetitions * 1000:.1f} ms per call")
+print(f"per train: {per_train / repetitions * 1000:.1f} ms per call")
+print(f"speedup:   {per_train / set_based:.1f}x")
@@ -0,0 +1,99 @@
+"""
+Compares the columnar aggregation of the scalar metrics of `DataScience` with the
+row-wise `apply` it replaced on random block section times of many runs.
+
+Usage: TICK_LENGTH=<tick length> python scripts/benchmark_scalar_metrics.py
+    [runs] [block sections per run]
+"""
+import sys
+from timeit import timeit
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.data_science.data_science import DataScience
+
+run_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+section_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+rng = np.random.default_rng(0)
+enter_ticks = rng.integers(0, section_count * 5, section_count * run_count)
+edge_times_df = pd.DataFrame(
+    {
+        "run_id": np.repeat(np.arange(run_count), section_count),
+        "train_id": rng.choice(
+            [f"ice_{i}_{t}" for i in range(200) for t in ["passenger", "cargo"]],
+            section_count * run_count,
+        ),
+        "enter_tick": enter_ticks,
+        "leave_tick": enter_ticks + rng.integers(1, 300, section_count * run_count),
+        "edge_length": rng.uniform(10, 2000, section_count * run_count),
+    }
+)
+data_science = DataScience()
+
+
+def columnar() -> pd.DataFrame:
+    """The average verkehrsleistung of a config as computed by DataScience"""
+    # pylint: disable=protected-access
+    grouped_df = data_science._aggregate_edge_times_by_train_type(
+        data_science._prepare_edge_times(edge_times_df), ["run_id"]
+    )
+    grouped_df["verkehrsleistung"] = data_science._get_verkehrsleistung(
+        grouped_df["edge_length"],
+        data_science._ticks_to_seconds_float(grouped_df["leave_tick"]),
+    )
+    return grouped_df.groupby("train_type", as_index=False).agg(
+        verkehrsleistung=("verkehrsleistung", "mean")
+    )
+
+
+def row_wise() -> pd.DataFrame:
+    """The average verkehrsleistung of a config computed with row-wise apply"""
+    times_df = edge_times_df.copy()
+    times_df["train_type"] = times_df["train_id"].apply(
+        lambda train_id: train_id.split("_")[2]
+    )
+    times_df.dropna(inplace=True)
+    times_df["time"] = times_df.apply(
+        lambda row: row["leave_tick"] - row["enter_tick"], axis=1
+    )
+    grouped_df = times_df.groupby(["run_id", "train_type"]).apply(
+        lambda data: pd.Series(
+            {
+                "leave_tick": data["leave_tick"].max(),
+                "edge_length": data["edge_length"].sum(),
+            }
+        )
+    )
+    grouped_df.reset_index(inplace=True)
+    all_df = grouped_df.groupby("run_id").apply(
+        lambda data: pd.Series(
+            {
+                "train_type": "all",
+                "leave_tick": data["leave_tick"].max(),
+                "edge_length": data["edge_length"].sum(),
+            }
+        )
+    )
+    all_df.reset_index(inplace=True)
+    grouped_df = pd.concat([grouped_df, all_df], axis=0)
+    grouped_df["verkehrsleistung"] = grouped_df.apply(
+        lambda row: row["edge_length"]
+        * 3.6
+        / data_science.tick_to_second_float(row["leave_tick"]),
+        axis=1,
+    )
+    grouped_df = grouped_df.groupby(["train_type"]).agg({"verkehrsleistung": "mean"})
+    grouped_df.reset_index(inplace=True)
+    return grouped_df
+
+
+assert_frame_equal(columnar(), row_wise(), check_dtype=False)
+
+columnar_time = timeit(columnar, number=1)
+row_wise_time = timeit(row_wise, number=1)
+print(f"{run_count} runs, {len(edge_times_df)} block sections")
+print(f"columnar:  {columnar_time * 1000:.1f} ms")
+print(f"row-wise:  {row_wise_time * 1000:.1f} ms")
+print(f"speedup:   {row_wise_time / columnar_time:.1f}x")
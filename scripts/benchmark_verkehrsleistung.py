@@ -0,0 +1,50 @@
+"""
+Compares the vectorized momentary Verkehrsleistung of `DataScience` with
+computing it tick by tick on random block section times.
+
+Usage: TICK_LENGTH=<tick length> python scripts/benchmark_verkehrsleistung.py
+    [block sections] [runs]
+"""
+import sys
+from timeit import timeit
+
+import numpy as np
+import pandas as pd
+
+from src.data_science.data_science import DataScience
+
+section_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+run_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+rng = np.random.default_rng(0)
+enter_ticks = rng.integers(0, section_count * 5, section_count * run_count)
+edge_times_df = pd.DataFrame(
+    {
+        "run_id": np.repeat(np.arange(run_count), section_count),
+        "enter_tick": enter_ticks,
+        "leave_tick": enter_ticks + rng.integers(1, 300, section_count * run_count),
+        "edge_length": rng.uniform(10, 2000, section_count * run_count),
+    }
+)
+data_science = DataScience()
+delta_tick = int(10 / data_science.tick_to_second_float(1))
+ticks = np.arange(0, edge_times_df["leave_tick"].max() + 1, delta_tick)
+
+# pylint: disable=protected-access
+vectorized = data_science._calculate_verkehrsleistung_momentarily_multiple_runs
+per_tick = data_science._calculate_verkehrsleistung_momentarily_by_tick_multiple_runs
+
+np.testing.assert_allclose(
+    vectorized(edge_times_df, ticks, delta_tick),
+    [per_tick(edge_times_df, tick, delta_tick) for tick in ticks],
+    rtol=1e-9,
+    atol=1e-6,
+)
+
+vectorized_time = timeit(lambda: vectorized(edge_times_df, ticks, delta_tick), number=1)
+per_tick_time = timeit(
+    lambda: [per_tick(edge_times_df, tick, delta_tick) for tick in ticks], number=1
+)
+print(f"{len(ticks)} ticks, {len(edge_times_df)} block sections")
+print(f"vectorized: {vectorized_time * 1000:.1f} ms")
+print(f"per tick:   {per_tick_time * 1000:.1f} ms")
+print(f"speedup:    {per_tick_time / vectorized_time:.1f}x")
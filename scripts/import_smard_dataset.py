@@ -0,0 +1,28 @@
+"""
+Packs the SMARD data into a dataset file, which SmardApi reads instead of the SMARD API
+when SMARD_DATASET_PATH is set. The data is read from a directory of data batches like
+data/spawner/mock_smard_api_data or, if no directory is given, from the SMARD entries in
+the database.
+
+Usage: python scripts/import_smard_dataset.py <dataset path> [json directory]
+"""
+import sys
+
+from src.schedule.smard_api import SmardApiEntry
+from src.schedule.smard_dataset import (
+    MILLISECONDS_PER_SECOND,
+    series_from_json_directory,
+    write_smard_dataset,
+)
+
+if len(sys.argv) > 2:
+    series = series_from_json_directory(sys.argv[2])
+else:
+    series = [
+        (int(timestamp.timestamp() * MILLISECONDS_PER_SECOND), value)
+        for timestamp, value in SmardApiEntry.select(
+            SmardApiEntry.timestamp, SmardApiEntry.value
+        ).tuples()
+    ]
+write_smard_dataset(sys.argv[1], series)
+print(f"Packed {len(series)} values into {sys.argv[1]}")
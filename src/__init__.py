@@ -14,6 +14,7 @@ from src.api.schedule import bp as schedule_bp
 from src.api.simulation import bp as simulation_bp
 from src.api.token import bp as token_bp
 from src.data_science.grafana_data_registration import define_and_register_data
+from src.data_science.grafana_http_cache import register_http_cache
 from src.implementor.models import Token
 from src.implementor.permission import Permission
 from src.implementor.token import hash_token
@@ -129,6 +130,7 @@ def create_app(test_config=None) -> Flask:
     app.register_blueprint(simulation_bp)
     app.register_blueprint(token_bp)
     app.register_blueprint(pandas_component, url_prefix="/pandas-component")
+    register_http_cache(app)
 
     define_and_register_data()
     initialize_grafana()
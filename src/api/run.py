@@ -29,6 +29,24 @@ def create_run(token):
     return impl.run.create_run(body, token)
 
 
+@bp.route("/run/cache", methods=["get"])
+@token_required()
+def get_result_cache_stats(token):
+    """Get the stats of the result cache"""
+    options = {}
+
+    return impl.run.get_result_cache_stats(options, token)
+
+
+@bp.route("/run/coalescing", methods=["get"])
+@token_required()
+def get_coalescing_stats(token):
+    """Get the stats of coalesced computations"""
+    options = {}
+
+    return impl.run.get_coalescing_stats(options, token)
+
+
 @bp.route("/run/<identifier>", methods=["get"])
 @token_required()
 def get_run(identifier, token):
@@ -47,3 +65,23 @@ def delete_run(identifier, token):
     options["identifier"] = identifier
 
     return impl.run.delete_run(options, token)
+
+
+@bp.route("/run/<identifier>/archive", methods=["get"])
+@token_required()
+def get_run_archive(identifier, token):
+    """Download the log archive of a run"""
+    options = {}
+    options["identifier"] = identifier
+
+    return impl.run.get_run_archive(options, token)
+
+
+@bp.route("/run/<identifier>/summary", methods=["post"])
+@token_required()
+def create_run_summary(identifier, token):
+    """Materialize the summaries of a finished run"""
+    options = {}
+    options["identifier"] = identifier
+
+    return impl.run.create_run_summary(options, token)
@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 from src.implementor.permission import Permission
 
@@ -31,6 +31,9 @@ class RandomScheduleConfiguration(ScheduleConfiguration):
 
     random_strategy_trains_per_1000_ticks = fields.Float(required=True)
     random_strategy_seed = fields.Integer(required=True)
+    random_strategy_arrival_process = fields.String(
+        validate=validate.OneOf(["sequential", "bernoulli", "poisson"])
+    )
 
 
 class RegularScheduleConfiguration(ScheduleConfiguration):
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import os
 import pickle
+import traceback
 from typing import Callable, List
 from uuid import UUID
 
@@ -201,6 +202,17 @@ class Communicator:
         process = AsyncResult(progress_id)
         return process.status
 
+    @classmethod
+    def is_active(cls, process_id: str) -> bool:
+        """
+        Checks whether a simulation is still running. Celery reports queued tasks and
+        tasks whose result expired alike as PENDING, so they count as not active.
+
+        :param process_id: The id of the celery task
+        :return: True if the simulation started and has not ended yet
+        """
+        return cls.state(process_id) in ("STARTED", "PROGRESS", "RETRY")
+
 
 def dummy_update_state(current_tick: int, max_tick: int, sumo_running: bool):
     return None
@@ -243,5 +255,16 @@ def run_simulation_steps(
         current_tick += 1
         update_state(current_tick, max_tick, sumo_running)
 
+    for component in components:
+        try:
+            component.finish()
+        # a failing component must not keep the others from finishing
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            print(
+                f"Could not finish {type(component).__name__}\n",
+                traceback.format_exc(),
+            )
+
     sumo_running = False
     update_state(current_tick, max_tick, sumo_running)
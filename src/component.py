@@ -34,6 +34,12 @@ class Component(ABC):
         """
         raise NotImplementedError()
 
+    def finish(self):
+        """
+        Called once after the last tick of the simulation.
+        :rtype: None
+        """
+
 
 class MockComponent(Component):
     """Mock for a simple component to check if next tick is called"""
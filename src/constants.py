@@ -1,6 +1,12 @@
 from typing import Type
 
 from src.base_model import BaseModel
+from src.data_science.live_metrics import LiveMetricSnapshot, LiveStationSnapshot
+from src.data_science.run_summary import (
+    RunSpawnRetrySummary,
+    RunTrainTypeSummary,
+    RunVerkehrsleistungSummary,
+)
 from src.fault_injector.fault_configurations.platform_blocked_fault_configuration import (
     PlatformBlockedFaultConfiguration,
     PlatformBlockedFaultConfigurationXSimulationConfiguration,
@@ -30,20 +36,16 @@ from src.interlocking_component.interlocking_configuration import (
     InterlockingConfiguration,
     InterlockingConfigurationXSimulationConfiguration,
 )
-from src.logger.log_entry import (
-    CreateFahrstrasseLogEntry,
-    InjectFaultLogEntry,
-    LogEntry,
-    RemoveFahrstrasseLogEntry,
-    ResolveFaultLogEntry,
-    SetSignalLogEntry,
-    TrainArrivalLogEntry,
-    TrainDepartureLogEntry,
-    TrainEnterEdgeLogEntry,
-    TrainLeaveEdgeLogEntry,
-    TrainRemoveLogEntry,
-    TrainSpawnLogEntry,
+from src.logger.compact_log import (
+    CompactLogEvent,
+    EdgeDictionary,
+    FahrstrasseDictionary,
+    SignalDictionary,
+    StationDictionary,
+    TrainDictionary,
 )
+from src.logger.log_entry import LOG_ENTRY_MODELS
+from src.logger.run_dimension import RunStation, RunTrain
 from src.schedule.schedule_configuration import (
     ScheduleConfiguration,
     ScheduleConfigurationXSimulationPlatform,
@@ -65,18 +67,20 @@ tables: list[Type[BaseModel]] = [
     TrainSpeedFaultConfiguration,
     PlatformBlockedFaultConfiguration,
     ScheduleBlockedFaultConfiguration,
-    LogEntry,
-    TrainSpawnLogEntry,
-    TrainRemoveLogEntry,
-    TrainArrivalLogEntry,
-    TrainDepartureLogEntry,
-    CreateFahrstrasseLogEntry,
-    RemoveFahrstrasseLogEntry,
-    SetSignalLogEntry,
-    TrainEnterEdgeLogEntry,
-    TrainLeaveEdgeLogEntry,
-    InjectFaultLogEntry,
-    ResolveFaultLogEntry,
+    *LOG_ENTRY_MODELS,
+    TrainDictionary,
+    EdgeDictionary,
+    StationDictionary,
+    SignalDictionary,
+    FahrstrasseDictionary,
+    CompactLogEvent,
+    RunTrain,
+    RunStation,
+    RunTrainTypeSummary,
+    RunVerkehrsleistungSummary,
+    RunSpawnRetrySummary,
+    LiveMetricSnapshot,
+    LiveStationSnapshot,
     TrackBlockedFaultConfiguration,
     TrainPrioFaultConfiguration,
     TrackSpeedLimitFaultConfiguration,
@@ -0,0 +1,100 @@
+"""
+This module pre-computes the metrics shown by the Grafana dashboards when a run has
+finished, so they are served from the result cache when the dashboards are opened for the
+first time. Runs simulated in a celery worker are warmed by a follow-up celery task,
+whose results reach the Flask app through the disk tier of the result cache. They are not
+warmed if the disk tier is disabled.
+"""
+import os
+import traceback
+from uuid import UUID
+
+from src.communicator.celery import celery
+from src.component import Component
+from src.data_science.data_science import DataScience
+from src.event_bus.event_bus import EventBus
+from src.implementor.models import Run
+from src.logger.result_cache import result_cache
+
+RUN_DASHBOARD_METRICS = [
+    "get_faults_by_run_id",
+    "get_spawn_events_by_run_id",
+    "get_verkehrsleistung_momentarily_time_by_run_id",
+    "get_verkehrsarbeit_by_run_id",
+    "get_verkehrsleistung_by_run_id",
+]
+CONFIG_DASHBOARD_METRICS = [
+    "get_window_size_time_by_config_id",
+    "get_verkehrsleistung_time_by_config_id",
+    "get_window_by_config_id",
+    "get_window_all_by_config_id",
+    "get_verkehrsarbeit_by_config_id",
+    "get_verkehrsleistung_by_config_id",
+    "get_average_verkehrsarbeit_by_config_id",
+    "get_average_verkehrsleistung_by_config_id",
+]
+MULTI_CONFIG_DASHBOARD_METRICS = [
+    "get_window_by_multi_config",
+    "get_verkehrsarbeit_by_multi_config",
+    "get_verkehrsleistung_by_multi_config",
+]
+
+
+def warm_dashboards(run_id: UUID) -> list[str]:
+    """Computes the metrics of the run, config and multi config dashboards for a run
+    and its simulation configuration. A metric that fails is skipped, so it is computed
+    when the dashboard requests it.
+
+    :param run_id: The id of the run
+    :return: The names of the metrics that were computed
+    """
+    config_id = Run.get_by_id(run_id).simulation_configuration_id
+    data_science = DataScience()
+    metrics = (
+        [(name, run_id) for name in RUN_DASHBOARD_METRICS]
+        + [(name, config_id) for name in CONFIG_DASHBOARD_METRICS]
+        + [(name, [config_id]) for name in MULTI_CONFIG_DASHBOARD_METRICS]
+    )
+    warmed = []
+    for name, argument in metrics:
+        try:
+            getattr(data_science, name)(argument)
+        # a metric that can't be computed must not prevent warming the others
+        # pylint: disable=broad-exception-caught
+        except Exception:
+            print(f"Could not warm {name} of run {run_id}\n", traceback.format_exc())
+            continue
+        warmed.append(name)
+    return warmed
+
+
+@celery.task(ignore_result=True)
+def warm_dashboards_task(run_id: UUID):
+    """Warms the dashboards of a run in a celery worker.
+
+    :param run_id: The id of the run
+    """
+    warm_dashboards(run_id)
+
+
+class DashboardWarmer(Component):
+    """
+    Warms the dashboards of the run when the simulation is finished. It has to be added
+    after the components marking the run as finished and summarizing it.
+    """
+
+    def __init__(self, event_bus: EventBus):
+        """
+        The constructor of the dashboard warmer class
+        """
+        super().__init__(event_bus, "LOW")
+
+    def next_tick(self, tick: int):
+        pass
+
+    def finish(self):
+        if os.getenv("DISABLE_CELERY"):
+            warm_dashboards(self.event_bus.run_id)
+        # without the disk tier the results of the worker don't reach the Flask app
+        elif result_cache.directory is not None:
+            warm_dashboards_task.delay(self.event_bus.run_id)
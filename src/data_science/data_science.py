@@ -1,14 +1,36 @@
 # pylint: disable=too-many-lines
+import functools
 import os
 from datetime import timedelta
+from typing import Optional
 from uuid import UUID
 
 import numpy as np
 import pandas as pd
 from pandas import Series
 
-from src.implementor.models import Run
-from src.logger.log_collector import LogCollector
+from src.data_science.downsampling import TimeRange, downsample, filter_time_range
+from src.data_science.live_metrics import LiveMetricSnapshot, LiveStationSnapshot
+from src.data_science.run_pool import analytics_workers, map_runs
+from src.data_science.run_summary import (
+    RunTrainTypeSummary,
+    RunVerkehrsleistungSummary,
+    get_summarized_run_ids,
+    write_run_summary,
+)
+from src.implementor.models import Run, SimulationConfiguration
+from src.logger.log_collector import (
+    DEPARTURES_ARRIVALS_COLUMNS,
+    DEPARTURES_ARRIVALS_DTYPES,
+    LogCollector,
+)
+from src.logger.log_stream import concat_chunks
+from src.logger.result_cache import (
+    cached_by_config,
+    cached_by_multi_config,
+    cached_by_run,
+)
+from src.logger.run_log_collector import RunLogCollector
 from src.schedule.demand_schedule_strategy import DemandScheduleStrategy
 from src.schedule.schedule_configuration import ScheduleConfiguration
 from src.schedule.smard_api import SmardApi
@@ -17,6 +39,9 @@ from src.spawner.spawner import (
     SpawnerConfigurationXSimulationConfiguration,
 )
 
+# The momentary verkehrsleistung of finished runs is materialized for this delta tick
+SUMMARY_DELTA_TICK = int(float(10) / float(os.getenv("TICK_LENGTH")))
+
 
 # pylint: disable=too-many-public-methods
 class DataScience:
@@ -28,7 +53,7 @@ class DataScience:
 
     def __init__(self):
         """Constructor of DataScience"""
-        self.log_collector = LogCollector()
+        self.log_collector = RunLogCollector()
 
     @staticmethod
     def tick_to_second(tick: int) -> int:
@@ -48,17 +73,25 @@ class DataScience:
 
     # -- HELPERS
 
-    def get_all_stations(self) -> list[str]:
+    def get_all_stations(
+        self, run_id: Optional[UUID] = None, config_id: Optional[UUID] = None
+    ) -> list[str]:
         """Returns all stations as a list of strings
+        :param run_id: only return the stations of this run
+        :param config_id: only return the stations of runs of this config
         :return: list of stations
         """
-        return self.log_collector.get_stations()
+        return self.log_collector.get_stations(run_id=run_id, config_id=config_id)
 
-    def get_all_trains(self) -> list[str]:
+    def get_all_trains(
+        self, run_id: Optional[UUID] = None, config_id: Optional[UUID] = None
+    ) -> list[str]:
         """Returns all trains as a list of strings
+        :param run_id: only return the trains of this run
+        :param config_id: only return the trains of runs of this config
         :return: list of trains
         """
-        return self.log_collector.get_trains()
+        return self.log_collector.get_trains(run_id=run_id, config_id=config_id)
 
     def get_all_run_ids(self) -> list[str]:
         """Returns all run readable ids as a list
@@ -93,10 +126,364 @@ class DataScience:
             )
         return min_window_size
 
+    def _get_window_sizes_by_group(
+        self, values_df: pd.DataFrame, group_columns: list[str], threshold
+    ) -> pd.DataFrame:
+        """Returns the window size of every value column for every group at once. Equals
+        grouping by group_columns and aggregating every column with
+        _get_window_size_from_values_threshold.
+        :param values_df: dataframe of group columns and value columns
+        :param group_columns: columns to group by
+        :param threshold: percentage of values that have to be included into calculating the result
+        :return: dataframe of window sizes indexed by the groups
+        """
+        # pylint: disable=too-many-locals
+        values_df = values_df.dropna(subset=group_columns)
+        grouped = values_df.groupby(group_columns)
+        group_codes = grouped.ngroup().to_numpy()
+        groups = grouped.size().index
+        value_columns = [
+            column for column in values_df.columns if column not in group_columns
+        ]
+
+        window_sizes = {}
+        for column in value_columns:
+            values = pd.to_numeric(values_df[column], errors="coerce").to_numpy(
+                dtype=float, na_value=np.nan
+            )
+            valid = ~np.isnan(values)
+            # sort the values of every group into one segment of a sorted array
+            order = np.lexsort((values[valid], group_codes[valid]))
+            sorted_values = values[valid][order]
+            sorted_codes = group_codes[valid][order]
+            counts = np.bincount(sorted_codes, minlength=len(groups))
+            starts = np.cumsum(counts) - counts
+            threshold_counts = (counts * threshold).astype(int)
+
+            # a window starts at every value that is followed by threshold_count
+            # values of its group
+            positions = np.arange(len(sorted_values)) - starts[sorted_codes]
+            window_starts = np.flatnonzero(
+                positions < (counts - threshold_counts)[sorted_codes]
+            )
+            window_codes = sorted_codes[window_starts]
+            sizes = (
+                sorted_values[window_starts + threshold_counts[window_codes]]
+                - sorted_values[window_starts]
+            )
+            min_sizes = np.full(len(groups), np.inf)
+            np.minimum.at(min_sizes, window_codes, sizes)
+            # a threshold of 1 leaves no window, so the window spans all values
+            no_window = np.isinf(min_sizes) & (counts > 1)
+            min_sizes[no_window] = (
+                sorted_values[starts[no_window] + counts[no_window] - 1]
+                - sorted_values[starts[no_window]]
+            )
+            min_sizes[counts <= 1] = 0
+            window_sizes[column] = min_sizes
+        return pd.DataFrame(window_sizes, index=groups, columns=value_columns)
+
+    def _get_train_types(self, train_ids: pd.Series) -> pd.Series:
+        """Returns the train types of train ids (e.g. "passenger" of "ice_1_passenger").
+        Every distinct train id is only parsed once.
+        :param train_ids: series of train ids
+        :return: series of train types
+        """
+        codes, unique_train_ids = pd.factorize(train_ids)
+        train_types = np.array(
+            [train_id.split("_")[2] for train_id in unique_train_ids], dtype=object
+        )
+        return pd.Series(train_types[codes], index=train_ids.index, dtype=object)
+
+    def _add_config_columns(
+        self, runs_df: pd.DataFrame, runs: dict[UUID, SimulationConfiguration]
+    ) -> pd.DataFrame:
+        """Adds the id and readable id of the simulation configuration of every run
+        :param runs_df: dataframe with a run_id column
+        :param runs: simulation configurations by run id
+        :return: dataframe with config_id and config_readable_id columns
+        """
+        return runs_df.assign(
+            config_id=runs_df["run_id"].map(
+                {run_id: config.id for run_id, config in runs.items()}
+            ),
+            config_readable_id=runs_df["run_id"].map(
+                {run_id: config.readable_id for run_id, config in runs.items()}
+            ),
+        )
+
+    def _prepare_edge_times(
+        self,
+        edge_times_df: pd.DataFrame,
+        runs: Optional[dict[UUID, SimulationConfiguration]] = None,
+    ) -> pd.DataFrame:
+        """Drops incomplete block section times and adds the train type and optionally
+        the simulation configuration of every block section time
+        :param edge_times_df: dataframe of block section times
+        :param runs: simulation configurations by run id to add as columns
+        :return: dataframe of complete block section times
+        """
+        edge_times_df = edge_times_df.dropna()
+        edge_times_df = edge_times_df.assign(
+            train_type=self._get_train_types(edge_times_df["train_id"])
+        )
+        if runs is not None:
+            edge_times_df = self._add_config_columns(edge_times_df, runs)
+        return edge_times_df
+
+    def _summarize_by_train_type(
+        self, edge_times_df: pd.DataFrame, group_columns: list[str]
+    ) -> pd.DataFrame:
+        """Returns the last leave tick and the summed block section length of every train
+        type within every group
+        :param edge_times_df: prepared dataframe of block section times
+        :param group_columns: columns to group by besides the train type
+        :return: dataframe of group columns, train_type, leave_tick and edge_length
+        """
+        return edge_times_df.groupby(
+            group_columns + ["train_type"], as_index=False
+        ).agg(leave_tick=("leave_tick", "max"), edge_length=("edge_length", "sum"))
+
+    def _add_all_train_type(
+        self, train_type_df: pd.DataFrame, group_columns: list[str]
+    ) -> pd.DataFrame:
+        """Adds the last leave tick and the summed block section length of all trains
+        (train type "all") within every group to the summaries of the train types
+        :param train_type_df: dataframe of summaries by train type
+        :param group_columns: columns to group by besides the train type
+        :return: dataframe of group columns, train_type, leave_tick and edge_length
+        """
+        if len(group_columns) > 0:
+            all_df = train_type_df.groupby(group_columns, as_index=False).agg(
+                leave_tick=("leave_tick", "max"), edge_length=("edge_length", "sum")
+            )
+        else:
+            all_df = pd.DataFrame(
+                {
+                    "leave_tick": [train_type_df["leave_tick"].max()],
+                    "edge_length": [train_type_df["edge_length"].sum()],
+                }
+            )
+        all_df["train_type"] = "all"
+        columns = group_columns + ["train_type", "leave_tick", "edge_length"]
+        return pd.concat([train_type_df[columns], all_df[columns]], ignore_index=True)
+
+    def _aggregate_edge_times_by_train_type(
+        self, edge_times_df: pd.DataFrame, group_columns: list[str]
+    ) -> pd.DataFrame:
+        """Returns the last leave tick and the summed block section length of every train
+        type and of all trains (train type "all") within every group
+        :param edge_times_df: prepared dataframe of block section times
+        :param group_columns: columns to group by besides the train type
+        :return: dataframe of group columns, train_type, leave_tick and edge_length
+        """
+        return self._add_all_train_type(
+            self._summarize_by_train_type(edge_times_df, group_columns), group_columns
+        )
+
+    def _compute_run_summaries(
+        self, run_ids: list[UUID], delta_tick: Optional[int] = None
+    ) -> tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """Computes the summaries of runs from their logs. The block section times are
+        streamed in chunks ordered by run, so at most the block section times of one run
+        are held in memory at once.
+        :param run_ids: run ids
+        :param delta_tick: delta tick of the momentary verkehrsleistung, defaults to not
+            computing it
+        :return: dataframe of summaries by run and train type and dataframe of the
+            momentary verkehrsleistung of every run
+        """
+        train_type_dfs = []
+        verkehrsleistung_dfs = []
+        run_dfs = []
+        for chunk in self.log_collector.iter_edge_times_of_runs(run_ids):
+            edge_times_df = self._prepare_edge_times(chunk)
+            train_type_dfs.append(
+                self._summarize_by_train_type(edge_times_df, ["run_id"])
+            )
+            if delta_tick is None:
+                continue
+            # a run is complete once the chunks continue with the next run
+            for run_id, run_df in edge_times_df.groupby("run_id", sort=False):
+                if len(run_dfs) > 0 and run_dfs[0]["run_id"].iloc[0] != run_id:
+                    verkehrsleistung_dfs.append(
+                        self._compute_verkehrsleistung_summary(
+                            pd.concat(run_dfs, ignore_index=True), delta_tick
+                        )
+                    )
+                    run_dfs = []
+                run_dfs.append(run_df)
+        if len(run_dfs) > 0:
+            verkehrsleistung_dfs.append(
+                self._compute_verkehrsleistung_summary(
+                    pd.concat(run_dfs, ignore_index=True), delta_tick
+                )
+            )
+        train_type_df = concat_chunks(
+            [df for df in train_type_dfs if len(df) > 0],
+            ["run_id", "train_type", "leave_tick", "edge_length"],
+        )
+        # the chunks of a run may share train types
+        train_type_df = self._summarize_by_train_type(train_type_df, ["run_id"])
+        if delta_tick is None:
+            return train_type_df, None
+        return train_type_df, concat_chunks(
+            verkehrsleistung_dfs, RunVerkehrsleistungSummary.columns()
+        )
+
+    def _compute_verkehrsleistung_summary(
+        self, run_df: pd.DataFrame, delta_tick: int
+    ) -> pd.DataFrame:
+        """Computes the momentary verkehrsleistung of a run from its block section times
+        :param run_df: prepared dataframe of the block section times of one run
+        :param delta_tick: delta tick of the momentary verkehrsleistung
+        :return: dataframe of the momentary verkehrsleistung of the run
+        """
+        # one tick after the last leave tick, from where on the verkehrsleistung is 0
+        ticks = np.arange(0, run_df["leave_tick"].max() + delta_tick + 1, delta_tick)
+        return pd.DataFrame(
+            {
+                "run_id": run_df["run_id"].iloc[0],
+                "delta_tick": delta_tick,
+                "tick": ticks,
+                "verkehrsleistung": self._calculate_verkehrsleistung_momentarily(
+                    run_df, ticks, delta_tick
+                ),
+            }
+        )
+
+    def _get_run_summaries(
+        self, run_ids: list[UUID], delta_tick: Optional[int] = None
+    ) -> tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """Returns the summaries of runs. Summaries of materialized runs are read from the
+        summary tables, the ones of other runs are computed from their logs.
+        :param run_ids: run ids
+        :param delta_tick: delta tick of the momentary verkehrsleistung, defaults to not
+            returning it
+        :return: dataframe of summaries by run and train type and dataframe of the
+            momentary verkehrsleistung of every run
+        """
+        summarized = get_summarized_run_ids(run_ids)
+        if delta_tick is not None and delta_tick != SUMMARY_DELTA_TICK:
+            summarized = set()
+        summarized_run_ids = [run_id for run_id in run_ids if str(run_id) in summarized]
+        other_run_ids = [run_id for run_id in run_ids if str(run_id) not in summarized]
+        train_type_dfs = []
+        verkehrsleistung_dfs = []
+        if len(summarized_run_ids) > 0:
+            train_type_dfs.append(RunTrainTypeSummary.read(summarized_run_ids))
+            if delta_tick is not None:
+                verkehrsleistung_dfs.append(
+                    RunVerkehrsleistungSummary.read(summarized_run_ids)
+                )
+        if analytics_workers() > 1 and len(other_run_ids) > 1:
+            summaries = map_runs(
+                functools.partial(_compute_run_summaries_of_run, delta_tick=delta_tick),
+                other_run_ids,
+            )
+        elif len(other_run_ids) > 0:
+            summaries = [self._compute_run_summaries(other_run_ids, delta_tick)]
+        else:
+            summaries = []
+        for train_type_df, verkehrsleistung_df in summaries:
+            train_type_dfs.append(train_type_df)
+            verkehrsleistung_dfs.append(verkehrsleistung_df)
+        train_type_df = concat_chunks(
+            [df for df in train_type_dfs if len(df) > 0], RunTrainTypeSummary.columns()
+        )
+        if delta_tick is None:
+            return train_type_df, None
+        return train_type_df, concat_chunks(
+            [df for df in verkehrsleistung_dfs if len(df) > 0],
+            RunVerkehrsleistungSummary.columns(),
+        )
+
+    def _get_departures_arrivals_of_runs(self, run_ids: list[UUID]) -> pd.DataFrame:
+        """Returns the departures and arrivals of all trains in the given runs. The runs
+        are fetched in parallel if ANALYTICS_WORKERS is greater than 1.
+        :param run_ids: run ids
+        :return: dataframe of departures and arrivals with the id of their run
+        """
+        if analytics_workers() <= 1 or len(run_ids) <= 1:
+            return self.log_collector.get_departures_arrivals_of_runs(run_ids)
+        departures_arrivals_df = concat_chunks(
+            [
+                run_df
+                for run_df in map_runs(_get_departures_arrivals_of_run, run_ids)
+                if len(run_df) > 0
+            ],
+            DEPARTURES_ARRIVALS_COLUMNS + ["run_id"],
+            DEPARTURES_ARRIVALS_DTYPES,
+        )
+        departures_arrivals_df.sort_values(
+            ["run_id", "train_id", "departure_tick"], inplace=True
+        )
+        return departures_arrivals_df.reset_index(drop=True)
+
+    def materialize_run_summary(self, run_id: UUID):
+        """Computes the summaries of a run from its logs and stores them in the summary
+        tables, so its metrics are no longer computed from its logs
+        :param run_id: run id
+        """
+        train_type_df, verkehrsleistung_df = self._compute_run_summaries(
+            [run_id], SUMMARY_DELTA_TICK
+        )
+        write_run_summary(
+            run_id,
+            {
+                RunTrainTypeSummary: train_type_df.astype({"leave_tick": "int64"}),
+                RunVerkehrsleistungSummary: verkehrsleistung_df,
+            },
+        )
+
+    def _get_verkehrsleistung(
+        self, edge_length: pd.Series, seconds: pd.Series
+    ) -> pd.Series:
+        """Returns the verkehrsleistung in km/h of passed block section lengths
+        :param edge_length: passed length in meters
+        :param seconds: duration in seconds
+        :return: verkehrsleistung
+        """
+        return edge_length * 3.6 / seconds
+
+    def _ticks_to_seconds(self, ticks: pd.Series) -> pd.Series:
+        """Converts ticks to whole seconds like tick_to_second
+        :param ticks: ticks
+        :return: seconds
+        """
+        return (ticks.astype(float) * float(os.getenv("TICK_LENGTH"))).astype("int64")
+
+    def _ticks_to_seconds_float(self, ticks: pd.Series) -> pd.Series:
+        """Converts ticks to seconds like tick_to_second_float
+        :param ticks: ticks
+        :return: seconds
+        """
+        return ticks.astype(float) * float(os.getenv("TICK_LENGTH"))
+
+    def restrict_time_series(
+        self,
+        time_df: pd.DataFrame,
+        time_range: Optional[TimeRange] = None,
+        max_points: Optional[int] = None,
+        end_column: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Restricts a dataframe indexed by time to a time range and downsamples it to
+        the number of points a dashboard is able to show
+        :param time_df: dataframe indexed by time
+        :param time_range: first and last time, defaults to all rows
+        :param max_points: maximum number of rows, defaults to all rows
+        :param end_column: column containing the end of rows spanning a duration, these
+            are kept if they overlap the time range
+        :return: restricted dataframe"""
+        return downsample(
+            filter_time_range(time_df, time_range, end_column), max_points
+        )
+
     # -- RUN BASED
 
     # --- TIME
 
+    @cached_by_run
     def get_faults_by_run_id(self, run_id: UUID) -> pd.DataFrame:
         """Returns a dataframe of all faults of a given run id
         :param run_id: the run id
@@ -205,8 +592,69 @@ class DataScience:
         )
         return np.sum(dist_series) * 3.6 / self.tick_to_second(delta_tick)
 
+    def _get_passed_section_length_until_ticks(
+        self, edge_times_df: pd.DataFrame, ticks: np.ndarray
+    ) -> np.ndarray:
+        """Returns the summed length of all block sections passed until each of the given
+        ticks. A block section is passed at constant speed between its enter and leave tick.
+        :param edge_times_df: dataframe of block section times
+        :param ticks: sorted ticks
+        :return: passed length until each tick
+        """
+        enter_ticks = edge_times_df["enter_tick"].to_numpy(dtype=float)
+        leave_ticks = edge_times_df["leave_tick"].to_numpy(dtype=float)
+        edge_lengths = edge_times_df["edge_length"].to_numpy(dtype=float)
+        durations = leave_ticks - enter_ticks
+        # block sections passed within a single tick have no speed and count as zero
+        passed = durations > 0
+        speeds = edge_lengths[passed] / durations[passed]
+        ticks = np.asarray(ticks, dtype=float)
+
+        # each train adds its speed from entering a block section until leaving it
+        return self._get_length_at_speeds_since_ticks(
+            enter_ticks[passed], speeds, ticks
+        ) - self._get_length_at_speeds_since_ticks(leave_ticks[passed], speeds, ticks)
+
+    @staticmethod
+    def _get_length_at_speeds_since_ticks(
+        start_ticks: np.ndarray, speeds: np.ndarray, ticks: np.ndarray
+    ) -> np.ndarray:
+        """Returns the length covered until each of the given ticks by moving at the
+        given speeds since their start ticks.
+        :param start_ticks: tick each speed starts at
+        :param speeds: speeds in length per tick
+        :param ticks: sorted ticks
+        :return: covered length until each tick
+        """
+        order = np.argsort(start_ticks, kind="stable")
+        sorted_ticks = start_ticks[order]
+        speed_sums = np.concatenate([[0.0], np.cumsum(speeds[order])])
+        speed_tick_sums = np.concatenate(
+            [[0.0], np.cumsum(speeds[order] * sorted_ticks)]
+        )
+        count = np.searchsorted(sorted_ticks, ticks, side="right")
+        return ticks * speed_sums[count] - speed_tick_sums[count]
+
+    def _calculate_verkehrsleistung_momentarily(
+        self, edge_times_df: pd.DataFrame, ticks: np.ndarray, delta_tick: int
+    ) -> np.ndarray:
+        """Returns the verkehrsleistung at each of the given ticks for the duration of
+        delta_tick. Equals _calculate_verkehrsleistung_momentarily_by_tick for every tick.
+        :param edge_times_df: dataframe of block section times
+        :param ticks: sorted ticks
+        :param delta_tick: delta tick
+        :return: verkehrsleistung at each tick
+        """
+        dist = self._get_passed_section_length_until_ticks(
+            edge_times_df, ticks
+        ) - self._get_passed_section_length_until_ticks(
+            edge_times_df, ticks - delta_tick
+        )
+        return dist * 3.6 / self.tick_to_second(delta_tick)
+
+    @cached_by_run
     def get_verkehrsleistung_momentarily_time_by_run_id(
-        self, run_id: UUID, delta_tick=int(float(10) / float(os.getenv("TICK_LENGTH")))
+        self, run_id: UUID, delta_tick=SUMMARY_DELTA_TICK
     ) -> pd.DataFrame:
         """Returns the momentary verkehrsleistung over a period of time by a given run id
         :param run_id: the run id
@@ -214,26 +662,13 @@ class DataScience:
         :return: dataframe of verkehrsleistung
         """
 
-        edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-        edge_times_df.dropna(inplace=True)
-        edge_times_df["time"] = edge_times_df.apply(
-            lambda row: row["leave_tick"] - row["enter_tick"], axis=1
-        )
-        verkehrsleistung_df = pd.DataFrame(
-            {
-                "tick": np.arange(
-                    0,
-                    edge_times_df["leave_tick"].max() + 1,
-                    delta_tick,
-                )
-            }
-        )
-        verkehrsleistung_df["verkehrsleistung"] = verkehrsleistung_df.apply(
-            lambda row: self._calculate_verkehrsleistung_momentarily_by_tick(
-                edge_times_df, row["tick"], delta_tick=delta_tick
-            ),
-            axis=1,
+        train_type_df, verkehrsleistung_df = self._get_run_summaries(
+            [run_id], delta_tick
         )
+        verkehrsleistung_df = verkehrsleistung_df.loc[
+            verkehrsleistung_df["tick"] <= train_type_df["leave_tick"].max(),
+            ["tick", "verkehrsleistung"],
+        ].reset_index(drop=True)
 
         verkehrsleistung_df["time"] = verkehrsleistung_df["tick"].apply(
             lambda x: self.tick_to_second(x) + self.unix_2020
@@ -245,6 +680,34 @@ class DataScience:
         del verkehrsleistung_df["tick"]
         return verkehrsleistung_df
 
+    def get_live_metrics_by_run_id(self, run_id: UUID) -> pd.DataFrame:
+        """Returns the snapshots of the live metrics of a run, which are published while
+        the run is in progress
+        :param run_id: run id
+        :return: dataframe of live metrics over time
+        """
+        snapshot_df = LiveMetricSnapshot.read([run_id]).sort_values("tick")
+        snapshot_df["time"] = pd.to_datetime(
+            self._ticks_to_seconds(snapshot_df["tick"]) + self.unix_2020, unit="s"
+        )
+        snapshot_df.set_index("time", inplace=True)
+        return snapshot_df[
+            ["verkehrsarbeit", "verkehrsleistung", "trains_on_edges", "active_faults"]
+        ]
+
+    def get_live_station_dwell_by_run_id(self, run_id: UUID) -> pd.DataFrame:
+        """Returns the latest dwell time statistics of the stations of a run, which are
+        published while the run is in progress
+        :param run_id: run id
+        :return: dataframe of dwell time statistics in seconds by station
+        """
+        station_df = LiveStationSnapshot.read([run_id]).sort_values("station_id")
+        for column in ["dwell_mean", "dwell_min", "dwell_max"]:
+            station_df[column] = self._ticks_to_seconds_float(station_df[column])
+        return station_df[
+            ["station_id", "dwell_count", "dwell_mean", "dwell_min", "dwell_max"]
+        ].reset_index(drop=True)
+
     def get_coal_demand_by_run_id(self, run_id: UUID) -> pd.DataFrame:
         """Returns the coal demand by a given run id
         :param run_id: run id
@@ -255,6 +718,7 @@ class DataScience:
         )
         return self.get_coal_demand_by_config_id(simulation_configuration)
 
+    @cached_by_run
     def get_spawn_events_by_run_id(self, run_id: UUID) -> pd.DataFrame:
         """Returns the spawn events by a given run id
         :param run_id: run id
@@ -273,90 +737,42 @@ class DataScience:
         return spawn_df
 
     # --- SCALARS
+    @cached_by_run
     def get_verkehrsarbeit_by_run_id(self, run_id: UUID) -> pd.DataFrame:
         """Returns the verkehrsarbeit by a given run id
         :param run_id: run id
         :return: dataframe of verkehrsarbeit
         """
 
-        edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-        edge_times_df.dropna(inplace=True)
-        edge_times_df["time"] = edge_times_df.apply(
-            lambda row: row["leave_tick"] - row["enter_tick"], axis=1
-        )
-        edge_times_df["train_type"] = edge_times_df["train_id"].apply(
-            lambda train_id: train_id.split("_")[2]
-        )
-        grouped_df = edge_times_df.groupby("train_type").apply(
-            lambda data: pd.Series(
-                {
-                    "verkehrsarbeit": data["edge_length"].sum() / 1000.0,
-                }
-            )
-        )
-        grouped_df.reset_index(inplace=True)
-        all_df = pd.DataFrame(
+        train_type_df, _ = self._get_run_summaries([run_id])
+        grouped_df = self._add_all_train_type(train_type_df, [])
+        return pd.DataFrame(
             {
-                "train_type": ["all"],
-                "verkehrsarbeit": [grouped_df["verkehrsarbeit"].sum()],
+                "train_type": grouped_df["train_type"],
+                "verkehrsarbeit": grouped_df["edge_length"] / 1000.0,
             }
         )
-        grouped_df = pd.concat(
-            [grouped_df, all_df],
-            ignore_index=True,
-        )
-        grouped_df.reset_index(inplace=True)
-        del grouped_df["index"]
-        return grouped_df
 
+    @cached_by_run
     def get_verkehrsleistung_by_run_id(self, run_id: UUID) -> pd.DataFrame:
         """Returns the verkehrsleistung by a given run id
         :param run_id: run id
         :return: dataframe of verkehrsleistung
         """
-        edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-        edge_times_df.dropna(inplace=True)
-        edge_times_df["time"] = edge_times_df.apply(
-            lambda row: row["leave_tick"] - row["enter_tick"], axis=1
-        )
-        edge_times_df["train_type"] = edge_times_df["train_id"].apply(
-            lambda train_id: train_id.split("_")[2]
-        )
-
-        grouped_df = edge_times_df.groupby("train_type").apply(
-            lambda data: pd.Series(
-                {
-                    "enter_tick": 0,
-                    "leave_tick": data["leave_tick"].max(),
-                    "edge_length": data["edge_length"].sum(),
-                }
-            )
-        )
-
-        grouped_df["enter_tick"] = grouped_df["enter_tick"].astype("Int64")
-        grouped_df["leave_tick"] = grouped_df["leave_tick"].astype("Int64")
-        grouped_df.reset_index(inplace=True)
-        all_df = pd.DataFrame(
+        train_type_df, _ = self._get_run_summaries([run_id])
+        grouped_df = self._add_all_train_type(train_type_df, [])
+        grouped_df = pd.DataFrame(
             {
-                "train_type": ["all"],
-                "enter_tick": [0],
-                "leave_tick": [grouped_df["leave_tick"].max()],
-                "edge_length": [grouped_df["edge_length"].sum()],
+                "train_type": grouped_df["train_type"],
+                "enter_tick": pd.Series(0, index=grouped_df.index, dtype="Int64"),
+                "leave_tick": grouped_df["leave_tick"].astype("Int64"),
+                "edge_length": grouped_df["edge_length"],
             }
         )
-
-        grouped_df = pd.concat(
-            [grouped_df, all_df],
-            ignore_index=True,
-        )
-        grouped_df["verkehrsleistung"] = grouped_df.apply(
-            lambda row: row["edge_length"]
-            * 3.6
-            / self.tick_to_second(row["leave_tick"] - row["enter_tick"]),
-            axis=1,
+        grouped_df["verkehrsleistung"] = self._get_verkehrsleistung(
+            grouped_df["edge_length"],
+            self._ticks_to_seconds(grouped_df["leave_tick"] - grouped_df["enter_tick"]),
         )
-        grouped_df.reset_index(inplace=True)
-        del grouped_df["index"]
         return grouped_df
 
     # --- MAP
@@ -390,8 +806,8 @@ class DataScience:
         out_df.loc[out_df["arrival_tick"] > tick, "arrival_tick"] = None
         out_df.loc[out_df["departure_tick"] > tick, "departure_tick"] = None
 
-        out_df = out_df.groupby(["station_id", "train_id"]).agg(
-            lambda x: self._get_window_size_from_values_threshold(x, threshold)
+        out_df = self._get_window_sizes_by_group(
+            out_df, ["station_id", "train_id"], threshold
         )
         if out_df.empty:
             return pd.Series([0.0, 0.0])
@@ -404,6 +820,98 @@ class DataScience:
         )
         return out_df
 
+    def _get_window_size_from_sorted_values(
+        self, sorted_values: list[int], threshold
+    ) -> int:
+        """Returns the window size of sorted values and a threshold. Equals
+        _get_window_size_from_values_threshold for values without missing values.
+        :param sorted_values: sorted list of values
+        :param threshold: percentage of values that have to be included into calculating the result
+        :return: window size
+        """
+        value_count = len(sorted_values)
+        if value_count <= 1:
+            return 0
+        threshold_count = int(value_count * threshold)
+        values = np.asarray(sorted_values)
+        return int(
+            (values[threshold_count:] - values[: value_count - threshold_count]).min()
+        )
+
+    def _get_window_sizes_over_time(
+        self, departures_arrivals_df: pd.DataFrame, ticks: np.ndarray, threshold=0.9
+    ) -> pd.DataFrame:
+        """Returns the mean arrival and departure window sizes of all stations and trains
+        at each of the given ticks. Processes the arrivals and departures in tick order
+        and only updates the window sizes of groups with new events since the previous
+        tick. Equals _get_window_size_by_tick_config_id for every tick.
+        :param departures_arrivals_df: dataframe containing departure and arrival times
+        :param ticks: sorted ticks
+        :param threshold: threshold used to compute departure and arrival time windows
+        :return: dataframe of arrival and departure window sizes in seconds"""
+
+        # pylint: disable=too-many-locals
+        departures_arrivals_df = departures_arrivals_df.dropna(
+            subset=["station_id", "train_id"]
+        )
+        group_codes = (
+            departures_arrivals_df.groupby(["station_id", "train_id"])
+            .ngroup()
+            .to_numpy()
+        )
+        columns = ["arrival_tick", "departure_tick"]
+        event_ticks = []
+        event_groups = []
+        event_columns = []
+        for column_index, column in enumerate(columns):
+            values = departures_arrivals_df[column]
+            valid = values.notna().to_numpy()
+            event_ticks.append(values[valid].to_numpy(dtype="int64"))
+            event_groups.append(group_codes[valid])
+            event_columns.append(np.full(valid.sum(), column_index))
+        event_ticks = np.concatenate(event_ticks)
+        order = np.argsort(event_ticks, kind="stable")
+        event_ticks = event_ticks[order].tolist()
+        event_groups = np.concatenate(event_groups)[order].tolist()
+        event_columns = np.concatenate(event_columns)[order].tolist()
+
+        # events are added in tick order, so the values of every group stay sorted
+        group_values: dict[int, list[list[int]]] = {}
+        group_sizes: dict[int, list[int]] = {}
+        size_sums = [0, 0]
+        window_sizes = []
+        event_index = 0
+        for tick in ticks:
+            touched_groups = set()
+            while event_index < len(event_ticks) and event_ticks[event_index] <= tick:
+                group = event_groups[event_index]
+                if group not in group_values:
+                    group_values[group] = [[], []]
+                    group_sizes[group] = [0, 0]
+                group_values[group][event_columns[event_index]].append(
+                    event_ticks[event_index]
+                )
+                touched_groups.add(group)
+                event_index += 1
+            for group in touched_groups:
+                for column_index in range(len(columns)):
+                    size = self._get_window_size_from_sorted_values(
+                        group_values[group][column_index], threshold
+                    )
+                    size_sums[column_index] += size - group_sizes[group][column_index]
+                    group_sizes[group][column_index] = size
+            if len(group_sizes) == 0:
+                window_sizes.append([0.0, 0.0])
+                continue
+            window_sizes.append(
+                [
+                    self.tick_to_second_float(size_sum / len(group_sizes))
+                    for size_sum in size_sums
+                ]
+            )
+        return pd.DataFrame(window_sizes, columns=["arrival_size", "departure_size"])
+
+    @cached_by_config
     def get_window_size_time_by_config_id(
         self,
         config_id: UUID,
@@ -411,15 +919,14 @@ class DataScience:
     ) -> pd.DataFrame:
         """Returns the arrival and departure window sizes over time by a given config id
         :param config_id: config id
+        :param delta_tick: delta tick
         :return: dataframe of window size"""
-        df_list = []
-        for run_id in Run.select().where(Run.simulation_configuration == config_id):
-            departures_arrivals_df = (
-                self.log_collector.get_departures_arrivals_all_trains(run_id)
-            )
-            departures_arrivals_df["run_id"] = run_id.id
-            df_list.append(departures_arrivals_df)
-        departures_arrivals_df = pd.concat(df_list, axis=0)
+        departures_arrivals_df = self._get_departures_arrivals_of_runs(
+            [
+                run.id
+                for run in Run.select().where(Run.simulation_configuration == config_id)
+            ]
+        )
         window_size_df = pd.DataFrame(
             {
                 "tick": np.arange(
@@ -432,14 +939,12 @@ class DataScience:
                 )
             }
         )
-        result_df = window_size_df["tick"].apply(
-            lambda tick: self._get_window_size_by_tick_config_id(
-                departures_arrivals_df, tick
-            )
+        result_df = self._get_window_sizes_over_time(
+            departures_arrivals_df, window_size_df["tick"].to_numpy()
         )
 
-        window_size_df.loc[:, "arrival_size"] = result_df.iloc[:, 0]
-        window_size_df.loc[:, "departure_size"] = result_df.iloc[:, 1]
+        window_size_df.loc[:, "arrival_size"] = result_df["arrival_size"]
+        window_size_df.loc[:, "departure_size"] = result_df["departure_size"]
         window_size_df["time"] = window_size_df["tick"].apply(
             lambda x: self.tick_to_second(x) + self.unix_2020
         )
@@ -468,38 +973,55 @@ class DataScience:
             )
         return np.array(verkehrsleistung).mean()
 
+    def _calculate_verkehrsleistung_momentarily_multiple_runs(
+        self, edge_times_df: pd.DataFrame, ticks: np.ndarray, delta_tick: int
+    ) -> np.ndarray:
+        """Returns the mean verkehrsleistung of all runs at each of the given ticks for the
+        duration of delta_tick. Equals _calculate_verkehrsleistung_momentarily_by_tick_multiple_runs
+        for every tick.
+        :param edge_times_df: dataframe of block section times of multiple runs
+        :param ticks: sorted ticks
+        :param delta_tick: delta tick
+        :return: mean verkehrsleistung at each tick
+        """
+        verkehrsleistung = [
+            self._calculate_verkehrsleistung_momentarily(run_df, ticks, delta_tick)
+            for _, run_df in edge_times_df.groupby("run_id", sort=False)
+        ]
+        return np.mean(verkehrsleistung, axis=0)
+
+    @cached_by_config
     def get_verkehrsleistung_time_by_config_id(
         self,
         config_id: UUID,
-        delta_tick=int(float(10) / float(os.getenv("TICK_LENGTH"))),
+        delta_tick=SUMMARY_DELTA_TICK,
     ) -> pd.DataFrame:
         """Returns the verkehrsleistung time by a given config id
         :param config_id: config id
         :param delta_tick: delta tick
         :return: dataframe of verkehrsleistung time
         """
-        df_list = []
-        for run_id in Run.select().where(Run.simulation_configuration == config_id):
-            edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-            edge_times_df["run_id"] = run_id.id
-            df_list.append(edge_times_df)
-        edge_times_df = pd.concat(df_list, axis=0)
-        edge_times_df.dropna(inplace=True)
+        train_type_df, runs_verkehrsleistung_df = self._get_run_summaries(
+            [
+                run.id
+                for run in Run.select().where(Run.simulation_configuration == config_id)
+            ],
+            delta_tick,
+        )
+        ticks = np.arange(0, train_type_df["leave_tick"].max() + 1, delta_tick)
+        # the verkehrsleistung of a run is 0 after its summarized ticks
         verkehrsleistung_df = pd.DataFrame(
             {
-                "tick": np.arange(
-                    0,
-                    edge_times_df["leave_tick"].max() + 1,
-                    delta_tick,
+                "tick": ticks,
+                "verkehrsleistung": runs_verkehrsleistung_df.pivot(
+                    index="tick", columns="run_id", values="verkehrsleistung"
                 )
+                .reindex(ticks)
+                .fillna(0.0)
+                .mean(axis=1)
+                .to_numpy(),
             }
         )
-        verkehrsleistung_df["verkehrsleistung"] = verkehrsleistung_df.apply(
-            lambda row: self._calculate_verkehrsleistung_momentarily_by_tick_multiple_runs(
-                edge_times_df, row["tick"], delta_tick
-            ),
-            axis=1,
-        )
         verkehrsleistung_df["time"] = verkehrsleistung_df["tick"].apply(
             lambda x: self.tick_to_second(x) + self.unix_2020
         )
@@ -615,6 +1137,7 @@ class DataScience:
 
     # --- SCALAR
 
+    @cached_by_config
     def get_window_by_config_id(self, config_id: UUID, threshold=0.9) -> pd.DataFrame:
         """Returns the spawn and departure windows by config id
         :param config_id: config id
@@ -622,43 +1145,26 @@ class DataScience:
         :return: window size dataframe
         """
 
-        df_list = []
-        for run_id in Run.select().where(Run.simulation_configuration == config_id):
-            departures_arrivals_df = (
-                self.log_collector.get_departures_arrivals_all_trains(run_id)
-            )
-            departures_arrivals_df["train_type"] = departures_arrivals_df[
-                "train_id"
-            ].apply(lambda train_id: train_id.split("_")[2])
-            departures_arrivals_df["run_id"] = run_id.id
-            df_list.append(departures_arrivals_df)
-        departures_arrivals_df = pd.concat(df_list, axis=0)
+        departures_arrivals_df = self._get_departures_arrivals_of_runs(
+            [
+                run.id
+                for run in Run.select().where(Run.simulation_configuration == config_id)
+            ]
+        )
+        departures_arrivals_df["train_type"] = self._get_train_types(
+            departures_arrivals_df["train_id"]
+        )
         out_df = departures_arrivals_df[
             ["station_id", "train_id", "train_type", "arrival_tick", "departure_tick"]
         ]
-        all_df = out_df.groupby(["station_id", "train_id"]).apply(
-            lambda data: pd.Series(
-                {
-                    "train_type": "all",
-                    "arrival_tick": self._get_window_size_from_values_threshold(
-                        data["arrival_tick"], threshold
-                    ),
-                    "departure_tick": self._get_window_size_from_values_threshold(
-                        data["departure_tick"], threshold
-                    ),
-                }
-            )
-        )
-
-        all_df.reset_index(inplace=True)
-        del all_df["station_id"]
-        del all_df["train_id"]
-        out_df = out_df.groupby(["station_id", "train_id", "train_type"]).agg(
-            lambda x: self._get_window_size_from_values_threshold(x, threshold)
+        # the train type is part of the train id, so every train is one group
+        out_df = self._get_window_sizes_by_group(
+            out_df, ["station_id", "train_id", "train_type"], threshold
         )
         out_df.reset_index(inplace=True)
         del out_df["station_id"]
         del out_df["train_id"]
+        all_df = out_df.assign(train_type="all")
         out_df = pd.concat([out_df, all_df], axis=0)
         out_df = out_df.groupby("train_type").apply(
             lambda data: pd.Series(
@@ -675,6 +1181,7 @@ class DataScience:
         out_df.reset_index(inplace=True)
         return out_df
 
+    @cached_by_config
     def get_window_all_by_config_id(
         self, config_id: UUID, threshold=0.9
     ) -> pd.DataFrame:
@@ -683,19 +1190,17 @@ class DataScience:
         :param threshold: percentage of values that have to be included into calculating the result
         :return: window dataframe
         """
-        df_list = []
-        for run_id in Run.select().where(Run.simulation_configuration == config_id):
-            departures_arrivals_df = (
-                self.log_collector.get_departures_arrivals_all_trains(run_id)
-            )
-            departures_arrivals_df["run_id"] = run_id.id
-            df_list.append(departures_arrivals_df)
-        departures_arrivals_df = pd.concat(df_list, axis=0)
+        departures_arrivals_df = self._get_departures_arrivals_of_runs(
+            [
+                run.id
+                for run in Run.select().where(Run.simulation_configuration == config_id)
+            ]
+        )
         out_df = departures_arrivals_df[
             ["station_id", "train_id", "arrival_tick", "departure_tick"]
         ]
-        out_df = out_df.groupby(["station_id", "train_id"]).agg(
-            lambda x: self._get_window_size_from_values_threshold(x, threshold)
+        out_df = self._get_window_sizes_by_group(
+            out_df, ["station_id", "train_id"], threshold
         )
         out_df["arrival_second"] = out_df["arrival_tick"].apply(self.tick_to_second)
         out_df["departure_second"] = out_df["departure_tick"].apply(self.tick_to_second)
@@ -707,152 +1212,95 @@ class DataScience:
         out_df["departure_second"] = out_df["departure_second"].astype("Int64")
         return out_df
 
+    @cached_by_config
     def get_verkehrsarbeit_by_config_id(self, config_id: UUID) -> pd.DataFrame:
         """Returns the verkehrsarbeit by a given config id
         :param config_id: config id
         :return: verkehrsarbeit dataframe
         """
 
-        df_list = []
-        for run_id in Run.select().where(Run.simulation_configuration == config_id):
-            edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-            edge_times_df["run_id"] = run_id.id
-            df_list.append(edge_times_df)
-        edge_times_df = pd.concat(df_list, axis=0)
-        edge_times_df.dropna(inplace=True)
-        edge_times_df["time"] = edge_times_df.apply(
-            lambda row: row["leave_tick"] - row["enter_tick"], axis=1
-        )
-        grouped_df = edge_times_df.groupby("run_id").agg({"edge_length": "sum"})
+        train_type_df, _ = self._get_run_summaries(
+            [
+                run.id
+                for run in Run.select().where(Run.simulation_configuration == config_id)
+            ]
+        )
+        grouped_df = train_type_df.groupby("run_id").agg(
+            edge_length=("edge_length", "sum")
+        )
         grouped_df["edge_length"] = grouped_df["edge_length"] / 1000.0
         return grouped_df
 
+    @cached_by_config
     def get_verkehrsleistung_by_config_id(self, config_id: UUID) -> pd.DataFrame:
         """Returns the verkehrsleistung by a given config id
         :param config_id: config id
         :return: verkehrsleistung dataframe
         """
-        df_list = []
-        for run_id in Run.select().where(Run.simulation_configuration == config_id):
-            edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-            edge_times_df["run_id"] = run_id.id
-            df_list.append(edge_times_df)
-        edge_times_df = pd.concat(df_list, axis=0)
-        edge_times_df.dropna(inplace=True)
-        edge_times_df["time"] = edge_times_df.apply(
-            lambda row: row["leave_tick"] - row["enter_tick"], axis=1
-        )
-        grouped_df = edge_times_df.groupby("run_id").agg(
-            {"leave_tick": "max", "edge_length": "sum"}
-        )
-        grouped_df["verkehrsleistung"] = grouped_df.apply(
-            lambda row: row["edge_length"]
-            * 3.6
-            / self.tick_to_second_float(row["leave_tick"]),
-            axis=1,
+        train_type_df, _ = self._get_run_summaries(
+            [
+                run.id
+                for run in Run.select().where(Run.simulation_configuration == config_id)
+            ]
+        )
+        grouped_df = train_type_df.groupby("run_id").agg(
+            leave_tick=("leave_tick", "max"), edge_length=("edge_length", "sum")
+        )
+        grouped_df["verkehrsleistung"] = self._get_verkehrsleistung(
+            grouped_df["edge_length"],
+            self._ticks_to_seconds_float(grouped_df["leave_tick"]),
         )
         del grouped_df["leave_tick"]
         return grouped_df
 
+    @cached_by_config
     def get_average_verkehrsarbeit_by_config_id(self, config_id: UUID) -> pd.DataFrame:
         """Returns the average verkehrsarbeit by a given config id
         :param config_id: config id
         :return: verkehrsarbeit dataframe
         """
 
-        df_list = []
-        for run_id in Run.select().where(Run.simulation_configuration == config_id):
-            edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-            edge_times_df["train_type"] = edge_times_df["train_id"].apply(
-                lambda train_id: train_id.split("_")[2]
-            )
-            edge_times_df["run_id"] = run_id.id
-            df_list.append(edge_times_df)
-        edge_times_df = pd.concat(df_list, axis=0)
-        edge_times_df.dropna(inplace=True)
-        edge_times_df["time"] = edge_times_df.apply(
-            lambda row: row["leave_tick"] - row["enter_tick"], axis=1
-        )
-        grouped_df = edge_times_df.groupby(["run_id", "train_type"]).apply(
-            lambda data: pd.Series(
-                {
-                    "verkehrsarbeit": data["edge_length"].sum() / 1000.0,
-                }
-            )
+        train_type_df, _ = self._get_run_summaries(
+            [
+                run.id
+                for run in Run.select().where(Run.simulation_configuration == config_id)
+            ]
         )
-        grouped_df.reset_index(inplace=True)
-        all_df = grouped_df.groupby("run_id").apply(
-            lambda data: pd.Series(
-                {
-                    "train_type": "all",
-                    "verkehrsarbeit": data["verkehrsarbeit"].sum(),
-                }
-            )
+        grouped_df = self._add_all_train_type(train_type_df, ["run_id"])
+        grouped_df["verkehrsarbeit"] = grouped_df["edge_length"] / 1000.0
+        grouped_df = grouped_df.groupby("train_type", as_index=False).agg(
+            verkehrsarbeit=("verkehrsarbeit", "mean")
         )
-        all_df.reset_index(inplace=True)
-        grouped_df = pd.concat([grouped_df, all_df], axis=0)
-        grouped_df = grouped_df.groupby(["train_type"]).agg({"verkehrsarbeit": "mean"})
-        grouped_df.reset_index(inplace=True)
         return grouped_df
 
+    @cached_by_config
     def get_average_verkehrsleistung_by_config_id(
         self, config_id: UUID
     ) -> pd.DataFrame:
         """Returns the average verkehrsleistung by a given config id
         :param config_id: config id
         :return: verkehrsleistung dataframe"""
-        df_list = []
-        for run_id in Run.select().where(Run.simulation_configuration == config_id):
-            edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-            edge_times_df["train_type"] = edge_times_df["train_id"].apply(
-                lambda train_id: train_id.split("_")[2]
-            )
-            edge_times_df["run_id"] = run_id.id
-            df_list.append(edge_times_df)
-        edge_times_df = pd.concat(df_list, axis=0)
-        edge_times_df.dropna(inplace=True)
-        edge_times_df["time"] = edge_times_df.apply(
-            lambda row: row["leave_tick"] - row["enter_tick"], axis=1
-        )
-        grouped_df = edge_times_df.groupby(["run_id", "train_type"]).apply(
-            lambda data: pd.Series(
-                {
-                    "enter_tick": 0,
-                    "leave_tick": data["leave_tick"].max(),
-                    "edge_length": data["edge_length"].sum(),
-                }
-            )
-        )
-        grouped_df.reset_index(inplace=True)
-        all_df = grouped_df.groupby("run_id").apply(
-            lambda data: pd.Series(
-                {
-                    "train_type": "all",
-                    "enter_tick": 0,
-                    "leave_tick": data["leave_tick"].max(),
-                    "edge_length": data["edge_length"].sum(),
-                }
-            )
+        train_type_df, _ = self._get_run_summaries(
+            [
+                run.id
+                for run in Run.select().where(Run.simulation_configuration == config_id)
+            ]
         )
-        all_df.reset_index(inplace=True)
-        grouped_df = pd.concat([grouped_df, all_df], axis=0)
-
-        grouped_df["verkehrsleistung"] = grouped_df.apply(
-            lambda row: row["edge_length"]
-            * 3.6
-            / self.tick_to_second_float(row["leave_tick"]),
-            axis=1,
+        grouped_df = self._add_all_train_type(train_type_df, ["run_id"])
+        grouped_df["verkehrsleistung"] = self._get_verkehrsleistung(
+            grouped_df["edge_length"],
+            self._ticks_to_seconds_float(grouped_df["leave_tick"]),
         )
-        grouped_df = grouped_df.groupby(["train_type"]).agg(
-            {"verkehrsleistung": "mean"}
+        grouped_df = grouped_df.groupby("train_type", as_index=False).agg(
+            verkehrsleistung=("verkehrsleistung", "mean")
         )
-        grouped_df.reset_index(inplace=True)
         return grouped_df
 
     # -- MULTI CONFIG BASED
 
     # --- SCALAR
 
+    @cached_by_multi_config
     def get_window_by_multi_config(
         self, config_id_list: list[UUID], threshold=0.9
     ) -> pd.DataFrame:
@@ -861,23 +1309,17 @@ class DataScience:
         :param threshold: percentage of values that have to be included into calculating the result
         :return: window size dataframe
         """
-        df_list = []
-        for run_id in Run.select().where(
-            Run.simulation_configuration << config_id_list
-        ):
-            departures_arrivals_df = (
-                self.log_collector.get_departures_arrivals_all_trains(run_id)
-            )
-            departures_arrivals_df["train_type"] = departures_arrivals_df[
-                "train_id"
-            ].apply(lambda train_id: train_id.split("_")[2])
-            departures_arrivals_df["run_id"] = run_id.id
-            departures_arrivals_df["config_id"] = run_id.simulation_configuration.id
-            departures_arrivals_df[
-                "config_readable_id"
-            ] = run_id.simulation_configuration.readable_id
-            df_list.append(departures_arrivals_df)
-        departures_arrivals_df = pd.concat(df_list, axis=0)
+        runs = {
+            run.id: run.simulation_configuration
+            for run in Run.select(Run, SimulationConfiguration)
+            .join(SimulationConfiguration)
+            .where(Run.simulation_configuration << config_id_list)
+        }
+        departures_arrivals_df = self._get_departures_arrivals_of_runs(list(runs))
+        departures_arrivals_df["train_type"] = self._get_train_types(
+            departures_arrivals_df["train_id"]
+        )
+        departures_arrivals_df = self._add_config_columns(departures_arrivals_df, runs)
         out_df = departures_arrivals_df[
             [
                 "config_id",
@@ -889,24 +1331,15 @@ class DataScience:
                 "departure_tick",
             ]
         ]
-        all_df = out_df.groupby(
-            ["config_id", "config_readable_id", "station_id", "train_id"]
-        ).apply(
-            lambda data: pd.Series(
-                {
-                    "train_type": "all",
-                    "arrival_tick": self._get_window_size_from_values_threshold(
-                        data["arrival_tick"], threshold
-                    ),
-                    "departure_tick": self._get_window_size_from_values_threshold(
-                        data["departure_tick"], threshold
-                    ),
-                }
-            )
+        out_df = self._get_window_sizes_by_group(
+            out_df,
+            ["config_id", "config_readable_id", "station_id", "train_id", "train_type"],
+            threshold,
         )
-        all_df.reset_index(inplace=True)
-        del all_df["station_id"]
-        del all_df["train_id"]
+        out_df.reset_index(inplace=True)
+        del out_df["station_id"]
+        del out_df["train_id"]
+        all_df = out_df.assign(train_type="all")
         all_df = all_df.groupby(
             ["config_id", "config_readable_id", "train_type"]
         ).apply(
@@ -917,12 +1350,6 @@ class DataScience:
                 }
             )
         )
-        out_df = out_df.groupby(
-            ["config_id", "config_readable_id", "station_id", "train_id", "train_type"]
-        ).agg(lambda x: self._get_window_size_from_values_threshold(x, threshold))
-        out_df.reset_index(inplace=True)
-        del out_df["station_id"]
-        del out_df["train_id"]
         out_df = out_df.groupby(
             ["config_id", "config_readable_id", "train_type"]
         ).apply(
@@ -951,6 +1378,7 @@ class DataScience:
 
         return out_df
 
+    @cached_by_multi_config
     def get_verkehrsarbeit_by_multi_config(
         self, config_id_list: list[UUID]
     ) -> pd.DataFrame:
@@ -958,59 +1386,32 @@ class DataScience:
         :param config_id_list: list of simulation configuration ids
         :return: dataframe of verkehrsarbeit
         """
-        df_list = []
-        for run_id in Run.select().where(
-            Run.simulation_configuration << config_id_list
-        ):
-            edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-            edge_times_df["run_id"] = run_id.id
-            edge_times_df["config_id"] = run_id.simulation_configuration.id
-            edge_times_df[
-                "config_readable_id"
-            ] = run_id.simulation_configuration.readable_id
-            edge_times_df["train_type"] = edge_times_df["train_id"].apply(
-                lambda train_id: train_id.split("_")[2]
-            )
-            df_list.append(edge_times_df)
-        edge_times_df = pd.concat(df_list, axis=0)
-        edge_times_df.dropna(inplace=True)
-        edge_times_df["time"] = edge_times_df.apply(
-            lambda row: row["leave_tick"] - row["enter_tick"], axis=1
-        )
-        grouped_df = edge_times_df.groupby(
-            ["config_id", "config_readable_id", "run_id", "train_type"]
-        ).apply(
-            lambda data: pd.Series(
-                {
-                    "enter_tick": 0,
-                    "leave_tick": data["leave_tick"].max(),
-                    "edge_length": data["edge_length"].sum() / 1000.0,
-                }
-            )
+        runs = {
+            run.id: run.simulation_configuration
+            for run in Run.select(Run, SimulationConfiguration)
+            .join(SimulationConfiguration)
+            .where(Run.simulation_configuration << config_id_list)
+        }
+        train_type_df, _ = self._get_run_summaries(list(runs))
+        train_type_df = self._add_config_columns(train_type_df, runs)
+        config_columns = ["config_id", "config_readable_id"]
+        grouped_df = train_type_df[config_columns + ["train_type"]].assign(
+            edge_length=train_type_df["edge_length"] / 1000.0
         )
-
         grouped_df = grouped_df.groupby(
-            ["config_id", "config_readable_id", "train_type"]
-        ).agg({"edge_length": "mean"})
-        grouped_df.reset_index(inplace=True)
-        all_df = grouped_df.groupby(["config_id", "config_readable_id"]).apply(
-            lambda data: pd.Series(
-                {
-                    "train_type": "all",
-                    "edge_length": data["edge_length"].sum(),
-                }
-            )
+            config_columns + ["train_type"], as_index=False
+        ).agg(edge_length=("edge_length", "mean"))
+        all_df = grouped_df.groupby(config_columns, as_index=False).agg(
+            edge_length=("edge_length", "sum")
         )
-        all_df.reset_index(inplace=True)
+        all_df["train_type"] = "all"
         grouped_df = pd.concat([grouped_df, all_df], axis=0)
-        grouped_df.sort_values(
-            by=["config_id", "config_readable_id", "train_type"], inplace=True
-        )
-        grouped_df.reset_index(inplace=True)
-        del grouped_df["index"]
+        grouped_df.sort_values(by=config_columns + ["train_type"], inplace=True)
+        grouped_df.reset_index(drop=True, inplace=True)
         del grouped_df["config_id"]
         return grouped_df
 
+    @cached_by_multi_config
     def get_verkehrsleistung_by_multi_config(
         self, config_id_list: list[UUID]
     ) -> pd.DataFrame:
@@ -1018,64 +1419,45 @@ class DataScience:
         :param config_id_list: list of simulation configurations
         :return: dataframe of verkehrsleistung
         """
-        df_list = []
-        for run_id in Run.select().where(
-            Run.simulation_configuration << config_id_list
-        ):
-            edge_times_df = self.log_collector.get_edge_times_all_trains(run_id)
-            edge_times_df["train_type"] = edge_times_df["train_id"].apply(
-                lambda train_id: train_id.split("_")[2]
-            )
-            edge_times_df["run_id"] = run_id.id
-            edge_times_df["config_id"] = run_id.simulation_configuration.id
-            edge_times_df[
-                "config_readable_id"
-            ] = run_id.simulation_configuration.readable_id
-            df_list.append(edge_times_df)
-        edge_times_df = pd.concat(df_list, axis=0)
-        edge_times_df.dropna(inplace=True)
-        edge_times_df["time"] = edge_times_df.apply(
-            lambda row: row["leave_tick"] - row["enter_tick"], axis=1
-        )
-        grouped_df = edge_times_df.groupby(
-            ["config_id", "config_readable_id", "run_id", "train_type"]
-        ).apply(
-            lambda data: pd.Series(
-                {
-                    "enter_tick": 0,
-                    "leave_tick": data["leave_tick"].max(),
-                    "edge_length": data["edge_length"].sum(),
-                }
-            )
-        )
-        grouped_df.reset_index(inplace=True)
-        all_df = grouped_df.groupby(
-            ["config_id", "config_readable_id", "run_id"]
-        ).apply(
-            lambda data: pd.Series(
-                {
-                    "train_type": "all",
-                    "enter_tick": 0,
-                    "leave_tick": data["leave_tick"].max(),
-                    "edge_length": data["edge_length"].sum(),
-                }
-            )
-        )
-        all_df.reset_index(inplace=True)
-        grouped_df = pd.concat([grouped_df, all_df], axis=0)
-
-        grouped_df["verkehrsleistung"] = grouped_df.apply(
-            lambda row: row["edge_length"]
-            * 3.6
-            / self.tick_to_second_float(row["leave_tick"]),
-            axis=1,
+        runs = {
+            run.id: run.simulation_configuration
+            for run in Run.select(Run, SimulationConfiguration)
+            .join(SimulationConfiguration)
+            .where(Run.simulation_configuration << config_id_list)
+        }
+        train_type_df, _ = self._get_run_summaries(list(runs))
+        train_type_df = self._add_config_columns(train_type_df, runs)
+        config_columns = ["config_id", "config_readable_id"]
+        grouped_df = self._add_all_train_type(
+            train_type_df, config_columns + ["run_id"]
+        )
+        grouped_df["verkehrsleistung"] = self._get_verkehrsleistung(
+            grouped_df["edge_length"],
+            self._ticks_to_seconds_float(grouped_df["leave_tick"]),
         )
         grouped_df = grouped_df.groupby(
-            ["config_id", "config_readable_id", "train_type"]
-        ).agg({"verkehrsleistung": "mean"})
-        grouped_df.reset_index(inplace=True)
-        grouped_df.sort_values(
-            by=["config_id", "config_readable_id", "train_type"], inplace=True
-        )
+            config_columns + ["train_type"], as_index=False
+        ).agg(verkehrsleistung=("verkehrsleistung", "mean"))
+        grouped_df.sort_values(by=config_columns + ["train_type"], inplace=True)
         del grouped_df["config_id"]
         return grouped_df
+
+
+def _compute_run_summaries_of_run(
+    run_id: UUID, delta_tick: Optional[int] = None
+) -> tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+    """Computes the summaries of a run from its logs in a worker process
+    :param run_id: run id
+    :param delta_tick: delta tick of the momentary verkehrsleistung
+    :return: summaries like DataScience._compute_run_summaries
+    """
+    # pylint: disable=protected-access
+    return DataScience()._compute_run_summaries([run_id], delta_tick)
+
+
+def _get_departures_arrivals_of_run(run_id: UUID) -> pd.DataFrame:
+    """Fetches the departures and arrivals of a run in a worker process
+    :param run_id: run id
+    :return: dataframe of departures and arrivals with the id of the run
+    """
+    return DataScience().log_collector.get_departures_arrivals_of_runs([run_id])
@@ -0,0 +1,125 @@
+"""
+This module restricts time series to the time range a dashboard requests and reduces
+them to the number of points it can display. Long series are downsampled with Largest
+Triangle Three Buckets, which keeps the peaks and the shape of the series. All numeric
+columns of a series are downsampled together, so they share the same rows.
+"""
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+TimeRange = tuple[pd.Timestamp, pd.Timestamp]
+
+
+def to_naive_utc(timestamp: datetime | str) -> pd.Timestamp:
+    """Converts a timestamp to a timezone naive timestamp in UTC like the time indexes
+    of data science.
+
+    :param timestamp: The timestamp
+    :return: The timezone naive timestamp
+    """
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return timestamp
+
+
+def filter_time_range(
+    time_df: pd.DataFrame,
+    time_range: Optional[TimeRange],
+    end_column: Optional[str] = None,
+) -> pd.DataFrame:
+    """Returns the rows of a DataFrame with a time index within a time range.
+
+    :param time_df: The DataFrame, indexed by time
+    :param time_range: The first and last time, defaults to all rows
+    :param end_column: The column containing the end of rows that span a duration. Rows
+        overlapping the time range are kept, rows without an end are open.
+    :return: The rows within the time range
+    """
+    if time_range is None:
+        return time_df
+    start, end = time_range
+    mask = time_df.index <= end
+    if end_column is None:
+        mask &= time_df.index >= start
+    else:
+        mask &= (time_df[end_column] >= start).to_numpy() | time_df[
+            end_column
+        ].isna().to_numpy()
+    return time_df[mask]
+
+
+def largest_triangle_three_buckets(
+    x_values: np.ndarray, y_values: np.ndarray, max_points: int
+) -> np.ndarray:
+    """Selects the points of a series that keep its shape. The first and last point are
+    always kept, of every bucket in between the point forming the largest triangle with
+    the previous selected point and the average of the next bucket is selected. A
+    series of several values per point selects the point with the largest sum of the
+    triangles of all values. Less than three points leave no bucket, so only the first
+    and last point are selected.
+
+    :param x_values: The x values, sorted
+    :param y_values: The y values, one column per value of a point
+    :param max_points: The number of points to select, at least one
+    :return: The sorted indexes of the selected points
+    """
+    point_count = len(x_values)
+    if max_points >= point_count:
+        return np.arange(point_count)
+    if max_points < 3:
+        return np.array([0, point_count - 1][: max(max_points, 1)], dtype=np.int64)
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.nan_to_num(np.asarray(y_values, dtype=float))
+    if y_values.ndim == 1:
+        y_values = y_values[:, np.newaxis]
+    bucket_edges = np.linspace(1, point_count - 1, max_points - 1).astype(np.int64)
+    bucket_edges = np.append(bucket_edges, point_count)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = point_count - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = bucket_edges[bucket], bucket_edges[bucket + 1]
+        next_end = bucket_edges[bucket + 2]
+        average_x = x_values[end:next_end].mean()
+        average_y = y_values[end:next_end].mean(axis=0)
+        areas = np.abs(
+            (x_values[previous] - average_x)
+            * (y_values[start:end] - y_values[previous])
+            - (x_values[previous] - x_values[start:end, np.newaxis])
+            * (average_y - y_values[previous])
+        ).sum(axis=1)
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample(time_df: pd.DataFrame, max_points: Optional[int]) -> pd.DataFrame:
+    """Reduces a DataFrame with a time index to max_points rows. The rows are selected
+    on all numeric columns at once, each scaled to its range, so every column
+    contributes to the shape that is kept.
+
+    :param time_df: The DataFrame, indexed by time and sorted
+    :param max_points: The number of rows, defaults to all rows
+    :return: The downsampled DataFrame
+    """
+    if max_points is None or len(time_df) <= max_points:
+        return time_df
+    numeric_df = time_df.select_dtypes(include="number")
+    if len(numeric_df.columns) == 0:
+        return time_df
+    if isinstance(time_df.index, pd.DatetimeIndex):
+        x_values = time_df.index.asi8
+    else:
+        x_values = np.arange(len(time_df))
+    y_values = numeric_df.to_numpy(dtype=float)
+    value_range = np.nanmax(y_values, axis=0) - np.nanmin(y_values, axis=0)
+    value_range[~(value_range > 0)] = 1.0
+    selected = largest_triangle_three_buckets(
+        x_values, (y_values - np.nanmin(y_values, axis=0)) / value_range, max_points
+    )
+    return time_df.iloc[selected]
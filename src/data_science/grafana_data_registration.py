@@ -1,9 +1,14 @@
+import functools
+from typing import Callable, Optional
 from uuid import UUID
 
 import pandas as pd
+from flask import has_request_context, request
 from grafana_pandas_datasource.registry import data_generators as dg
 
 from src.data_science.data_science import DataScience
+from src.data_science.downsampling import TimeRange, to_naive_utc
+from src.data_science.single_flight import single_flight
 from src.implementor.models import Run, SimulationConfiguration
 
 
@@ -59,39 +64,117 @@ class GrafanaDataRegistrator:
         ]
         return config_ids
 
-    def get_faults_by_run_id(self, param, _) -> pd.DataFrame:
+    @staticmethod
+    def _get_finder_scope_from_param(param) -> dict[str, UUID]:
+        """Returns the scope of a finder from params. The param may be the readable
+        id of a run or of a config, otherwise the finder is not scoped.
+        :param param: Grafana params
+        :return: dict with the run_id or config_id to scope to
+        """
+        if not param:
+            return {}
+        run = Run.select(Run.id).where(param == Run.readable_id).first()
+        if run is not None:
+            return {"run_id": run.id}
+        config = (
+            SimulationConfiguration.select(SimulationConfiguration.id)
+            .where(param == SimulationConfiguration.readable_id)
+            .first()
+        )
+        if config is not None:
+            return {"config_id": config.id}
+        return {}
+
+    @staticmethod
+    def _get_time_range(ts_range) -> Optional[TimeRange]:
+        """Returns the time range requested by grafana
+        :param ts_range: Grafana time range with the bounds $gt and $lte
+        :return: first and last time or None if no time range is requested
+        """
+        if not ts_range:
+            return None
+        return to_naive_utc(ts_range["$gt"]), to_naive_utc(ts_range["$lte"])
+
+    @staticmethod
+    def _get_max_data_points() -> Optional[int]:
+        """Returns the maximum number of points the requesting grafana panel shows
+        :return: maximum number of points or None outside of a grafana query
+        """
+        if not has_request_context():
+            return None
+        body = request.get_json(silent=True) or {}
+        max_data_points = body.get("maxDataPoints")
+        return None if max_data_points is None else int(max_data_points)
+
+    def _restrict_time_series(
+        self,
+        time_df: pd.DataFrame,
+        ts_range,
+        events: bool = False,
+        end_column: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Restricts a time series to the time range and number of points requested
+        by grafana. Events are only restricted to the time range.
+        :param time_df: dataframe indexed by time
+        :param ts_range: Grafana time range
+        :param events: whether the rows are events, which must not be downsampled
+        :param end_column: column containing the end of events spanning a duration
+        :return: restricted dataframe
+        """
+        return self.data_science.restrict_time_series(
+            time_df,
+            self._get_time_range(ts_range),
+            None if events else self._get_max_data_points(),
+            end_column,
+        )
+
+    def get_faults_by_run_id(self, param, ts_range) -> pd.DataFrame:
         """Returns a list of all faults by grafana params
         :param param: Grafana params
-        :param _: ignored input time range
+        :param ts_range: Grafana time range
         :return: dataframe of faults
         """
         run_id = self._get_run_id_from_param(param)
-        return self.data_science.get_faults_by_run_id(run_id)
+        return self._restrict_time_series(
+            self.data_science.get_faults_by_run_id(run_id),
+            ts_range,
+            events=True,
+            end_column="end_time",
+        )
 
-    def get_verkehrsleistung_momentarily_time_by_run_id(self, param, _) -> pd.DataFrame:
+    def get_verkehrsleistung_momentarily_time_by_run_id(
+        self, param, ts_range
+    ) -> pd.DataFrame:
         """Returns the momentary verkehrsleistung over time by grafana params
         :param param: Grafana params
-        :param _: ignored input time range
+        :param ts_range: Grafana time range
         :return: dataframe of verkehrsleistung over time"""
         run_id = self._get_run_id_from_param(param)
-        return self.data_science.get_verkehrsleistung_momentarily_time_by_run_id(run_id)
+        return self._restrict_time_series(
+            self.data_science.get_verkehrsleistung_momentarily_time_by_run_id(run_id),
+            ts_range,
+        )
 
-    def get_coal_demand_by_run_id(self, param, _) -> pd.DataFrame:
+    def get_coal_demand_by_run_id(self, param, ts_range) -> pd.DataFrame:
         """Returns the coal demand over time by grafana params
         :param param: Grafana params
-        :param _: ignored input time range
+        :param ts_range: Grafana time range
         :return: dataframe of coal demand over time"""
         run_id = self._get_run_id_from_param(param)
-        return self.data_science.get_coal_demand_by_run_id(run_id)
+        return self._restrict_time_series(
+            self.data_science.get_coal_demand_by_run_id(run_id), ts_range
+        )
 
-    def get_spawn_events_by_run_id(self, param, _) -> pd.DataFrame:
+    def get_spawn_events_by_run_id(self, param, ts_range) -> pd.DataFrame:
         """Returns the train spawn events over time by grafana params
         :param param: Grafana params
-        :param _: ignored input time range
+        :param ts_range: Grafana time range
         :return: dataframe of all train spawn events over time
         """
         run_id = self._get_run_id_from_param(param)
-        return self.data_science.get_spawn_events_by_run_id(run_id)
+        return self._restrict_time_series(
+            self.data_science.get_spawn_events_by_run_id(run_id), ts_range, events=True
+        )
 
     def get_verkehrsarbeit_by_run_id(self, param, _) -> pd.DataFrame:
         """Returns the verkehrsarbeit by grafana params
@@ -109,39 +192,68 @@ class GrafanaDataRegistrator:
         run_id = self._get_run_id_from_param(param)
         return self.data_science.get_verkehrsleistung_by_run_id(run_id)
 
+    def get_live_metrics_by_run_id(self, param, ts_range) -> pd.DataFrame:
+        """Returns the live metrics of a running simulation over time by grafana params
+        :param param: Grafana params
+        :param ts_range: Grafana time range
+        :return: dataframe of live metrics over time"""
+        run_id = self._get_run_id_from_param(param)
+        return self._restrict_time_series(
+            self.data_science.get_live_metrics_by_run_id(run_id), ts_range
+        )
+
+    def get_live_station_dwell_by_run_id(self, param, _) -> pd.DataFrame:
+        """Returns the dwell times of stations of a running simulation by grafana params
+        :param param: Grafana params
+        :param _: ignored input time range
+        :return: dataframe of dwell time statistics by station"""
+        run_id = self._get_run_id_from_param(param)
+        return self.data_science.get_live_station_dwell_by_run_id(run_id)
+
     # --- CONFIG
 
-    def get_window_size_time_by_config_id(self, param, _) -> pd.DataFrame:
+    def get_window_size_time_by_config_id(self, param, ts_range) -> pd.DataFrame:
         """Returns the arrival and departure window sizes over time by grafana params
         :param param: Grafana params
-        :param _: ignored input time range
+        :param ts_range: Grafana time range
         :return: dataframe of verkehrsleistung"""
         config_id = self._get_config_id_from_param(param)
-        return self.data_science.get_window_size_time_by_config_id(config_id)
+        return self._restrict_time_series(
+            self.data_science.get_window_size_time_by_config_id(config_id), ts_range
+        )
 
-    def get_verkehrsleistung_time_by_config_id(self, param, _) -> pd.DataFrame:
+    def get_verkehrsleistung_time_by_config_id(self, param, ts_range) -> pd.DataFrame:
         """Returns the verkehrsleistung over time by grafana params
         :param param: Grafana params
-        :param _: ignored input time range
+        :param ts_range: Grafana time range
         :return: dataframe of verkehrsleistung over time"""
         config_id = self._get_config_id_from_param(param)
-        return self.data_science.get_verkehrsleistung_time_by_config_id(config_id)
+        return self._restrict_time_series(
+            self.data_science.get_verkehrsleistung_time_by_config_id(config_id),
+            ts_range,
+        )
 
-    def get_coal_demand_by_config_id(self, param, _) -> pd.DataFrame:
+    def get_coal_demand_by_config_id(self, param, ts_range) -> pd.DataFrame:
         """Returns the coal demand over time by grafana params
         :param param: Grafana params
-        :param _: ignored input time range
+        :param ts_range: Grafana time range
         :return: dataframe of coal demand over time by config id"""
         config_id = self._get_config_id_from_param(param)
-        return self.data_science.get_coal_demand_by_config_id(config_id)
+        return self._restrict_time_series(
+            self.data_science.get_coal_demand_by_config_id(config_id), ts_range
+        )
 
-    def get_coal_spawn_events_by_config_id(self, param, _) -> pd.DataFrame:
+    def get_coal_spawn_events_by_config_id(self, param, ts_range) -> pd.DataFrame:
         """Returns the coal train spawn events by grafana params
         :param param: Grafana params
-        :param _: ignored input time range
+        :param ts_range: Grafana time range
         :return: dataframe of coal train spawn events by config id"""
         config_id = self._get_config_id_from_param(param)
-        return self.data_science.get_coal_spawn_events_by_config_id(config_id)
+        return self._restrict_time_series(
+            self.data_science.get_coal_spawn_events_by_config_id(config_id),
+            ts_range,
+            events=True,
+        )
 
     def get_window_by_config_id(self, param, _) -> pd.DataFrame:
         """Returns the window size of the entire network by grafana params
@@ -219,18 +331,22 @@ class GrafanaDataRegistrator:
 
     # -- FINDERS
 
-    def get_all_station_ids(self, _) -> list[str]:
+    def get_all_station_ids(self, param) -> list[str]:
         """Returns all station ids
-        :param _: ignored input time range
+        :param param: Grafana params, optionally a run or config readable id
         :return: list of all station ids
         """
-        return self.data_science.get_all_stations()
+        return self.data_science.get_all_stations(
+            **self._get_finder_scope_from_param(param)
+        )
 
-    def get_all_train_ids(self, _) -> list[str]:
+    def get_all_train_ids(self, param) -> list[str]:
         """Returns all train ids
-        :param _: ignored input time range
+        :param param: Grafana params, optionally a run or config readable id
         :return: list of all train ids"""
-        return self.data_science.get_all_trains()
+        return self.data_science.get_all_trains(
+            **self._get_finder_scope_from_param(param)
+        )
 
     def get_all_run_ids(self, _) -> list[str]:
         """Returns all run ids
@@ -255,6 +371,8 @@ class GrafanaDataRegistrator:
             "get_spawn_events_by_run_id:${run_id}",
             "get_verkehrsarbeit_by_run_id:${run_id}",
             "get_verkehrsleistung_by_run_id:${run_id}",
+            "get_live_metrics_by_run_id:${run_id}",
+            "get_live_station_dwell_by_run_id:${run_id}",
             "get_window_size_time_by_config_id:${config_id}",
             "get_verkehrsleistung_time_by_config_id:${config_id}",
             "get_coal_demand_by_config_id:${config_id}",
@@ -271,84 +389,131 @@ class GrafanaDataRegistrator:
         ]
 
 
+def _coalesced(
+    name: str, reader: Callable[[str, dict], pd.DataFrame]
+) -> Callable[[str, dict], pd.DataFrame]:
+    """Coalesces concurrent identical requests of a reader, so panels and viewers
+    requesting the same data at once share one computation
+    :param name: name the reader is registered by
+    :param reader: the reader
+    :return: the coalescing reader
+    """
+
+    @functools.wraps(reader)
+    def wrapper(param, ts_range) -> pd.DataFrame:
+        # pylint: disable=protected-access
+        max_data_points = GrafanaDataRegistrator._get_max_data_points()
+        return single_flight.do(
+            (name, param, repr(ts_range), max_data_points),
+            lambda: reader(param, ts_range),
+            f"{name}:{param}",
+        )
+
+    return wrapper
+
+
+def _add_metric_reader(name: str, reader: Callable[[str, dict], pd.DataFrame]):
+    """Registers a coalescing metric reader
+    :param name: name of the reader
+    :param reader: the reader
+    """
+    dg.add_metric_reader(name, _coalesced(name, reader))
+
+
+def _add_annotation_reader(name: str, reader: Callable[[str, dict], pd.DataFrame]):
+    """Registers a coalescing annotation reader
+    :param name: name of the reader
+    :param reader: the reader
+    """
+    dg.add_annotation_reader(name, _coalesced(name, reader))
+
+
 def define_and_register_data():
     """Registers all grafana functions"""
     grafana_data_registrator = GrafanaDataRegistrator()
 
-    dg.add_annotation_reader(
+    _add_annotation_reader(
         "get_faults_by_run_id", grafana_data_registrator.get_faults_by_run_id
     )
-    dg.add_annotation_reader(
+    _add_annotation_reader(
         "get_spawn_events_by_run_id",
         grafana_data_registrator.get_spawn_events_by_run_id,
     )
-    dg.add_annotation_reader(
+    _add_annotation_reader(
         "get_coal_spawn_events_by_config_id",
         grafana_data_registrator.get_coal_spawn_events_by_config_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_faults_by_run_id", grafana_data_registrator.get_faults_by_run_id
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_verkehrsleistung_momentarily_time_by_run_id",
         grafana_data_registrator.get_verkehrsleistung_momentarily_time_by_run_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_coal_demand_by_run_id",
         grafana_data_registrator.get_coal_demand_by_run_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_verkehrsarbeit_by_run_id",
         grafana_data_registrator.get_verkehrsarbeit_by_run_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_verkehrsleistung_by_run_id",
         grafana_data_registrator.get_verkehrsleistung_by_run_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
+        "get_live_metrics_by_run_id",
+        grafana_data_registrator.get_live_metrics_by_run_id,
+    )
+    _add_metric_reader(
+        "get_live_station_dwell_by_run_id",
+        grafana_data_registrator.get_live_station_dwell_by_run_id,
+    )
+    _add_metric_reader(
         "get_window_size_time_by_config_id",
         grafana_data_registrator.get_window_size_time_by_config_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_verkehrsleistung_time_by_config_id",
         grafana_data_registrator.get_verkehrsleistung_time_by_config_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_coal_demand_by_config_id",
         grafana_data_registrator.get_coal_demand_by_config_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_window_by_config_id", grafana_data_registrator.get_window_by_config_id
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_window_all_by_config_id",
         grafana_data_registrator.get_window_all_by_config_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_verkehrsarbeit_by_config_id",
         grafana_data_registrator.get_verkehrsarbeit_by_config_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_verkehrsleistung_by_config_id",
         grafana_data_registrator.get_verkehrsleistung_by_config_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_average_verkehrsarbeit_by_config_id",
         grafana_data_registrator.get_average_verkehrsarbeit_by_config_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_average_verkehrsleistung_by_config_id",
         grafana_data_registrator.get_average_verkehrsleistung_by_config_id,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_window_by_multi_config",
         grafana_data_registrator.get_window_by_multi_config,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_verkehrsarbeit_by_multi_config",
         grafana_data_registrator.get_verkehrsarbeit_by_multi_config,
     )
-    dg.add_metric_reader(
+    _add_metric_reader(
         "get_verkehrsleistung_by_multi_config",
         grafana_data_registrator.get_verkehrsleistung_by_multi_config,
     )
@@ -0,0 +1,185 @@
+"""
+This module adds conditional requests to the Grafana datasource. The responses for
+finished runs are deterministic, so they are tagged with an ETag derived from the request
+and the completion markers of the runs it reads. Grafana revalidates them on every
+refresh and gets a 304 without recomputing or serializing the response. Requests reading
+runs that are still in progress, or ids that can't be resolved, bypass the cache. So do
+the coal readers, they depend on SMARD data and schedule configurations that can change
+after the runs finished.
+"""
+import hashlib
+import json
+import os
+from typing import Optional
+
+from flask import Flask, Response, g, request
+from grafana_pandas_datasource.service import pandas_component
+
+from src.implementor.models import Run, SimulationConfiguration
+
+CACHED_ENDPOINTS = ("/query", "/annotations")
+REQUEST_FIELDS = ("targets", "annotation", "maxDataPoints", "intervalMs")
+DEFAULT_MAX_AGE = 300
+UNCACHED_READERS = (
+    "get_coal_demand_by_run_id",
+    "get_coal_demand_by_config_id",
+    "get_coal_spawn_events_by_config_id",
+)
+
+
+def grafana_cache_max_age() -> int:
+    """Returns the number of seconds browsers and proxies may reuse responses of
+    finished runs without revalidating them, configured by GRAFANA_CACHE_MAX_AGE.
+
+    :return: The maximum age in seconds
+    """
+    return int(os.getenv("GRAFANA_CACHE_MAX_AGE", str(DEFAULT_MAX_AGE)))
+
+
+def _get_targets(body: dict) -> list[str]:
+    """Returns the targets of a query or annotation request.
+
+    :param body: The body of the request
+    :return: The targets in the form reader:param
+    """
+    targets = [target.get("target", "") for target in body.get("targets", [])]
+    if "annotation" in body:
+        targets.append(body["annotation"].get("query", ""))
+    return targets
+
+
+def _get_readable_ids(targets: list[str]) -> set[str]:
+    """Returns the readable ids of the runs and configs the targets read.
+
+    :param targets: The targets in the form reader:param
+    :return: The readable ids
+    """
+    readable_ids = set()
+    for target in targets:
+        _, _, param = target.partition(":")
+        readable_ids.update(
+            readable_id
+            for readable_id in param.replace(")", "").replace("(", "").split("|")
+            if readable_id
+        )
+    return readable_ids
+
+
+def get_completion_markers(targets: list[str]) -> Optional[list[list[str]]]:
+    """Returns the completion markers of the runs the targets read, these are the
+    runs themselves or the runs of the configs the targets read.
+
+    :param targets: The targets in the form reader:param
+    :return: The id, finished and summarized time of the runs and the id and update
+        time of the configs or None if a run is in progress or an id is unknown
+    """
+    readable_ids = _get_readable_ids(targets)
+    if len(readable_ids) == 0:
+        return None
+    configs = list(
+        SimulationConfiguration.select(
+            SimulationConfiguration.id,
+            SimulationConfiguration.readable_id,
+            SimulationConfiguration.updated_at,
+        ).where(SimulationConfiguration.readable_id << list(readable_ids))
+    )
+    runs = list(
+        Run.select(Run.id, Run.readable_id, Run.finished_at, Run.summarized_at).where(
+            (Run.readable_id << list(readable_ids))
+            | (Run.simulation_configuration << [config.id for config in configs])
+        )
+    )
+    resolved_ids = {config.readable_id for config in configs} | {
+        run.readable_id for run in runs
+    }
+    if not readable_ids <= resolved_ids:
+        return None
+    if any(run.finished_at is None for run in runs):
+        return None
+    return sorted(
+        [str(config.id), str(config.updated_at)] for config in configs
+    ) + sorted(
+        [str(run.id), str(run.finished_at), str(run.summarized_at)] for run in runs
+    )
+
+
+def compute_etag(path: str, body: dict) -> Optional[str]:
+    """Computes the ETag of a request to the Grafana datasource.
+
+    :param path: The endpoint of the request
+    :param body: The body of the request
+    :return: The ETag or None if the response must not be cached
+    """
+    targets = _get_targets(body)
+    if any(target.partition(":")[0] in UNCACHED_READERS for target in targets):
+        return None
+    markers = get_completion_markers(targets)
+    if markers is None:
+        return None
+    time_range = body.get("range") or {}
+    key = {
+        "path": path,
+        "range": [time_range.get("from"), time_range.get("to")],
+        "request": {field: body.get(field) for field in REQUEST_FIELDS},
+        "markers": markers,
+    }
+    return hashlib.sha1(
+        json.dumps(key, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _is_cached_endpoint() -> bool:
+    """Checks whether the current request is a query or annotation request to the
+    Grafana datasource.
+
+    :return: True if the response may be cached
+    """
+    return (
+        request.blueprint == pandas_component.name
+        and request.method == "POST"
+        and request.path.endswith(CACHED_ENDPOINTS)
+    )
+
+
+def _set_cache_headers(response: Response, etag: str) -> Response:
+    """Adds the ETag and the headers allowing browsers and proxies to reuse it.
+
+    :param response: The response
+    :param etag: The ETag
+    :return: The response
+    """
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"public, max-age={grafana_cache_max_age()}"
+    return response
+
+
+def _before_request() -> Optional[Response]:
+    """Answers conditional requests whose response did not change with 304."""
+    g.grafana_etag = None
+    if not _is_cached_endpoint():
+        return None
+    etag = compute_etag(request.path, request.get_json(silent=True) or {})
+    g.grafana_etag = etag
+    if etag is not None and request.if_none_match.contains(etag):
+        return _set_cache_headers(Response(status=304), etag)
+    return None
+
+
+def _after_request(response: Response) -> Response:
+    """Tags successful responses of finished runs and disables caching of others."""
+    if not _is_cached_endpoint() or response.status_code == 304:
+        return response
+    etag = g.get("grafana_etag")
+    if etag is None or response.status_code != 200:
+        response.headers["Cache-Control"] = "no-store"
+        return response
+    return _set_cache_headers(response, etag)
+
+
+def register_http_cache(app: Flask):
+    """Adds conditional requests to the Grafana datasource of an app.
+
+    :param app: The flask app
+    """
+    app.before_request(_before_request)
+    app.after_request(_after_request)
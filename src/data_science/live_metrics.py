@@ -0,0 +1,279 @@
+"""
+This module contains the live metrics of running simulations. They are aggregated from
+the events on the EventBus while the run is in progress and published as snapshots, so
+dashboards can show the progress of a run without reading its logs.
+"""
+import os
+from typing import Optional
+from uuid import UUID
+
+from peewee import BigIntegerField, FloatField, IntegerField, TextField
+
+from src.component import Component
+from src.data_science.run_summary import SummaryModel
+from src.event_bus.event import Event, EventType
+from src.event_bus.event_bus import EventBus
+
+
+def live_metrics_interval() -> Optional[float]:
+    """Returns the number of simulated seconds between two snapshots of the live
+    metrics, configured by LIVE_METRICS_INTERVAL.
+
+    :return: The interval or None if live metrics are disabled
+    """
+    interval = os.getenv("LIVE_METRICS_INTERVAL")
+    return None if interval is None else float(interval)
+
+
+class LiveMetricSnapshot(SummaryModel):
+    """The metrics of a running simulation at a tick."""
+
+    class Meta:
+        """Set table name and indexes"""
+
+        table_name = "live_metric_snapshot"
+        indexes = ((("run_id", "tick"), True),)
+
+    tick = BigIntegerField(null=False)
+    verkehrsarbeit = FloatField(null=False)
+    verkehrsleistung = FloatField(null=False)
+    trains_on_edges = IntegerField(null=False)
+    active_faults = IntegerField(null=False)
+
+
+class LiveStationSnapshot(SummaryModel):
+    """The latest dwell time statistics of a station of a running simulation."""
+
+    class Meta:
+        """Set table name and indexes"""
+
+        table_name = "live_station_snapshot"
+        indexes = ((("run_id", "station_id"), True),)
+
+    station_id = TextField(null=False)
+    tick = BigIntegerField(null=False)
+    dwell_count = IntegerField(null=False)
+    dwell_mean = FloatField(null=False)
+    dwell_min = BigIntegerField(null=False)
+    dwell_max = BigIntegerField(null=False)
+
+
+class DwellStatistics:
+    """Running count, sum, minimum and maximum of the dwell times at a station."""
+
+    count: int
+    total: int
+    minimum: Optional[int]
+    maximum: Optional[int]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, dwell_ticks: int):
+        """Adds a dwell time.
+
+        :param dwell_ticks: The number of ticks a train stood at the station
+        """
+        self.count += 1
+        self.total += dwell_ticks
+        self.minimum = (
+            dwell_ticks if self.minimum is None else min(self.minimum, dwell_ticks)
+        )
+        self.maximum = (
+            dwell_ticks if self.maximum is None else max(self.maximum, dwell_ticks)
+        )
+
+
+# pylint: disable=too-many-instance-attributes
+class LiveMetricsCollector(Component):
+    """
+    Aggregates the metrics of the run while it is in progress. Every event is handled in
+    constant time and the aggregates are published as snapshots every snapshot_interval
+    ticks and when the simulation is finished.
+
+    The verkehrsleistung of a snapshot is the length of the block sections left since
+    the previous snapshot per duration of the interval.
+    """
+
+    callback_handles: list[UUID]
+    tick_length: float
+    snapshot_interval: int
+    tick: int
+    last_snapshot_tick: int
+    passed_length: float
+    interval_length: float
+    trains_on_edges: int
+    active_faults: int
+    arrivals: dict[tuple[str, str], int]
+    dwell_statistics: dict[str, DwellStatistics]
+    changed_stations: set[str]
+
+    def __init__(self, event_bus: EventBus, snapshot_interval: int):
+        """
+        The constructor of the live metrics collector class
+
+        :param event_bus: reference to the global event_bus
+        :param snapshot_interval: The number of ticks between two snapshots
+        """
+        super().__init__(event_bus, "LOW")
+        self.tick_length = float(os.getenv("TICK_LENGTH"))
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.tick = 0
+        self.last_snapshot_tick = 0
+        self.passed_length = 0.0
+        self.interval_length = 0.0
+        self.trains_on_edges = 0
+        self.active_faults = 0
+        self.arrivals = {}
+        self.dwell_statistics = {}
+        self.changed_stations = set()
+
+        self.callback_handles = [
+            self.event_bus.register_callback(
+                self.train_enter_edge, EventType.TRAIN_ENTER_EDGE
+            ),
+            self.event_bus.register_callback(
+                self.train_leave_edge, EventType.TRAIN_LEAVE_EDGE
+            ),
+            self.event_bus.register_callback(
+                self.arrival_train, EventType.TRAIN_ARRIVAL
+            ),
+            self.event_bus.register_callback(
+                self.departure_train, EventType.TRAIN_DEPARTURE
+            ),
+            self.event_bus.register_callback(self.inject_fault, EventType.INJECT_FAULT),
+            self.event_bus.register_callback(
+                self.resolve_fault, EventType.RESOLVE_FAULT
+            ),
+        ]
+
+    def __del__(self):
+        for handle in self.callback_handles:
+            self.event_bus.unregister_callback(handle)
+
+    def next_tick(self, tick: int):
+        self.tick = tick
+        if tick - self.last_snapshot_tick >= self.snapshot_interval:
+            self.publish_snapshot()
+
+    def finish(self):
+        self.publish_snapshot()
+
+    def train_enter_edge(self, event: Event):
+        """
+        Counts a train that entered a block section.
+        :param event: the event containing all relevant info
+        """
+        # pylint: disable=unused-argument
+        self.trains_on_edges += 1
+
+    def train_leave_edge(self, event: Event):
+        """
+        Adds the length of the block section a train left to the passed length.
+        :param event: the event containing all relevant info
+        """
+        self.trains_on_edges = max(0, self.trains_on_edges - 1)
+        self.passed_length += event.arguments["edge_length"]
+        self.interval_length += event.arguments["edge_length"]
+
+    def arrival_train(self, event: Event):
+        """
+        Remembers the arrival of a train at a station until its departure.
+        :param event: the event containing all relevant info
+        """
+        self.arrivals[
+            (event.arguments["train_id"], event.arguments["station_id"])
+        ] = event.arguments["tick"]
+
+    def departure_train(self, event: Event):
+        """
+        Adds the dwell time of a departing train to the statistics of the station.
+        :param event: the event containing all relevant info
+        """
+        station_id = event.arguments["station_id"]
+        arrival_tick = self.arrivals.pop(
+            (event.arguments["train_id"], station_id), None
+        )
+        if arrival_tick is None:
+            return
+        self.dwell_statistics.setdefault(station_id, DwellStatistics()).add(
+            event.arguments["tick"] - arrival_tick
+        )
+        self.changed_stations.add(station_id)
+
+    def inject_fault(self, event: Event):
+        """
+        Counts an injected fault.
+        :param event: the event containing all relevant info
+        """
+        # pylint: disable=unused-argument
+        self.active_faults += 1
+
+    def resolve_fault(self, event: Event):
+        """
+        Removes a resolved fault from the count of active faults.
+        :param event: the event containing all relevant info
+        """
+        # pylint: disable=unused-argument
+        self.active_faults = max(0, self.active_faults - 1)
+
+    def publish_snapshot(self):
+        """
+        Stores the current aggregates and the dwell time statistics of the stations that
+        changed since the previous snapshot.
+        """
+        interval_seconds = (self.tick - self.last_snapshot_tick) * self.tick_length
+        LiveMetricSnapshot.insert(
+            run_id=self.event_bus.run_id,
+            tick=self.tick,
+            verkehrsarbeit=self.passed_length / 1000.0,
+            verkehrsleistung=(
+                self.interval_length * 3.6 / interval_seconds
+                if interval_seconds > 0
+                else 0.0
+            ),
+            trains_on_edges=self.trains_on_edges,
+            active_faults=self.active_faults,
+        ).on_conflict(
+            conflict_target=[LiveMetricSnapshot.run_id, LiveMetricSnapshot.tick],
+            preserve=[
+                LiveMetricSnapshot.verkehrsarbeit,
+                LiveMetricSnapshot.verkehrsleistung,
+                LiveMetricSnapshot.trains_on_edges,
+                LiveMetricSnapshot.active_faults,
+            ],
+        ).execute()
+        if len(self.changed_stations) > 0:
+            LiveStationSnapshot.insert_many(
+                [
+                    {
+                        "run_id": self.event_bus.run_id,
+                        "station_id": station_id,
+                        "tick": self.tick,
+                        "dwell_count": self.dwell_statistics[station_id].count,
+                        "dwell_mean": self.dwell_statistics[station_id].total
+                        / self.dwell_statistics[station_id].count,
+                        "dwell_min": self.dwell_statistics[station_id].minimum,
+                        "dwell_max": self.dwell_statistics[station_id].maximum,
+                    }
+                    for station_id in sorted(self.changed_stations)
+                ]
+            ).on_conflict(
+                conflict_target=[
+                    LiveStationSnapshot.run_id,
+                    LiveStationSnapshot.station_id,
+                ],
+                preserve=[
+                    LiveStationSnapshot.tick,
+                    LiveStationSnapshot.dwell_count,
+                    LiveStationSnapshot.dwell_mean,
+                    LiveStationSnapshot.dwell_min,
+                    LiveStationSnapshot.dwell_max,
+                ],
+            ).execute()
+        self.changed_stations.clear()
+        self.interval_length = 0.0
+        self.last_snapshot_tick = self.tick
@@ -0,0 +1,98 @@
+"""
+This module contains the worker pool that fetches and pre-aggregates the logs of many
+runs in parallel. Every worker is a process with its own database connection, so the
+CPU-heavy pandas work of different runs is not serialized by the GIL.
+
+The pool is created once and reused by all requests. Its workers are spawned instead
+of forked, because forking the threaded API server would copy locks held by other
+threads, e.g. of the result cache, into the workers and could deadlock them.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Callable, Optional, TypeVar
+from uuid import UUID
+
+T = TypeVar("T")
+
+
+def analytics_workers() -> int:
+    """Returns the number of worker processes data science uses for runs of
+    simulation configurations, configured by ANALYTICS_WORKERS.
+
+    :return: The number of workers, 1 if runs are processed in the calling process or
+        ANALYTICS_WORKERS is not a positive integer
+    """
+    try:
+        return max(1, int(os.getenv("ANALYTICS_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+class WorkerPool:
+    """The pool of worker processes. It is created on first use and recreated when
+    the number of workers changes."""
+
+    executor: Optional[ProcessPoolExecutor]
+    workers: int
+    _lock: Lock
+
+    def __init__(self):
+        self.executor = None
+        self.workers = 0
+        self._lock = Lock()
+
+    def get(self, workers: int) -> ProcessPoolExecutor:
+        """Returns the pool with the given number of workers.
+
+        :param workers: The number of worker processes
+        :return: The pool
+        """
+        with self._lock:
+            if self.executor is None or self.workers != workers:
+                if self.executor is not None:
+                    self.executor.shutdown(wait=False)
+                self.executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self.workers = workers
+            return self.executor
+
+    def discard(self, executor: ProcessPoolExecutor):
+        """Drops a broken pool, so the next call creates a new one.
+
+        :param executor: The broken pool
+        """
+        with self._lock:
+            if self.executor is executor:
+                self.executor = None
+        executor.shutdown(wait=False)
+
+
+_POOL = WorkerPool()
+
+
+def map_runs(
+    function: Callable[[UUID], T], run_ids: list[UUID], workers: Optional[int] = None
+) -> list[T]:
+    """Applies a function to every run. The results are returned in the order of the
+    runs, regardless of the order the workers finish in.
+
+    :param function: The function, it has to be picklable, e.g. a module level function
+        or a functools.partial of one
+    :param run_ids: The ids of the runs
+    :param workers: The number of worker processes, defaults to analytics_workers()
+    :return: The results of the function for every run
+    """
+    if workers is None:
+        workers = analytics_workers()
+    if min(workers, len(run_ids)) <= 1:
+        return [function(run_id) for run_id in run_ids]
+    executor = _POOL.get(workers)
+    try:
+        return list(executor.map(function, run_ids))
+    except BrokenProcessPool:
+        _POOL.discard(executor)
+        raise
@@ -0,0 +1,25 @@
+"""
+This module contains the component that materializes the summaries of a run when its
+simulation is finished.
+"""
+from src.component import Component
+from src.data_science.data_science import DataScience
+from src.event_bus.event_bus import EventBus
+
+
+class RunSummarizer(Component):
+    """
+    Materializes the summaries of the run when the simulation is finished.
+    """
+
+    def __init__(self, event_bus: EventBus):
+        """
+        The constructor of the run summarizer class
+        """
+        super().__init__(event_bus, "LOW")
+
+    def next_tick(self, tick: int):
+        pass
+
+    def finish(self):
+        DataScience().materialize_run_summary(self.event_bus.run_id)
@@ -0,0 +1,153 @@
+"""
+This module contains the summary tables of finished runs. The metrics of a run are
+computed once from its logs when it finishes and stored here, so metrics of simulation
+configurations only aggregate the summaries instead of all log entries of their runs.
+"""
+from datetime import datetime
+from typing import Type
+from uuid import UUID
+
+import pandas as pd
+from peewee import (
+    BigIntegerField,
+    FloatField,
+    ForeignKeyField,
+    IntegerField,
+    Model,
+    TextField,
+    chunked,
+)
+
+from src.base_model import db
+from src.implementor.models import Run
+from src.logger.log_stream import concat_chunks, iter_query_chunks
+
+
+class SummaryModel(Model):
+    """Base class of the summary tables. They don't inherit from BaseModel because
+    they are written and read in bulk."""
+
+    class Meta:
+        """Set Database"""
+
+        database = db
+
+    run_id = ForeignKeyField(Run, null=False, on_delete="CASCADE")
+
+    @classmethod
+    def columns(cls) -> list[str]:
+        """Returns the names of the columns of the summary.
+
+        :return: The names of the columns including run_id
+        """
+        # pylint will not recognize the _meta peewee adds to every model
+        # pylint: disable-next=no-member
+        return [field.name for field in cls._meta.sorted_fields if field.name != "id"]
+
+    @classmethod
+    def read(cls, run_ids: list[UUID]) -> pd.DataFrame:
+        """Returns the summaries of the given runs.
+
+        :param run_ids: The ids of the runs
+        :return: A DataFrame of all rows of the runs
+        """
+        columns = cls.columns()
+        if len(run_ids) == 0:
+            return pd.DataFrame(columns=columns)
+        query = cls.select(*[getattr(cls, column) for column in columns]).where(
+            cls.run_id << run_ids
+        )
+        return concat_chunks(iter_query_chunks(query, columns), columns)
+
+    @classmethod
+    def write(cls, run_id: UUID, summary_df: pd.DataFrame):
+        """Replaces the summary of a run.
+
+        :param run_id: The id of the run
+        :param summary_df: A DataFrame containing all columns except run_id
+        """
+        columns = [column for column in cls.columns() if column != "run_id"]
+        rows = [
+            {"run_id": run_id, **row}
+            for row in summary_df[columns].to_dict(orient="records")
+        ]
+        with db.atomic():
+            cls.delete().where(cls.run_id == run_id).execute()
+            for batch in chunked(rows, 1000):
+                # pylint: disable-next=no-value-for-parameter
+                cls.insert_many(batch).execute()
+
+
+class RunTrainTypeSummary(SummaryModel):
+    """The length of all block sections passed by trains of a train type and the tick
+    the last of them was left in a run."""
+
+    class Meta:
+        """Set table name and indexes"""
+
+        table_name = "run_train_type_summary"
+        indexes = ((("run_id", "train_type"), True),)
+
+    train_type = TextField(null=False)
+    leave_tick = BigIntegerField(null=False)
+    edge_length = FloatField(null=False)
+
+
+class RunVerkehrsleistungSummary(SummaryModel):
+    """The momentary verkehrsleistung of a run over time."""
+
+    class Meta:
+        """Set table name and indexes"""
+
+        table_name = "run_verkehrsleistung_summary"
+        indexes = ((("run_id", "delta_tick", "tick"), True),)
+
+    delta_tick = IntegerField(null=False)
+    tick = BigIntegerField(null=False)
+    verkehrsleistung = FloatField(null=False)
+
+
+class RunSpawnRetrySummary(SummaryModel):
+    """How many spawns of a run waited for a retry and how many attempts to spawn
+    failed. It is written by the spawner when the run finishes."""
+
+    class Meta:
+        """Set table name and indexes"""
+
+        table_name = "run_spawn_retry_summary"
+        indexes = ((("run_id",), True),)
+
+    queued_spawns = IntegerField(null=False)
+    max_queued_spawns = IntegerField(null=False)
+    failed_spawn_attempts = IntegerField(null=False)
+    early_wakeups = IntegerField(null=False)
+
+
+def write_run_summary(run_id: UUID, summaries: dict[Type[SummaryModel], pd.DataFrame]):
+    """Replaces the summaries of a run and marks it as summarized.
+
+    :param run_id: The id of the run
+    :param summaries: The summary of the run for every summary table
+    """
+    with db.atomic():
+        for model, summary_df in summaries.items():
+            model.write(run_id, summary_df)
+        Run.update(summarized_at=datetime.now()).where(Run.id == run_id).execute()
+
+
+def get_summarized_run_ids(run_ids: list[UUID]) -> set[str]:
+    """Returns the runs whose summaries have been materialized.
+
+    :param run_ids: The ids of the runs
+    :return: The ids of the summarized runs as strings
+    """
+    if len(run_ids) == 0:
+        return set()
+    # pylint will not recognize that peewee results are iterable
+    # pylint: disable=not-an-iterable
+    return {
+        str(run.id)
+        for run in Run.select(Run.id).where(
+            (Run.id << run_ids) & Run.summarized_at.is_null(False)
+        )
+    }
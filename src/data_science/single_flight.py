@@ -0,0 +1,199 @@
+"""
+This module coalesces identical computations that are in flight at the same time. The
+panels of a dashboard and concurrent viewers request the same data at once, so only the
+first caller of a key computes it and the others wait for its result.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+import pandas as pd
+
+T = TypeVar("T")
+
+DEFAULT_MAX_LABELS = 1024
+
+
+class FlightStatistics:
+    """The number of calls of a key, how many of them were coalesced, how many ran at
+    the same time and how long the coalesced calls waited."""
+
+    calls: int
+    executions: int
+    coalesced: int
+    max_concurrency: int
+    wait_seconds: float
+    max_wait_seconds: float
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.max_concurrency = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def add_wait(self, seconds: float):
+        """Adds the time a coalesced call waited for the result.
+
+        :param seconds: The waiting time
+        """
+        self.wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the statistics as a dictionary.
+
+        :return: The statistics
+        """
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "max_concurrency": self.max_concurrency,
+            "wait_seconds": self.wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+class Flight:
+    """A computation in flight and the callers waiting for it."""
+
+    done: threading.Event
+    result: Any
+    exception: Optional[BaseException]
+    concurrency: int
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+        self.concurrency = 0
+
+
+class SingleFlight:
+    """Executes at most one computation per key at a time. Callers of a key that is
+    already being computed wait for the result instead of computing it again."""
+
+    max_labels: int
+    _flights: dict[Hashable, Flight]
+    _statistics: OrderedDict
+    _lock: threading.Lock
+
+    def __init__(self, max_labels: int = DEFAULT_MAX_LABELS):
+        """
+        :param max_labels: The maximum number of labels statistics are kept of, the
+            least recently used labels are dropped
+        """
+        self.max_labels = max_labels
+        self._flights = {}
+        self._statistics = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _statistics_of(self, label: str) -> FlightStatistics:
+        """Returns the statistics of a label. Has to be called with the lock held.
+
+        :param label: The label
+        :return: The statistics
+        """
+        statistics = self._statistics.get(label)
+        if statistics is None:
+            statistics = FlightStatistics()
+            self._statistics[label] = statistics
+            while len(self._statistics) > self.max_labels:
+                self._statistics.popitem(last=False)
+        else:
+            self._statistics.move_to_end(label)
+        return statistics
+
+    @staticmethod
+    def _share(result: T) -> T:
+        """Returns the result for a coalesced caller. DataFrames are copied, so callers
+        can't modify the result of each other.
+
+        :param result: The result
+        :return: The result for the caller
+        """
+        if isinstance(result, pd.DataFrame):
+            return result.copy()
+        return result
+
+    # pylint: disable-next=invalid-name
+    def do(
+        self, key: Hashable, compute: Callable[[], T], label: Optional[str] = None
+    ) -> T:
+        """Returns the result of a computation. If the computation of the key is already
+        in flight, waits for it and returns its result or raises its exception.
+
+        :param key: The key identifying the computation
+        :param compute: Computes the result
+        :param label: The label the statistics are reported by, defaults to the key
+        :return: The result
+        """
+        label = str(key) if label is None else label
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Flight()
+                self._flights[key] = flight
+            flight.concurrency += 1
+            statistics = self._statistics_of(label)
+            statistics.calls += 1
+            statistics.max_concurrency = max(
+                statistics.max_concurrency, flight.concurrency
+            )
+            if leader:
+                statistics.executions += 1
+            else:
+                statistics.coalesced += 1
+
+        if leader:
+            try:
+                flight.result = compute()
+                # the leader gets a copy as well, it is taken before the waiting
+                # callers are released, so they can't see changes of the leader
+                return self._share(flight.result)
+            except BaseException as exception:
+                flight.exception = exception
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+
+        start = time.perf_counter()
+        flight.done.wait()
+        with self._lock:
+            statistics.add_wait(time.perf_counter() - start)
+        if flight.exception is not None:
+            raise flight.exception
+        return self._share(flight.result)
+
+    def in_flight(self) -> int:
+        """Returns the number of computations in flight.
+
+        :return: The number of keys being computed
+        """
+        with self._lock:
+            return len(self._flights)
+
+    def clear(self):
+        """Resets the statistics."""
+        with self._lock:
+            self._statistics.clear()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Returns the statistics of every label.
+
+        :return: The statistics by label
+        """
+        with self._lock:
+            return {
+                label: statistics.to_dict()
+                for label, statistics in self._statistics.items()
+            }
+
+
+single_flight = SingleFlight()
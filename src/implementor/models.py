@@ -1,4 +1,11 @@
-from peewee import CharField, ForeignKeyField, UUIDField
+from peewee import (
+    BooleanField,
+    CharField,
+    DateTimeField,
+    ForeignKeyField,
+    TextField,
+    UUIDField,
+)
 
 from src.base_model import SerializableBaseModel
 
@@ -93,6 +100,10 @@ class Run(SerializableBaseModel):
 
     simulation_configuration = ForeignKeyField(SimulationConfiguration, backref="runs")
     process_id = UUIDField(null=True)
+    archive_path = TextField(null=True)
+    compact_log = BooleanField(default=False)
+    finished_at = DateTimeField(null=True)
+    summarized_at = DateTimeField(null=True)
 
     def to_dict(self):
         data = super().to_dict()
@@ -1,7 +1,20 @@
 # pylint: disable=unused-argument
 # pylint: disable=duplicate-code
 
+import os
+import shutil
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from flask import send_file
+
 from src.communicator.communicator import Communicator
+from src.data_science.dashboard_warmer import DashboardWarmer
+from src.data_science.data_science import DataScience
+from src.data_science.live_metrics import LiveMetricsCollector, live_metrics_interval
+from src.data_science.run_summarizer import RunSummarizer
+from src.data_science.single_flight import single_flight
 from src.event_bus.event_bus import EventBus
 from src.fault_injector.fault_injector import FaultInjector
 from src.fault_injector.fault_types.platform_blocked_fault import PlatformBlockedFault
@@ -15,7 +28,11 @@ from src.interlocking_component.route_controller import (
     IInterlockingDisruptor,
     RouteController,
 )
-from src.logger.logger import Logger
+from src.logger.compact_log import compact_logging_enabled
+from src.logger.log_archive import LogArchiver, log_archive_directory, zip_archive
+from src.logger.log_entry import create_log_partitions, drop_log_partitions
+from src.logger.logger import CompactLogger, Logger
+from src.logger.result_cache import result_cache
 from src.spawner.spawner import Spawner
 from src.wrapper.simulation_object_updating_component import (
     SimulationObjectUpdatingComponent,
@@ -56,7 +73,7 @@ def get_all_run_ids(options: dict, token: Token):
 
 
 # Can't reduce the number of local variables here, because we have many components
-# pylint: disable=too-many-locals
+# pylint: disable=too-many-locals,too-many-statements,too-many-branches
 def create_run(body, token):
     """
 
@@ -74,11 +91,34 @@ def create_run(body, token):
     simulation_configuration = simulation_configurations.get()
     communicator = Communicator()
 
-    run = Run(simulation_configuration=simulation_configuration)
+    # the layout of the logs is stored on the run, so they are read in the layout they
+    # were written in
+    run = Run(
+        simulation_configuration=simulation_configuration,
+        compact_log=compact_logging_enabled(),
+    )
     run.save()
+    result_cache.invalidate_config(simulation_configuration.id)
+    create_log_partitions(run.id)
     event_bus = EventBus(run_id=run.id)
-    logger = Logger(event_bus=event_bus)
+    if run.compact_log:
+        logger = CompactLogger(event_bus=event_bus)
+    else:
+        logger = Logger(event_bus=event_bus)
     communicator.add_component(logger)
+    if log_archive_directory() is not None and not run.compact_log:
+        communicator.add_component(LogArchiver(event_bus=event_bus))
+    communicator.add_component(RunSummarizer(event_bus=event_bus))
+    if live_metrics_interval() is not None:
+        communicator.add_component(
+            LiveMetricsCollector(
+                event_bus=event_bus,
+                snapshot_interval=int(
+                    live_metrics_interval() / float(os.getenv("TICK_LENGTH"))
+                ),
+            )
+        )
+    communicator.add_component(DashboardWarmer(event_bus=event_bus))
 
     object_updater = SimulationObjectUpdatingComponent(
         event_bus,
@@ -202,7 +242,7 @@ def create_run(body, token):
     )
 
 
-# pylint: enable=too-many-locals
+# pylint: enable=too-many-locals,too-many-statements,too-many-branches
 
 
 def get_run(options, token):
@@ -242,6 +282,108 @@ def delete_run(options, token):
 
     run = runs.get()
     Communicator.stop(str(run.process_id))
-    run.delete_instance(recursive=True)  # will remove logs too
+    drop_log_partitions(run.id)
+    result_cache.invalidate_run(run.id)
+    result_cache.invalidate_config(run.simulation_configuration_id)
+    if run.archive_path is not None:
+        shutil.rmtree(run.archive_path, ignore_errors=True)
+    run.delete_instance(recursive=True)  # will remove remaining logs too
 
     return "Deleted run", 204
+
+
+def get_run_archive(options, token):
+    """
+    :param options: A dictionary containing all the parameters for the Operations
+        options["identifier"]
+    :param token: Token object of the current user
+
+    """
+
+    run_id = options["identifier"]
+    runs = Run.select().where(Run.id == run_id)
+
+    if not runs.exists():
+        return "Run not found", 404
+
+    run = runs.get()
+    if run.archive_path is None:
+        return "Archive not found", 404
+
+    return (
+        send_file(
+            zip_archive(run.archive_path),
+            mimetype="application/zip",
+            as_attachment=True,
+            download_name=f"{run.id}.zip",
+        ),
+        200,
+    )
+
+
+def create_run_summary(options, token):
+    """
+    :param options: A dictionary containing all the parameters for the Operations
+        options["identifier"]
+    :param token: Token object of the current user
+
+    """
+
+    run_id = options["identifier"]
+    runs = Run.select().where(Run.id == run_id)
+
+    if not runs.exists():
+        return "Run not found", 404
+
+    run = runs.get()
+    # the logs of a running simulation are incomplete
+    if run.finished_at is None:
+        return "Run has not finished", 400
+    DataScience().materialize_run_summary(run.id)
+
+    return "Summarized run", 201
+
+
+def backfill_finished_runs(run_id: Optional[UUID] = None) -> int:
+    """Marks runs without a finish time whose simulation is no longer running as
+    finished, e.g. runs that were logged before the finish time was recorded, so they
+    can be summarized and their results cached.
+
+    :param run_id: The id of the run, defaults to all runs
+    :return: The number of runs marked as finished
+    """
+    query = Run.select(Run.id, Run.process_id).where(Run.finished_at.is_null())
+    if run_id is not None:
+        query = query.where(Run.id == run_id)
+    # pylint will not recognize that peewee results are iterable
+    # pylint: disable=not-an-iterable
+    finished_run_ids = [
+        run.id
+        for run in query
+        if run.process_id is None or not Communicator.is_active(str(run.process_id))
+    ]
+    if len(finished_run_ids) > 0:
+        Run.update(finished_at=datetime.now()).where(
+            Run.id << finished_run_ids
+        ).execute()
+    return len(finished_run_ids)
+
+
+def get_result_cache_stats(options, token):
+    """
+    :param options: A dictionary containing all the parameters for the Operations
+    :param token: Token object of the current user
+
+    """
+
+    return result_cache.stats(), 200
+
+
+def get_coalescing_stats(options, token):
+    """
+    :param options: A dictionary containing all the parameters for the Operations
+    :param token: Token object of the current user
+
+    """
+
+    return single_flight.stats(), 200
@@ -0,0 +1,282 @@
+from typing import Iterator, Optional
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+
+from src.implementor.models import Run
+from src.logger.log_archive import read_archive
+from src.logger.log_collector import (
+    DEPARTURES_ARRIVALS_COLUMNS,
+    DEPARTURES_ARRIVALS_DTYPES,
+    EDGE_TIMES_COLUMNS,
+    LogCollector,
+)
+from src.logger.log_entry import (
+    TrainArrivalLogEntry,
+    TrainDepartureLogEntry,
+    TrainEnterEdgeLogEntry,
+    TrainLeaveEdgeLogEntry,
+    TrainSpawnLogEntry,
+)
+from src.logger.log_stream import DEFAULT_CHUNK_SIZE
+
+
+class ArchiveLogCollector(LogCollector):
+    """The ArchiveLogCollector provides the same structured logs as the LogCollector,
+    but reads the logs of archived runs from their Parquet archive. Only the needed
+    columns are loaded. Runs without an archive and faults are read from the
+    database."""
+
+    def _get_archive_paths(self, run_ids: list[UUID]) -> dict[UUID, str]:
+        """Returns the directories of the archives of the given runs.
+        :param run_ids: The ids of the runs.
+        :return: The directories of the archives by the id of their run, runs that
+        are not archived are left out."""
+
+        # pylint will not recognize that peewee results are iterable
+        # pylint: disable=not-an-iterable
+        archived_runs = Run.select(Run.id, Run.archive_path).where(
+            Run.id.in_(run_ids) & Run.archive_path.is_null(False)
+        )
+        archive_paths = {str(run.id): run.archive_path for run in archived_runs}
+        return {
+            run_id: archive_paths[str(run_id)]
+            for run_id in run_ids
+            if str(run_id) in archive_paths
+        }
+
+    def _get_archive_path(self, run_id: UUID) -> Optional[str]:
+        """Returns the directory of the archive of the given run.
+        :param run_id: The id of the run.
+        :return: The directory of the archive or None if the run is not archived."""
+
+        return self._get_archive_paths([run_id]).get(run_id)
+
+    def _get_trains_departure_arrivals(self, run_id: UUID) -> list[str]:
+        archive_path = self._get_archive_path(run_id)
+        if archive_path is None:
+            return super()._get_trains_departure_arrivals(run_id)
+        train_ids = set()
+        for model in [TrainArrivalLogEntry, TrainDepartureLogEntry]:
+            train_ids |= set(read_archive(archive_path, model, ["train_id"]).train_id)
+        return list(train_ids)
+
+    def _get_station_events_of_train(
+        self, archive_path: str, model, train_id: str
+    ) -> pd.DataFrame:
+        """Returns a DataFrame containing all arrivals or departures of the given
+        train from an archive.
+        :param archive_path: The directory of the archive of the run.
+        :param model: TrainArrivalLogEntry or TrainDepartureLogEntry.
+        :param train_id: The id of the train.
+        :return: A DataFrame containing the tick and station_id of the events."""
+
+        events_df = read_archive(
+            archive_path,
+            model,
+            ["tick", "station_id"],
+            filters=[("train_id", "==", train_id)],
+        )
+        return events_df.sort_values("tick")
+
+    def _get_departures_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        archive_path = self._get_archive_path(run_id)
+        if archive_path is None:
+            return super()._get_departures_of_train(run_id, train_id)
+        return self._get_station_events_of_train(
+            archive_path, TrainDepartureLogEntry, train_id
+        )
+
+    def _get_arrivals_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        archive_path = self._get_archive_path(run_id)
+        if archive_path is None:
+            return super()._get_arrivals_of_train(run_id, train_id)
+        return self._get_station_events_of_train(
+            archive_path, TrainArrivalLogEntry, train_id
+        )
+
+    def _read_archived_runs(
+        self, archive_paths: dict[UUID, str], model, columns: list[str]
+    ) -> pd.DataFrame:
+        """Reads a log table of archived runs, every archive file once.
+        :param archive_paths: The directories of the archives by the id of their run.
+        :param model: The log table.
+        :param columns: The columns to load besides the train_id and the tick.
+        :return: A DataFrame of the entries with the id of their run."""
+
+        return pd.concat(
+            [
+                read_archive(
+                    archive_path, model, ["train_id", "tick"] + columns
+                ).assign(run_id=run_id)
+                for run_id, archive_path in archive_paths.items()
+            ],
+            axis=0,
+            ignore_index=True,
+        )
+
+    # pylint: disable=too-many-arguments
+    def _get_of_archived_runs(
+        self,
+        run_ids: list[UUID],
+        get_of_runs,
+        pair_archived_runs,
+        columns: list[str],
+        sort_column: str,
+    ) -> pd.DataFrame:
+        """Collects a DataFrame of all trains in the given runs. The events of
+        archived runs are read once per run and log table and paired for all trains
+        at once, the other runs are read with one query.
+        :param run_ids: The ids of the runs.
+        :param get_of_runs: Returns the DataFrame of runs from the database.
+        :param pair_archived_runs: Returns the DataFrame of runs from the
+        directories of their archives.
+        :param columns: The columns of the result.
+        :param sort_column: The column to sort by after the run_id and train_id.
+        :return: The DataFrame of all trains in the given runs."""
+
+        archive_paths = self._get_archive_paths(run_ids)
+        if len(archive_paths) == 0:
+            return get_of_runs(run_ids)
+        runs_df = pair_archived_runs(archive_paths)[columns]
+        if len(archive_paths) < len(run_ids):
+            runs_df = pd.concat(
+                [
+                    get_of_runs(
+                        [run_id for run_id in run_ids if run_id not in archive_paths]
+                    ),
+                    runs_df,
+                ],
+                axis=0,
+            )
+        runs_df.sort_values(["run_id", "train_id", sort_column], inplace=True)
+        return runs_df.reset_index(drop=True)
+
+    def _pair_archived_departures_arrivals(
+        self, archive_paths: dict[UUID, str]
+    ) -> pd.DataFrame:
+        """Pairs the departures and arrivals of all trains in archived runs like
+        get_departures_arrivals_of_runs.
+        :param archive_paths: The directories of the archives by the id of their run.
+        :return: A DataFrame containing departures and arrivals with the id of their
+        run."""
+
+        paired_df = self._pair_event_frames(
+            self._read_archived_runs(
+                archive_paths, TrainArrivalLogEntry, ["station_id"]
+            ),
+            self._read_archived_runs(
+                archive_paths, TrainDepartureLogEntry, ["station_id"]
+            ),
+            last_operator=">",
+        )
+        departures_arrivals_df = pd.DataFrame(
+            {
+                "station_id": paired_df["first_station_id"].combine_first(
+                    paired_df["second_station_id"]
+                ),
+                "arrival_tick": paired_df["first_tick"],
+                "departure_tick": paired_df["second_tick"],
+                "train_id": paired_df["train_id"],
+                "run_id": paired_df["run_id"],
+            }
+        )
+        departures_arrivals_df = departures_arrivals_df.replace(np.nan, None)
+        return departures_arrivals_df.astype(DEPARTURES_ARRIVALS_DTYPES)
+
+    def _pair_archived_edge_times(self, archive_paths: dict[UUID, str]) -> pd.DataFrame:
+        """Pairs the edge entries and exits of all trains in archived runs like
+        get_edge_times_of_runs.
+        :param archive_paths: The directories of the archives by the id of their run.
+        :return: A DataFrame containing block section times with the id of their
+        run."""
+
+        paired_df = self._pair_event_frames(
+            self._read_archived_runs(
+                archive_paths, TrainEnterEdgeLogEntry, ["edge_id", "edge_length"]
+            ),
+            self._read_archived_runs(
+                archive_paths, TrainLeaveEdgeLogEntry, ["edge_id"]
+            ),
+            last_operator=">=",
+        )
+        return pd.DataFrame(
+            {
+                "enter_tick": paired_df["first_tick"],
+                "leave_tick": paired_df["second_tick"],
+                "edge_id": paired_df["first_edge_id"].combine_first(
+                    paired_df["second_edge_id"]
+                ),
+                "edge_length": paired_df["first_edge_length"],
+                "train_id": paired_df["train_id"],
+                "run_id": paired_df["run_id"],
+            }
+        )
+
+    def get_departures_arrivals_of_runs(self, run_ids: list[UUID]) -> pd.DataFrame:
+        return self._get_of_archived_runs(
+            run_ids,
+            super().get_departures_arrivals_of_runs,
+            self._pair_archived_departures_arrivals,
+            DEPARTURES_ARRIVALS_COLUMNS + ["run_id"],
+            "departure_tick",
+        )
+
+    def get_edge_times_of_runs(self, run_ids: list[UUID]) -> pd.DataFrame:
+        return self._get_of_archived_runs(
+            run_ids,
+            super().get_edge_times_of_runs,
+            self._pair_archived_edge_times,
+            EDGE_TIMES_COLUMNS + ["run_id"],
+            "leave_tick",
+        )
+
+    def iter_departures_arrivals_of_runs(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        return self._iter_of_runs(
+            run_ids, self.get_departures_arrivals_of_runs, chunk_size
+        )
+
+    def iter_edge_times_of_runs(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        return self._iter_of_runs(run_ids, self.get_edge_times_of_runs, chunk_size)
+
+    def _get_trains_edge(self, run_id: UUID) -> list[str]:
+        archive_path = self._get_archive_path(run_id)
+        if archive_path is None:
+            return super()._get_trains_edge(run_id)
+        train_ids = set()
+        for model in [TrainEnterEdgeLogEntry, TrainLeaveEdgeLogEntry]:
+            train_ids |= set(read_archive(archive_path, model, ["train_id"]).train_id)
+        return list(train_ids)
+
+    def _get_edge_enters_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        archive_path = self._get_archive_path(run_id)
+        if archive_path is None:
+            return super()._get_edge_enters_of_train(run_id, train_id)
+        return read_archive(
+            archive_path,
+            TrainEnterEdgeLogEntry,
+            ["tick", "edge_id", "edge_length"],
+            filters=[("train_id", "==", train_id)],
+        )
+
+    def _get_edge_leaves_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        archive_path = self._get_archive_path(run_id)
+        if archive_path is None:
+            return super()._get_edge_leaves_of_train(run_id, train_id)
+        return read_archive(
+            archive_path,
+            TrainLeaveEdgeLogEntry,
+            ["tick", "edge_id"],
+            filters=[("train_id", "==", train_id)],
+        )
+
+    def get_train_spawn_times(self, run_id: UUID) -> pd.DataFrame:
+        archive_path = self._get_archive_path(run_id)
+        if archive_path is None:
+            return super().get_train_spawn_times(run_id)
+        return read_archive(archive_path, TrainSpawnLogEntry, ["tick", "train_id"])
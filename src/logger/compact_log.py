@@ -0,0 +1,188 @@
+"""
+This module contains the optional compact storage layout of the logs. Instead of one
+table per event kind, all train, edge, station, signal and fahrstrasse events of a run
+are stored in one narrow table. Identifiers are interned into dictionary tables and
+messages are only rendered when they are read.
+"""
+import os
+from typing import Type
+from uuid import UUID
+
+from peewee import (
+    AutoField,
+    FloatField,
+    ForeignKeyField,
+    IntegerField,
+    Model,
+    SmallIntegerField,
+    TextField,
+)
+
+from src.base_model import db
+from src.event_bus.event import EventType
+from src.implementor.models import Run
+
+
+def compact_logging_enabled() -> bool:
+    """
+    :return: Whether the compact log tables are used, configured by `COMPACT_LOGGING`
+    """
+    return bool(os.getenv("COMPACT_LOGGING"))
+
+
+class CompactModel(Model):
+    """Base class of the compact log tables. They don't inherit from BaseModel to
+    avoid storing a UUID, timestamps and a readable id for every row."""
+
+    class Meta:
+        """Set Database"""
+
+        database = db
+
+
+class DictionaryModel(CompactModel):
+    """Maps an identifier of the simulation to a small integer."""
+
+    id = AutoField()
+    name = TextField(null=False, unique=True)
+
+
+class TrainDictionary(DictionaryModel):
+    """Interned train ids."""
+
+
+class EdgeDictionary(DictionaryModel):
+    """Interned edge ids."""
+
+
+class StationDictionary(DictionaryModel):
+    """Interned station ids."""
+
+
+class SignalDictionary(DictionaryModel):
+    """Interned signal ids."""
+
+
+class FahrstrasseDictionary(DictionaryModel):
+    """Interned fahrstrassen."""
+
+
+MESSAGE_TEMPLATES: dict[EventType, str] = {
+    EventType.TRAIN_SPAWN: "Train with ID {train} spawned",
+    EventType.TRAIN_REMOVE: "Train with ID {train} removed",
+    EventType.TRAIN_ARRIVAL: "Train with ID {train} arrived at station with ID {station}",
+    EventType.TRAIN_DEPARTURE: "Train with ID {train} departed from "
+    "station with ID {station}",
+    EventType.CREATE_FAHRSTRASSE: "Fahrstrasse {fahrstrasse} created",
+    EventType.REMOVE_FAHRSTRASSE: "Fahrstrasse {fahrstrasse} removed",
+    EventType.SET_SIGNAL: "Signal with ID {signal} changed "
+    "from {state_before} to {state_after}",
+    EventType.TRAIN_ENTER_EDGE: "Train with ID {train} entered block section "
+    "with ID {edge} with length {edge_length}",
+    EventType.TRAIN_LEAVE_EDGE: "Train with ID {train} left block section with ID {edge}",
+}
+
+
+class CompactLogEvent(CompactModel):
+    """A single event of a run in the compact storage layout. Which of the nullable
+    columns are set depends on the `event_type`, which stores the value of the
+    corresponding `EventType`."""
+
+    id = AutoField()
+    run_id = ForeignKeyField(Run, null=False)
+    tick = IntegerField(null=False)
+    event_type = SmallIntegerField(null=False)
+    train = ForeignKeyField(TrainDictionary, null=True)
+    edge = ForeignKeyField(EdgeDictionary, null=True)
+    station = ForeignKeyField(StationDictionary, null=True)
+    signal = ForeignKeyField(SignalDictionary, null=True)
+    fahrstrasse = ForeignKeyField(FahrstrasseDictionary, null=True)
+    edge_length = FloatField(null=True)
+    state_before = SmallIntegerField(null=True)
+    state_after = SmallIntegerField(null=True)
+
+    class Meta:
+        """Most queries select the events of one kind in one run."""
+
+        indexes = ((("run_id", "event_type", "tick"), False),)
+
+    @property
+    def message(self) -> str:
+        """Renders the message of the event, like it is stored by the regular logger.
+
+        :return: The message of the event
+        """
+        # peewee adds the <field>_id attributes of the foreign keys
+        # pylint: disable=no-member
+        names = {
+            "train": self.train.name if self.train_id is not None else None,
+            "edge": self.edge.name if self.edge_id is not None else None,
+            "station": self.station.name if self.station_id is not None else None,
+            "signal": self.signal.name if self.signal_id is not None else None,
+            "fahrstrasse": self.fahrstrasse.name
+            if self.fahrstrasse_id is not None
+            else None,
+        }
+        return MESSAGE_TEMPLATES[EventType(self.event_type)].format(
+            edge_length=self.edge_length,
+            state_before=self.state_before,
+            state_after=self.state_after,
+            **names,
+        )
+
+
+class CompactLogWriter:
+    """Writes events of a run into the compact log table. The interned ids are cached,
+    so every identifier is only looked up once per run."""
+
+    run_id: UUID
+    _interned: dict[Type[DictionaryModel], dict[str, int]]
+
+    def __init__(self, run_id: UUID):
+        """
+        :param run_id: The id of the run the events belong to
+        """
+        self.run_id = run_id
+        self._interned = {}
+
+    def intern(self, dictionary: Type[DictionaryModel], name: str) -> int:
+        """Returns the integer id of an identifier and adds it to the dictionary
+        table if it is not known yet.
+
+        :param dictionary: The dictionary table of the identifier
+        :param name: The identifier
+        :return: The interned id
+        """
+        name = str(name)
+        cache = self._interned.setdefault(dictionary, {})
+        if name not in cache:
+            dictionary.insert(name=name).on_conflict_ignore().execute()
+            cache[name] = (
+                dictionary.select(dictionary.id).where(dictionary.name == name).get().id
+            )
+        return cache[name]
+
+    def write(self, event_type: EventType, tick: int, **values):
+        """Stores a single event.
+
+        :param event_type: The type of the event
+        :param tick: The tick of the event
+        :param values: The identifiers (`train`, `edge`, `station`, `signal`,
+            `fahrstrasse`) and values (`edge_length`, `state_before`, `state_after`)
+            of the event
+        """
+        dictionaries = {
+            "train": TrainDictionary,
+            "edge": EdgeDictionary,
+            "station": StationDictionary,
+            "signal": SignalDictionary,
+            "fahrstrasse": FahrstrasseDictionary,
+        }
+        row = {
+            key: self.intern(dictionaries[key], value) if key in dictionaries else value
+            for key, value in values.items()
+        }
+        # pylint: disable-next=no-value-for-parameter
+        CompactLogEvent.insert(
+            run_id=self.run_id, tick=tick, event_type=event_type.value, **row
+        ).execute()
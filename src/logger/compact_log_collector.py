@@ -0,0 +1,162 @@
+from typing import Iterator
+from uuid import UUID
+
+import pandas as pd
+from peewee import JOIN
+
+from src.event_bus.event import EventType
+from src.logger.compact_log import (
+    CompactLogEvent,
+    EdgeDictionary,
+    StationDictionary,
+    TrainDictionary,
+)
+from src.logger.log_collector import LogCollector
+from src.logger.log_stream import DEFAULT_CHUNK_SIZE
+
+
+class CompactLogCollector(LogCollector):
+    """The CompactLogCollector provides the same structured logs as the LogCollector,
+    but reads them from the compact log table. Faults are read from their regular
+    tables."""
+
+    def _select_events(self, run_id: UUID, *event_types: EventType):
+        """Returns a query of all events of the given types in the given run with
+        their interned ids resolved.
+        :param run_id: The id of the run.
+        :param event_types: The types of the events.
+        :return: A query returning dicts with the tick and the resolved ids."""
+
+        return (
+            CompactLogEvent.select(
+                CompactLogEvent.tick,
+                CompactLogEvent.event_type,
+                CompactLogEvent.edge_length,
+                TrainDictionary.name.alias("train_id"),
+                StationDictionary.name.alias("station_id"),
+                EdgeDictionary.name.alias("edge_id"),
+            )
+            .join_from(CompactLogEvent, TrainDictionary, JOIN.LEFT_OUTER)
+            .join_from(CompactLogEvent, StationDictionary, JOIN.LEFT_OUTER)
+            .join_from(CompactLogEvent, EdgeDictionary, JOIN.LEFT_OUTER)
+            .where(
+                (CompactLogEvent.run_id == run_id)
+                & (
+                    CompactLogEvent.event_type.in_(
+                        [event_type.value for event_type in event_types]
+                    )
+                )
+            )
+            .dicts()
+        )
+
+    def _select_names(self, dictionary, *event_types: EventType, run_id=None):
+        """Returns the distinct names of a dictionary table that are referenced by
+        events of the given types.
+        :param dictionary: The dictionary table.
+        :param event_types: The types of the events.
+        :param run_id: The id of the run, defaults to all runs.
+        :return: A list of the names."""
+
+        condition = CompactLogEvent.event_type.in_(
+            [event_type.value for event_type in event_types]
+        )
+        if run_id is not None:
+            condition &= CompactLogEvent.run_id == run_id
+        query = (
+            dictionary.select(dictionary.name)
+            .join(CompactLogEvent)
+            .where(condition)
+            .distinct()
+        )
+        # pylint will not recognize that peewee results are iterable
+        # pylint: disable=not-an-iterable
+        return [entry.name for entry in query]
+
+    def _get_trains_departure_arrivals(self, run_id: UUID) -> list[str]:
+        return self._select_names(
+            TrainDictionary,
+            EventType.TRAIN_ARRIVAL,
+            EventType.TRAIN_DEPARTURE,
+            run_id=run_id,
+        )
+
+    def _get_station_events_of_train(
+        self, run_id: UUID, train_id: str, event_type: EventType
+    ) -> pd.DataFrame:
+        """Returns a DataFrame containing all arrivals or departures of the given
+        train in the given run.
+        :param run_id: The id of the run.
+        :param train_id: The id of the train.
+        :param event_type: TRAIN_ARRIVAL or TRAIN_DEPARTURE.
+        :return: A DataFrame containing the tick and station_id of the events."""
+
+        events = self._select_events(run_id, event_type).where(
+            TrainDictionary.name == train_id
+        )
+        events_df = pd.DataFrame(
+            [[e["tick"], e["station_id"]] for e in events],
+            columns=["tick", "station_id"],
+        )
+        return events_df.sort_values("tick")
+
+    def _get_departures_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        return self._get_station_events_of_train(
+            run_id, train_id, EventType.TRAIN_DEPARTURE
+        )
+
+    def _get_arrivals_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        return self._get_station_events_of_train(
+            run_id, train_id, EventType.TRAIN_ARRIVAL
+        )
+
+    def get_departures_arrivals_of_runs(self, run_ids: list[UUID]) -> pd.DataFrame:
+        return self._get_departures_arrivals_of_runs_per_train(run_ids)
+
+    def get_edge_times_of_runs(self, run_ids: list[UUID]) -> pd.DataFrame:
+        return self._get_edge_times_of_runs_per_train(run_ids)
+
+    def iter_departures_arrivals_of_runs(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        return self._iter_of_runs(
+            run_ids, self.get_departures_arrivals_of_runs, chunk_size
+        )
+
+    def iter_edge_times_of_runs(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        return self._iter_of_runs(run_ids, self.get_edge_times_of_runs, chunk_size)
+
+    def _get_trains_edge(self, run_id: UUID) -> list[str]:
+        return self._select_names(
+            TrainDictionary,
+            EventType.TRAIN_ENTER_EDGE,
+            EventType.TRAIN_LEAVE_EDGE,
+            run_id=run_id,
+        )
+
+    def _get_edge_enters_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        events = self._select_events(run_id, EventType.TRAIN_ENTER_EDGE).where(
+            TrainDictionary.name == train_id
+        )
+        return pd.DataFrame(
+            [[e["tick"], e["edge_id"], e["edge_length"]] for e in events],
+            columns=["tick", "edge_id", "edge_length"],
+        )
+
+    def _get_edge_leaves_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        events = self._select_events(run_id, EventType.TRAIN_LEAVE_EDGE).where(
+            TrainDictionary.name == train_id
+        )
+        return pd.DataFrame(
+            [[e["tick"], e["edge_id"]] for e in events],
+            columns=["tick", "edge_id"],
+        )
+
+    def get_train_spawn_times(self, run_id: UUID) -> pd.DataFrame:
+        spawn_entries = [
+            (e["tick"], e["train_id"])
+            for e in self._select_events(run_id, EventType.TRAIN_SPAWN)
+        ]
+        return pd.DataFrame(spawn_entries, columns=["tick", "train_id"])
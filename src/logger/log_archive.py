@@ -0,0 +1,148 @@
+"""
+This module contains the archive of finished runs. The logs of a finished run are
+immutable, so they are exported once into a Parquet dataset with one file per event kind
+and read from there instead of the database.
+"""
+import io
+import os
+import zipfile
+from typing import Optional, Type
+from uuid import UUID
+
+import pandas as pd
+
+from src.component import Component
+from src.event_bus.event_bus import EventBus
+from src.implementor.models import Run
+from src.logger.log_entry import LOG_ENTRY_MODELS, LogEntry
+
+ARCHIVED_COLUMNS_EXCLUDED = ["id", "run_id"]
+
+
+def log_archive_directory() -> Optional[str]:
+    """
+    :return: The directory the run archives are written to, configured by
+        `LOG_ARCHIVE_PATH`. Runs are not archived if it is not set.
+    """
+    return os.getenv("LOG_ARCHIVE_PATH", None)
+
+
+def archive_file(archive_path: str, model: Type[LogEntry]) -> str:
+    """
+    :param archive_path: The directory of the archive of a run
+    :param model: The log table
+    :return: The path of the file holding the entries of the log table
+    """
+    # pylint: disable=protected-access
+    return os.path.join(archive_path, f"{model._meta.table_name}.parquet")
+
+
+def _archived_columns(model: Type[LogEntry]) -> list[str]:
+    """
+    :param model: The log table
+    :return: The columns of the log table that are stored in the archive
+    """
+    # pylint: disable=protected-access
+    return [
+        field.column_name
+        for field in model._meta.sorted_fields
+        if field.name not in ARCHIVED_COLUMNS_EXCLUDED
+    ]
+
+
+def _export_log_table(run_id: UUID, model: Type[LogEntry], path: str):
+    """Writes all entries of a log table in a run into a Parquet file. The string
+    columns are stored dictionary-encoded.
+
+    :param run_id: The id of the run
+    :param model: The log table
+    :param path: The path of the Parquet file
+    """
+    # pylint: disable=protected-access
+    columns = _archived_columns(model)
+    fields = [model._meta.columns[column] for column in columns]
+    entries = pd.DataFrame(
+        list(model.select(*fields).where(model.run_id == run_id).tuples()),
+        columns=columns,
+    )
+    for column in entries.columns:
+        if entries[column].dtype == object:
+            entries[column] = (
+                entries[column]
+                .map(lambda value: None if value is None else str(value))
+                .astype("category")
+            )
+    entries.to_parquet(path, index=False)
+
+
+def export_run_logs(run_id: UUID) -> str:
+    """Exports the logs of a finished run into its archive and records the location
+    on the run.
+
+    :param run_id: The id of the run
+    :return: The directory of the archive
+    """
+    archive_path = os.path.join(log_archive_directory(), str(run_id))
+    os.makedirs(archive_path, exist_ok=True)
+    for model in LOG_ENTRY_MODELS:
+        _export_log_table(run_id, model, archive_file(archive_path, model))
+    Run.update(archive_path=archive_path).where(Run.id == run_id).execute()
+    return archive_path
+
+
+def read_archive(
+    archive_path: str,
+    model: Type[LogEntry],
+    columns: list[str],
+    filters: Optional[list[tuple]] = None,
+) -> pd.DataFrame:
+    """Reads the entries of a log table from the archive of a run. Only the given
+    columns are loaded.
+
+    :param archive_path: The directory of the archive of the run
+    :param model: The log table
+    :param columns: The columns to load
+    :param filters: Filters on the rows in the form `(column, operator, value)`,
+        defaults to None
+    :return: A DataFrame containing the given columns
+    """
+    entries = pd.read_parquet(
+        archive_file(archive_path, model), columns=columns, filters=filters
+    )
+    for column in entries.columns:
+        if isinstance(entries[column].dtype, pd.CategoricalDtype):
+            entries[column] = entries[column].astype(object)
+    return entries
+
+
+def zip_archive(archive_path: str) -> io.BytesIO:
+    """Packs the archive of a run into a zip file.
+
+    :param archive_path: The directory of the archive of the run
+    :return: The zip file
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive_zip:
+        for model in LOG_ENTRY_MODELS:
+            path = archive_file(archive_path, model)
+            archive_zip.write(path, arcname=os.path.basename(path))
+    buffer.seek(0)
+    return buffer
+
+
+class LogArchiver(Component):
+    """
+    Exports the logs of the run into its archive when the simulation is finished.
+    """
+
+    def __init__(self, event_bus: EventBus):
+        """
+        The constructor of the log archiver class
+        """
+        super().__init__(event_bus, "LOW")
+
+    def next_tick(self, tick: int):
+        pass
+
+    def finish(self):
+        export_run_logs(self.event_bus.run_id)
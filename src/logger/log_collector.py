@@ -1,3 +1,5 @@
+from contextlib import closing
+from typing import Iterator, Optional
 from uuid import UUID
 
 import numpy as np
@@ -13,6 +15,80 @@ from src.logger.log_entry import (
     TrainLeaveEdgeLogEntry,
     TrainSpawnLogEntry,
 )
+from src.logger.log_stream import (
+    DEFAULT_CHUNK_SIZE,
+    concat_chunks,
+    iter_query_chunks,
+    iter_sql_chunks,
+)
+from src.logger.result_cache import cached_by_run
+from src.logger.run_dimension import RunStation, RunTrain
+
+# Pairs the events of two log tables (e.g. arrivals and departures) of every train by
+# their position in the ordered events of the train. If the first event of the second
+# table precedes the first event of the first table, the events of the first table are
+# shifted by one slot. If the last event of the first table follows the last event of
+# the second table (as determined by `last_operator`), it gets an additional slot.
+PAIRED_EVENTS_QUERY = """
+WITH first_events AS (
+    SELECT {run_id} AS run_id, train_id, tick, {first_columns},
+        ROW_NUMBER() OVER (PARTITION BY {run_id}, train_id ORDER BY tick) AS number,
+        COUNT(*) OVER (PARTITION BY {run_id}, train_id) AS count,
+        MIN(tick) OVER (PARTITION BY {run_id}, train_id) AS first_tick,
+        MAX(tick) OVER (PARTITION BY {run_id}, train_id) AS last_tick
+    FROM "{first_table}"
+    WHERE {run_id} IN ({run_ids})
+), second_events AS (
+    SELECT {run_id} AS run_id, train_id, tick, {second_columns},
+        ROW_NUMBER() OVER (PARTITION BY {run_id}, train_id ORDER BY tick) AS number,
+        COUNT(*) OVER (PARTITION BY {run_id}, train_id) AS count,
+        MIN(tick) OVER (PARTITION BY {run_id}, train_id) AS first_tick,
+        MAX(tick) OVER (PARTITION BY {run_id}, train_id) AS last_tick
+    FROM "{second_table}"
+    WHERE {run_id} IN ({run_ids})
+), trains AS (
+    SELECT first_events.run_id, first_events.train_id,
+        CASE WHEN first_events.first_tick < second_events.first_tick
+            THEN 0 ELSE 1 END AS first_offset,
+        LEAST(
+            first_events.count
+                + CASE WHEN first_events.first_tick < second_events.first_tick
+                    THEN 0 ELSE 1 END,
+            second_events.count
+                + CASE WHEN first_events.last_tick {last_operator} second_events.last_tick
+                    THEN 1 ELSE 0 END
+        ) AS slots
+    FROM first_events
+    JOIN second_events
+        ON second_events.run_id = first_events.run_id
+        AND second_events.train_id = first_events.train_id
+    WHERE first_events.number = 1 AND second_events.number = 1
+), slots AS (
+    SELECT run_id, train_id, first_offset, generate_series(1, slots) AS slot
+    FROM trains
+)
+SELECT {select_columns}, slots.train_id, slots.run_id
+FROM slots
+LEFT JOIN first_events
+    ON first_events.run_id = slots.run_id
+    AND first_events.train_id = slots.train_id
+    AND first_events.number + slots.first_offset = slots.slot
+LEFT JOIN second_events
+    ON second_events.run_id = slots.run_id
+    AND second_events.train_id = slots.train_id
+    AND second_events.number = slots.slot
+ORDER BY slots.run_id, slots.train_id, slots.slot
+"""
+
+EDGE_TIMES_COLUMNS = ["enter_tick", "leave_tick", "edge_id", "edge_length", "train_id"]
+DEPARTURES_ARRIVALS_COLUMNS = [
+    "station_id",
+    "arrival_tick",
+    "departure_tick",
+    "train_id",
+]
+DEPARTURES_ARRIVALS_DTYPES = {"arrival_tick": "Int64", "departure_tick": "Int64"}
+TICK_DTYPES = {"tick": "int64"}
 
 
 class LogCollector:
@@ -41,48 +117,27 @@ class LogCollector:
         train_ids = train_ids.union({t.train_id for t in trains_departures})
         return list(train_ids)
 
-    def get_trains(self) -> list[str]:
-        """Returns a list of all trains.
+    def get_trains(
+        self, run_id: Optional[UUID] = None, config_id: Optional[UUID] = None
+    ) -> list[str]:
+        """Returns a list of all trains, read from the run_train dimension table.
+        :param run_id: Only return the trains of this run.
+        :param config_id: Only return the trains of runs of this config.
         :return: A list of all trains.
         """
 
-        trains_arrivals = TrainArrivalLogEntry.select(
-            TrainArrivalLogEntry.train_id
-        ).distinct()
-        trains_departures = TrainDepartureLogEntry.select(
-            TrainDepartureLogEntry.train_id
-        ).distinct()
-        trains_enter = TrainEnterEdgeLogEntry.select(
-            TrainEnterEdgeLogEntry.train_id
-        ).distinct()
-        trains_leave = TrainLeaveEdgeLogEntry.select(
-            TrainLeaveEdgeLogEntry.train_id
-        ).distinct()
+        return RunTrain.names(run_id=run_id, config_id=config_id)
 
-        # pylint will not recognize that peewee results are iterable
-        # pylint: disable=not-an-iterable
-        trains = {t.train_id for t in trains_arrivals}
-        trains = trains.union({t.train_id for t in trains_departures})
-        trains = trains.union({t.train_id for t in trains_enter})
-        trains = trains.union({t.train_id for t in trains_leave})
-        return list(trains)
-
-    def get_stations(self) -> list[str]:
-        """Returns a list of all stations.
+    def get_stations(
+        self, run_id: Optional[UUID] = None, config_id: Optional[UUID] = None
+    ) -> list[str]:
+        """Returns a list of all stations, read from the run_station dimension table.
+        :param run_id: Only return the stations of this run.
+        :param config_id: Only return the stations of runs of this config.
         :return: A list of all stations.
         """
 
-        stations_arrivals = TrainArrivalLogEntry.select(
-            TrainArrivalLogEntry.station_id
-        ).distinct()
-        stations_departures = TrainDepartureLogEntry.select(
-            TrainDepartureLogEntry.station_id
-        ).distinct()
-        # pylint will not recognize that peewee results are iterable
-        # pylint: disable=not-an-iterable
-        station_ids = {t.station_id for t in stations_arrivals}
-        station_ids = station_ids.union({t.station_id for t in stations_departures})
-        return list(station_ids)
+        return RunStation.names(run_id=run_id, config_id=config_id)
 
     def get_run_ids(self) -> list[str]:
         """Returns a list of all run ids.
@@ -108,6 +163,19 @@ class LogCollector:
         ]
         return list(config_ids)
 
+    def _read_query(
+        self, query, columns: list[str], dtypes: Optional[dict[str, str]] = None
+    ) -> pd.DataFrame:
+        """Reads the rows of a query chunk by chunk into a DataFrame, without
+        creating a model instance per row.
+        :param query: The peewee select query.
+        :param columns: The names of the selected columns.
+        :param dtypes: The types of the columns, defaults to an int64 tick column.
+        :return: A DataFrame containing the rows of the query."""
+
+        dtypes = TICK_DTYPES if dtypes is None else dtypes
+        return concat_chunks(iter_query_chunks(query, columns, dtypes), columns, dtypes)
+
     def _get_departures_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
         """Returns a DataFrame containing all departures of the given train in
         the given run.
@@ -116,15 +184,13 @@ class LogCollector:
         :return: A DataFrame containing all departures of the given train in
         the given run."""
 
-        departures = TrainDepartureLogEntry.select().where(
+        departures = TrainDepartureLogEntry.select(
+            TrainDepartureLogEntry.tick, TrainDepartureLogEntry.station_id
+        ).where(
             (TrainDepartureLogEntry.run_id == run_id)
             & (TrainDepartureLogEntry.train_id == train_id)
         )
-        # pylint will not recognize that peewee results are iterable
-        # pylint: disable=not-an-iterable
-        departures_df = pd.DataFrame(
-            [[d.tick, d.station_id] for d in departures], columns=["tick", "station_id"]
-        )
+        departures_df = self._read_query(departures, ["tick", "station_id"])
         departures_df = departures_df.sort_values("tick")
         return departures_df
 
@@ -136,18 +202,154 @@ class LogCollector:
         :return: A DataFrame containing all arrivals of the given train in
         the given run."""
 
-        arrivals = TrainArrivalLogEntry.select().where(
+        arrivals = TrainArrivalLogEntry.select(
+            TrainArrivalLogEntry.tick, TrainArrivalLogEntry.station_id
+        ).where(
             (TrainArrivalLogEntry.run_id == run_id)
             & (TrainArrivalLogEntry.train_id == train_id)
         )
-        # pylint will not recognize that peewee results are iterable
-        # pylint: disable=not-an-iterable
-        arrivals_df = pd.DataFrame(
-            [[a.tick, a.station_id] for a in arrivals], columns=["tick", "station_id"]
-        )
+        arrivals_df = self._read_query(arrivals, ["tick", "station_id"])
         arrivals_df = arrivals_df.sort_values("tick")
         return arrivals_df
 
+    # pylint: disable=too-many-arguments
+    def _iter_paired_events(
+        self,
+        run_ids: list[UUID],
+        first_model,
+        second_model,
+        first_columns: list[str],
+        second_columns: list[str],
+        last_operator: str,
+        select_columns: dict[str, str],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """Pairs the events of two log tables of all trains in the given runs
+        within a single query (see PAIRED_EVENTS_QUERY) and yields the pairs
+        ordered by run, train and slot in chunks.
+        :param run_ids: The ids of the runs.
+        :param first_model: The log table of the first events of a pair.
+        :param second_model: The log table of the second events of a pair.
+        :param first_columns: The columns needed from the first log table.
+        :param second_columns: The columns needed from the second log table.
+        :param last_operator: Compares the last first event with the last second
+        event to decide whether the last first event gets its own slot.
+        :param select_columns: The resulting columns and their SQL expressions.
+        :param chunk_size: The maximum number of pairs per chunk.
+        :return: An iterator of DataFrames containing the selected columns, the
+        train_id and the run_id of every pair."""
+
+        columns = list(select_columns) + ["train_id", "run_id"]
+        if len(run_ids) == 0:
+            return
+        # pylint: disable=protected-access
+        database = first_model._meta.database
+        query = PAIRED_EVENTS_QUERY.format(
+            first_table=first_model._meta.table_name,
+            second_table=second_model._meta.table_name,
+            first_columns=", ".join(first_columns),
+            second_columns=", ".join(second_columns),
+            last_operator=last_operator,
+            select_columns=", ".join(
+                f"{expression} AS {column}"
+                for column, expression in select_columns.items()
+            ),
+            run_id=first_model.run_id.column_name,
+            run_ids=", ".join([database.param] * len(run_ids)),
+        )
+        with closing(
+            iter_sql_chunks(
+                database,
+                query,
+                [str(run_id) for run_id in run_ids] * 2,
+                columns,
+                chunk_size=chunk_size,
+            )
+        ) as paired_chunks:
+            for paired_df in paired_chunks:
+                paired_df["run_id"] = paired_df["run_id"].map(
+                    lambda run_id: UUID(str(run_id))
+                )
+                yield paired_df
+
+    @staticmethod
+    def _number_events(events_df: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+        """Numbers the events of every train in tick order, starting at 1.
+        :param events_df: The events with a tick column and the key columns.
+        :param keys: The columns identifying a train.
+        :return: The events ordered by train and tick with a number column."""
+
+        events_df = events_df.sort_values(keys + ["tick"], kind="stable")
+        return events_df.assign(number=events_df.groupby(keys).cumcount() + 1)
+
+    def _pair_event_frames(
+        self, first_df: pd.DataFrame, second_df: pd.DataFrame, last_operator: str
+    ) -> pd.DataFrame:
+        """Pairs the events of two DataFrames of all trains by the rules of
+        PAIRED_EVENTS_QUERY, for events that are not read from the database.
+        :param first_df: The first events of the pairs with a run_id, train_id and
+        tick column.
+        :param second_df: The second events of the pairs with a run_id, train_id and
+        tick column.
+        :param last_operator: ">" or ">=", compares the last first event with the
+        last second event to decide whether the last first event gets its own slot.
+        :return: A DataFrame of the run_id and train_id of every pair and the columns
+        of both events prefixed with "first_" and "second_", ordered by run, train
+        and slot."""
+
+        keys = ["run_id", "train_id"]
+        first_df = self._number_events(first_df, keys)
+        second_df = self._number_events(second_df, keys)
+        trains = (
+            first_df.groupby(keys)["tick"]
+            .agg(["count", "min", "max"])
+            .join(
+                second_df.groupby(keys)["tick"].agg(["count", "min", "max"]),
+                how="inner",
+                lsuffix="_first",
+                rsuffix="_second",
+            )
+        )
+        first_offset = np.where(trains["min_first"] < trains["min_second"], 0, 1)
+        if last_operator == ">":
+            last_slot = trains["max_first"] > trains["max_second"]
+        else:
+            last_slot = trains["max_first"] >= trains["max_second"]
+        slots = np.minimum(
+            trains["count_first"] + first_offset,
+            trains["count_second"] + last_slot.astype(int),
+        )
+        slots_df = trains.index.repeat(slots).to_frame(index=False)
+        slots_df["slot"] = slots_df.groupby(keys).cumcount() + 1
+
+        offsets = pd.Series(first_offset, index=trains.index, name="first_offset")
+        first_df = first_df.join(offsets, on=keys)
+        first_df["slot"] = first_df["number"] + first_df["first_offset"]
+        first_df = first_df.drop(columns=["number", "first_offset"])
+        second_df = second_df.rename(columns={"number": "slot"})
+        paired_df = slots_df.merge(
+            first_df.rename(
+                columns={
+                    column: f"first_{column}"
+                    for column in first_df.columns
+                    if column not in keys + ["slot"]
+                }
+            ),
+            on=keys + ["slot"],
+            how="left",
+        ).merge(
+            second_df.rename(
+                columns={
+                    column: f"second_{column}"
+                    for column in second_df.columns
+                    if column not in keys + ["slot"]
+                }
+            ),
+            on=keys + ["slot"],
+            how="left",
+        )
+        return paired_df.drop(columns="slot")
+
     def get_departures_arrivals_of_train(
         self, run_id: UUID, train_id: str
     ) -> pd.DataFrame:
@@ -181,9 +383,11 @@ class LogCollector:
         )
         return departures_arrivals_df
 
-    def get_departures_arrivals_all_trains(self, run_id: UUID) -> pd.DataFrame:
+    def _get_departures_arrivals_all_trains_per_train(
+        self, run_id: UUID
+    ) -> pd.DataFrame:
         """Returns a DataFrame containing all departures and arrivals of all
-        trains in the given run.
+        trains in the given run by pairing them train by train.
         :param run_id: The id of the run.
         :return: A DataFrame containing all departures and arrivals of all
         trains in the given run."""
@@ -207,6 +411,155 @@ class LogCollector:
         departures_arrivals_df = departures_arrivals_df.reset_index(drop=True)
         return departures_arrivals_df
 
+    @cached_by_run
+    def get_departures_arrivals_all_trains(self, run_id: UUID) -> pd.DataFrame:
+        """Returns a DataFrame containing all departures and arrivals of all
+        trains in the given run.
+        :param run_id: The id of the run.
+        :return: A DataFrame containing all departures and arrivals of all
+        trains in the given run."""
+
+        departures_arrivals_df = self.get_departures_arrivals_of_runs([run_id])
+        if departures_arrivals_df.empty:
+            return pd.DataFrame(
+                columns=["train_id", "station_id", "arrival_tick", "departure_tick"]
+            )
+        del departures_arrivals_df["run_id"]
+        return departures_arrivals_df
+
+    def get_departures_arrivals_of_runs(self, run_ids: list[UUID]) -> pd.DataFrame:
+        """Returns a DataFrame containing all departures and arrivals of all
+        trains in the given runs. The k-th arrival of a train is paired with its
+        k-th departure within a single query. A departure before the first arrival
+        gets no arrival and an arrival after the last departure gets no departure.
+        :param run_ids: The ids of the runs.
+        :return: A DataFrame containing all departures and arrivals of all
+        trains in the given runs with the id of their run."""
+
+        departures_arrivals_df = concat_chunks(
+            self._iter_paired_departures_arrivals(run_ids),
+            DEPARTURES_ARRIVALS_COLUMNS + ["run_id"],
+            DEPARTURES_ARRIVALS_DTYPES,
+        )
+        departures_arrivals_df.sort_values(
+            ["run_id", "train_id", "departure_tick"], inplace=True
+        )
+        departures_arrivals_df = departures_arrivals_df.reset_index(drop=True)
+        return departures_arrivals_df
+
+    def iter_departures_arrivals_of_runs(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Yields all departures and arrivals of all trains in the given runs in
+        chunks, ordered by run, train and departure. Paired like in
+        get_departures_arrivals_of_runs, but at most chunk_size rows are held in
+        memory at once.
+        :param run_ids: The ids of the runs.
+        :param chunk_size: The maximum number of rows per chunk.
+        :return: An iterator of DataFrames containing departures and arrivals with
+        the id of their run."""
+
+        return self._iter_paired_departures_arrivals(run_ids, chunk_size)
+
+    def _iter_paired_departures_arrivals(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Pairs the departures and arrivals of all trains in the given runs in the
+        database and yields them in chunks.
+        :param run_ids: The ids of the runs.
+        :param chunk_size: The maximum number of rows per chunk.
+        :return: An iterator of DataFrames containing departures and arrivals with
+        the id of their run."""
+
+        for departures_arrivals_df in self._iter_paired_events(
+            run_ids,
+            TrainArrivalLogEntry,
+            TrainDepartureLogEntry,
+            first_columns=["station_id"],
+            second_columns=["station_id"],
+            last_operator=">",
+            select_columns={
+                "station_id": "COALESCE(first_events.station_id, "
+                "second_events.station_id)",
+                "arrival_tick": "first_events.tick",
+                "departure_tick": "second_events.tick",
+            },
+            chunk_size=chunk_size,
+        ):
+            departures_arrivals_df = departures_arrivals_df.replace(np.nan, None)
+            yield departures_arrivals_df.astype(DEPARTURES_ARRIVALS_DTYPES)
+
+    def _iter_of_runs(
+        self, run_ids: list[UUID], get_of_runs, chunk_size: int
+    ) -> Iterator[pd.DataFrame]:
+        """Yields the DataFrames of the given runs run by run in chunks. Used by
+        collectors that can not pair the events of all runs in one query.
+        :param run_ids: The ids of the runs.
+        :param get_of_runs: Returns the DataFrame of runs.
+        :param chunk_size: The maximum number of rows per chunk.
+        :return: An iterator of DataFrames with the id of their run."""
+
+        for run_id in run_ids:
+            run_df = get_of_runs([run_id])
+            for start in range(0, len(run_df), chunk_size):
+                yield run_df.iloc[start : start + chunk_size]
+
+    def _get_of_runs_per_train(
+        self,
+        run_ids: list[UUID],
+        get_all_trains,
+        columns: list[str],
+        sort_column: str,
+    ) -> pd.DataFrame:
+        """Collects a DataFrame of all trains run by run and train by train.
+        :param run_ids: The ids of the runs.
+        :param get_all_trains: Returns the DataFrame of all trains in a run.
+        :param columns: The columns of the result.
+        :param sort_column: The column to sort by after the run_id and train_id.
+        :return: The concatenated DataFrames with the id of their run."""
+
+        df_list = []
+        for run_id in run_ids:
+            run_df = get_all_trains(run_id)
+            if not run_df.empty:
+                run_df["run_id"] = run_id
+                df_list.append(run_df[columns])
+        if len(df_list) == 0:
+            return pd.DataFrame(columns=columns)
+        runs_df = pd.concat(df_list, axis=0)
+        runs_df.sort_values(["run_id", "train_id", sort_column], inplace=True)
+        return runs_df.reset_index(drop=True)
+
+    def _get_departures_arrivals_of_runs_per_train(
+        self, run_ids: list[UUID]
+    ) -> pd.DataFrame:
+        """Returns a DataFrame containing all departures and arrivals of all
+        trains in the given runs by pairing them run by run and train by train.
+        :param run_ids: The ids of the runs.
+        :return: A DataFrame containing all departures and arrivals of all
+        trains in the given runs with the id of their run."""
+
+        return self._get_of_runs_per_train(
+            run_ids,
+            self._get_departures_arrivals_all_trains_per_train,
+            DEPARTURES_ARRIVALS_COLUMNS + ["run_id"],
+            "departure_tick",
+        )
+
+    def _get_edge_times_of_runs_per_train(self, run_ids: list[UUID]) -> pd.DataFrame:
+        """Returns a DataFrame containing all block section times of all
+        trains in the given runs by pairing them run by run and train by train.
+        :param run_ids: The ids of the runs.
+        :return: A DataFrame containing all block section times of all
+        trains in the given runs with the id of their run."""
+
+        return self._get_of_runs_per_train(
+            run_ids,
+            self._get_edge_times_all_trains_per_train,
+            EDGE_TIMES_COLUMNS + ["run_id"],
+            "leave_tick",
+        )
+
     def _get_trains_edge(self, run_id: UUID) -> list[str]:
         """Returns a list of all trains that have entered or left a block
         section in the given run.
@@ -227,6 +580,40 @@ class LogCollector:
         train_ids = train_ids.union({t.train_id for t in trains_leave})
         return list(train_ids)
 
+    def _get_edge_enters_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        """Returns a DataFrame containing all edge entries of the given train in
+        the given run.
+        :param run_id: The id of the run.
+        :param train_id: The id of the train.
+        :return: A DataFrame containing the tick, edge_id and edge_length of all
+        edge entries of the given train in the given run."""
+
+        enters = TrainEnterEdgeLogEntry.select(
+            TrainEnterEdgeLogEntry.tick,
+            TrainEnterEdgeLogEntry.edge_id,
+            TrainEnterEdgeLogEntry.edge_length,
+        ).where(
+            (TrainEnterEdgeLogEntry.run_id == run_id)
+            & (TrainEnterEdgeLogEntry.train_id == train_id)
+        )
+        return self._read_query(enters, ["tick", "edge_id", "edge_length"])
+
+    def _get_edge_leaves_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        """Returns a DataFrame containing all edge exits of the given train in
+        the given run.
+        :param run_id: The id of the run.
+        :param train_id: The id of the train.
+        :return: A DataFrame containing the tick and edge_id of all edge exits of
+        the given train in the given run."""
+
+        leaves = TrainLeaveEdgeLogEntry.select(
+            TrainLeaveEdgeLogEntry.tick, TrainLeaveEdgeLogEntry.edge_id
+        ).where(
+            (TrainLeaveEdgeLogEntry.run_id == run_id)
+            & (TrainLeaveEdgeLogEntry.train_id == train_id)
+        )
+        return self._read_query(leaves, ["tick", "edge_id"])
+
     def get_edge_times_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
         """Returns a DataFrame containing all block section times of the
         given train in the given run.
@@ -235,30 +622,8 @@ class LogCollector:
         :return: A DataFrame containing all block section times of the
         given train in the given run."""
 
-        # pylint will not recognize that peewee results are iterable
-        # pylint: disable=not-an-iterable
-        train_enter_df = pd.DataFrame(
-            [
-                [e.tick, e.edge_id, e.edge_length]
-                for e in TrainEnterEdgeLogEntry.select().where(
-                    (TrainEnterEdgeLogEntry.run_id == run_id)
-                    & (TrainEnterEdgeLogEntry.train_id == train_id)
-                )
-            ],
-            columns=["tick", "edge_id", "edge_length"],
-        )
-        # pylint will not recognize that peewee results are iterable
-        # pylint: disable=not-an-iterable
-        train_leave_df = pd.DataFrame(
-            [
-                [e.tick, e.edge_id]
-                for e in TrainLeaveEdgeLogEntry.select().where(
-                    (TrainLeaveEdgeLogEntry.run_id == run_id)
-                    & (TrainLeaveEdgeLogEntry.train_id == train_id)
-                )
-            ],
-            columns=["tick", "edge_id"],
-        )
+        train_enter_df = self._get_edge_enters_of_train(run_id, train_id)
+        train_leave_df = self._get_edge_leaves_of_train(run_id, train_id)
         train_enter_df = train_enter_df.sort_values("tick")
         train_leave_df = train_leave_df.sort_values("tick")
 
@@ -295,9 +660,9 @@ class LogCollector:
         )
         return edge_times_df
 
-    def get_edge_times_all_trains(self, run_id: UUID) -> pd.DataFrame:
+    def _get_edge_times_all_trains_per_train(self, run_id: UUID) -> pd.DataFrame:
         """Returns a DataFrame containing all block section times of all
-        trains in the given run.
+        trains in the given run by pairing them train by train.
         :param run_id: The id of the run.
         :return: A DataFrame containing all block section times of all
         trains in the given run."""
@@ -307,26 +672,91 @@ class LogCollector:
             edge_times_df = self.get_edge_times_of_train(run_id, train_id)
             edge_times_df["train_id"] = train_id
             df_list += [edge_times_df]
+        if len(df_list) == 0:
+            return pd.DataFrame(columns=EDGE_TIMES_COLUMNS)
         edge_times_df = pd.concat(df_list, axis=0)
         edge_times_df.sort_values(["train_id", "leave_tick"], inplace=True)
         edge_times_df = edge_times_df.reset_index(drop=True)
         return edge_times_df
 
+    @cached_by_run
+    def get_edge_times_all_trains(self, run_id: UUID) -> pd.DataFrame:
+        """Returns a DataFrame containing all block section times of all
+        trains in the given run.
+        :param run_id: The id of the run.
+        :return: A DataFrame containing all block section times of all
+        trains in the given run."""
+
+        edge_times_df = self.get_edge_times_of_runs([run_id])
+        del edge_times_df["run_id"]
+        return edge_times_df
+
+    def get_edge_times_of_runs(self, run_ids: list[UUID]) -> pd.DataFrame:
+        """Returns a DataFrame containing all block section times of all
+        trains in the given runs. The k-th edge entry of a train is paired with
+        its k-th edge exit within a single query. An exit before the first entry
+        gets no entry tick and an entry at or after the last exit gets no exit tick.
+        :param run_ids: The ids of the runs.
+        :return: A DataFrame containing all block section times of all
+        trains in the given runs with the id of their run."""
+
+        edge_times_df = concat_chunks(
+            self._iter_paired_edge_times(run_ids), EDGE_TIMES_COLUMNS + ["run_id"]
+        )
+        edge_times_df.sort_values(["run_id", "train_id", "leave_tick"], inplace=True)
+        edge_times_df = edge_times_df.reset_index(drop=True)
+        return edge_times_df
+
+    def iter_edge_times_of_runs(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Yields all block section times of all trains in the given runs in
+        chunks, ordered by run, train and edge exit. Paired like in
+        get_edge_times_of_runs, but at most chunk_size rows are held in memory
+        at once.
+        :param run_ids: The ids of the runs.
+        :param chunk_size: The maximum number of rows per chunk.
+        :return: An iterator of DataFrames containing block section times with
+        the id of their run."""
+
+        return self._iter_paired_edge_times(run_ids, chunk_size)
+
+    def _iter_paired_edge_times(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Pairs the edge entries and exits of all trains in the given runs in the
+        database and yields them in chunks.
+        :param run_ids: The ids of the runs.
+        :param chunk_size: The maximum number of rows per chunk.
+        :return: An iterator of DataFrames containing block section times with
+        the id of their run."""
+
+        return self._iter_paired_events(
+            run_ids,
+            TrainEnterEdgeLogEntry,
+            TrainLeaveEdgeLogEntry,
+            first_columns=["edge_id", "edge_length"],
+            second_columns=["edge_id"],
+            last_operator=">=",
+            select_columns={
+                "enter_tick": "first_events.tick",
+                "leave_tick": "second_events.tick",
+                "edge_id": "COALESCE(first_events.edge_id, second_events.edge_id)",
+                "edge_length": "first_events.edge_length",
+            },
+            chunk_size=chunk_size,
+        )
+
+    @cached_by_run
     def get_train_spawn_times(self, run_id: UUID) -> pd.DataFrame:
         """Returns a DataFrame containing all spawn events of trains in the given run.
         :param run_id: The id of the run.
         :return: A Dataframe containing all block section times of all trains in the given run.
         """
-        # pylint will not recognize that peewee results are iterable
-        # pylint: disable=not-an-iterable
-        spawn_entries = [
-            (entry.tick, entry.train_id)
-            for entry in TrainSpawnLogEntry.select().where(
-                TrainSpawnLogEntry.run_id == run_id
-            )
-        ]
-        spawn_df = pd.DataFrame(spawn_entries, columns=["tick", "train_id"])
-        return spawn_df
+        spawn_entries = TrainSpawnLogEntry.select(
+            TrainSpawnLogEntry.tick, TrainSpawnLogEntry.train_id
+        ).where(TrainSpawnLogEntry.run_id == run_id)
+        return self._read_query(spawn_entries, ["tick", "train_id"])
 
     def _parse_inject_log_entry(self, entry: InjectFaultLogEntry) -> tuple:
         """Parses a log entry of a fault injection.
@@ -387,6 +817,7 @@ class LogCollector:
 
         return tick, fault_type, fault_id
 
+    @cached_by_run
     def get_faults(self, run_id: UUID) -> pd.DataFrame:
         """Returns a DataFrame containing all faults in the given run.
         :param run_id: The id of the run.
@@ -1,15 +1,19 @@
 from datetime import datetime
+from uuid import UUID, uuid4
 
 from peewee import (
     BigIntegerField,
+    CompositeKey,
     DateTimeField,
     FloatField,
     ForeignKeyField,
     IntegerField,
+    PostgresqlDatabase,
     TextField,
+    UUIDField,
 )
 
-from src.base_model import BaseModel
+from src.base_model import BaseModel, db
 from src.fault_injector.fault_configurations.platform_blocked_fault_configuration import (
     PlatformBlockedFaultConfiguration,
 )
@@ -31,14 +35,89 @@ from src.fault_injector.fault_configurations.train_speed_fault_configuration imp
 from src.implementor.models import Run
 
 
+def _supports_partitioning(database) -> bool:
+    """Only PostgreSQL supports declarative partitioning, other databases (e.g. SQLite)
+    keep using plain tables.
+
+    :param database: The database the log entries are stored in
+    :return: Whether the log tables are partitioned by run
+    """
+    return isinstance(database, PostgresqlDatabase)
+
+
 class LogEntry(BaseModel):
-    """Represents a single log entry. Used to log messages from the simulation."""
+    """Represents a single log entry. Used to log messages from the simulation.
+    On PostgreSQL every log table is partitioned by `run_id`, so each run gets its own
+    partition (see `create_log_partitions` and `drop_log_partitions`)."""
+
+    class Meta:
+        """Partition the log tables by run. PostgreSQL requires the partition key to be
+        part of the primary key."""
 
+        primary_key = CompositeKey("id", "run_id")
+        table_settings = (
+            ["PARTITION BY LIST (run_id)"] if _supports_partitioning(db) else []
+        )
+
+    id = UUIDField(default=uuid4)
     timestamp = DateTimeField(null=False, default=datetime.now())
     tick = BigIntegerField(null=False)
     message = TextField(null=False)
     run_id = ForeignKeyField(Run, null=False)
 
+    @classmethod
+    def create_table(cls, safe=True, **options):
+        """Create the table and its default partition. The default partition holds
+        all entries of runs that have no dedicated partition.
+
+        :param safe: Don't raise an error if the table already exists, defaults to True
+        """
+        # pylint will not recognize the _meta peewee adds to every model
+        # pylint: disable=no-member
+        super().create_table(safe=safe, **options)
+        if _supports_partitioning(cls._meta.database):
+            cls._meta.database.execute_sql(
+                f'CREATE TABLE IF NOT EXISTS "{cls._meta.table_name}_default" '
+                f'PARTITION OF "{cls._meta.table_name}" DEFAULT'
+            )
+
+    @classmethod
+    def partition_name(cls, run_id: UUID) -> str:
+        """
+        :param run_id: The id of the run
+        :return: The name of the partition holding the entries of the run
+        """
+        # pylint: disable=no-member
+        return f"{cls._meta.table_name}_{UUID(str(run_id)).hex}"
+
+    @classmethod
+    def create_partition(cls, run_id: UUID):
+        """Create the partition of the given run.
+
+        :param run_id: The id of the run
+        """
+        # pylint: disable=no-member
+        if not _supports_partitioning(cls._meta.database):
+            return
+        cls._meta.database.execute_sql(
+            f'CREATE TABLE IF NOT EXISTS "{cls.partition_name(run_id)}" '
+            f'PARTITION OF "{cls._meta.table_name}" FOR VALUES IN (%s)',
+            (str(run_id),),
+        )
+
+    @classmethod
+    def drop_partition(cls, run_id: UUID):
+        """Drop the partition of the given run including all its entries.
+
+        :param run_id: The id of the run
+        """
+        # pylint: disable=no-member
+        if not _supports_partitioning(cls._meta.database):
+            return
+        cls._meta.database.execute_sql(
+            f'DROP TABLE IF EXISTS "{cls.partition_name(run_id)}"'
+        )
+
 
 class TrainSpawnLogEntry(LogEntry):
     """A LogEntry that represents the spawning of a train."""
@@ -148,3 +227,40 @@ class ResolveFaultLogEntry(LogEntry):
     train_speed_fault_configuration = ForeignKeyField(
         TrainSpeedFaultConfiguration, null=True
     )
+
+
+LOG_ENTRY_MODELS = [
+    LogEntry,
+    TrainSpawnLogEntry,
+    TrainRemoveLogEntry,
+    TrainArrivalLogEntry,
+    TrainDepartureLogEntry,
+    CreateFahrstrasseLogEntry,
+    RemoveFahrstrasseLogEntry,
+    SetSignalLogEntry,
+    TrainEnterEdgeLogEntry,
+    TrainLeaveEdgeLogEntry,
+    InjectFaultLogEntry,
+    ResolveFaultLogEntry,
+]
+
+
+def create_log_partitions(run_id: UUID):
+    """Create the partitions of all log tables for a new run.
+
+    :param run_id: The id of the run
+    """
+    with db.atomic():
+        for model in LOG_ENTRY_MODELS:
+            model.create_partition(run_id)
+
+
+def drop_log_partitions(run_id: UUID):
+    """Drop the partitions of all log tables of a run. This removes the logs of the
+    run without scanning the log tables.
+
+    :param run_id: The id of the run
+    """
+    with db.atomic():
+        for model in LOG_ENTRY_MODELS:
+            model.drop_partition(run_id)
@@ -0,0 +1,93 @@
+"""
+This module reads query results in fixed-size chunks. On PostgreSQL the rows are
+fetched with a server-side cursor, so neither the database driver nor the caller has to
+hold the complete result in memory. Callers that concatenate the chunks with
+concat_chunks hold the complete result anyway.
+"""
+from typing import Iterator, Optional
+from uuid import uuid4
+
+import pandas as pd
+from peewee import Database, PostgresqlDatabase
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def iter_sql_chunks(
+    database: Database,
+    sql: str,
+    params: list,
+    columns: list[str],
+    dtypes: Optional[dict[str, str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Executes a query and yields its rows in DataFrames of at most chunk_size rows.
+
+    :param database: The database to execute the query on
+    :param sql: The SQL of the query
+    :param params: The parameters of the query
+    :param columns: The names of the selected columns
+    :param dtypes: The types of the columns, defaults to the inferred types
+    :param chunk_size: The maximum number of rows per DataFrame
+    :return: An iterator of DataFrames
+    """
+    if isinstance(database, PostgresqlDatabase):
+        # A named cursor is a server-side cursor. It is declared WITH HOLD because
+        # peewee runs psycopg2 in autocommit mode, so it doesn't need a surrounding
+        # transaction that would stay open while the caller consumes the chunks.
+        cursor = database.connection().cursor(
+            name=f"log_stream_{uuid4().hex}", withhold=True
+        )
+        cursor.itersize = chunk_size
+    else:
+        cursor = database.cursor()
+    # the cursor is also closed when the caller stops iterating early
+    try:
+        cursor.execute(sql, params)
+        while rows := cursor.fetchmany(chunk_size):
+            chunk = pd.DataFrame(rows, columns=columns)
+            yield chunk if dtypes is None else chunk.astype(dtypes)
+    finally:
+        cursor.close()
+
+
+def iter_query_chunks(
+    query,
+    columns: list[str],
+    dtypes: Optional[dict[str, str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """Yields the rows of a peewee query in DataFrames of at most chunk_size rows.
+
+    :param query: The peewee select query, its selected columns must match columns
+    :param columns: The names of the selected columns
+    :param dtypes: The types of the columns, defaults to the inferred types
+    :param chunk_size: The maximum number of rows per DataFrame
+    :return: An iterator of DataFrames
+    """
+    sql, params = query.sql()
+    # pylint: disable=protected-access
+    return iter_sql_chunks(
+        query.model._meta.database, sql, params, columns, dtypes, chunk_size
+    )
+
+
+def concat_chunks(
+    chunks: Iterator[pd.DataFrame],
+    columns: list[str],
+    dtypes: Optional[dict[str, str]] = None,
+) -> pd.DataFrame:
+    """Concatenates chunks into one DataFrame.
+
+    :param chunks: The chunks
+    :param columns: The names of the columns, used if there are no chunks
+    :param dtypes: The types of the columns, defaults to the inferred types
+    :return: The DataFrame of all chunks
+    """
+    chunk_list = list(chunks)
+    if len(chunk_list) == 0:
+        empty_df = pd.DataFrame(columns=columns)
+        return empty_df if dtypes is None else empty_df.astype(dtypes)
+    if len(chunk_list) == 1:
+        return chunk_list[0]
+    return pd.concat(chunk_list, axis=0, ignore_index=True)
@@ -8,6 +8,8 @@ from uuid import UUID
 from src.component import Component
 from src.event_bus.event import Event, EventType
 from src.event_bus.event_bus import EventBus
+from src.implementor.models import Run
+from src.logger.compact_log import CompactLogWriter
 from src.logger.log_entry import (
     CreateFahrstrasseLogEntry,
     InjectFaultLogEntry,
@@ -21,6 +23,7 @@ from src.logger.log_entry import (
     TrainRemoveLogEntry,
     TrainSpawnLogEntry,
 )
+from src.logger.run_dimension import RunDimensionWriter, RunStation, RunTrain
 
 
 # pylint: disable=too-many-public-methods
@@ -30,6 +33,7 @@ class Logger(Component):
     """
 
     callback_handles: list[UUID]
+    dimension_writer: RunDimensionWriter
 
     def __init__(self, event_bus: EventBus):
         """
@@ -37,6 +41,7 @@ class Logger(Component):
         """
         super().__init__(event_bus, "LOW")
 
+        self.dimension_writer = RunDimensionWriter(self.event_bus.run_id)
         self.callback_handles = []
         self.callback_handles.append(
             self.event_bus.register_callback(self.spawn_train, EventType.TRAIN_SPAWN)
@@ -137,6 +142,19 @@ class Logger(Component):
                 self.resolve_train_speed_fault, EventType.RESOLVE_FAULT
             )
         )
+        for event_type in [EventType.TRAIN_ARRIVAL, EventType.TRAIN_DEPARTURE]:
+            self.callback_handles.append(
+                self.event_bus.register_callback(self.record_station, event_type)
+            )
+        for event_type in [
+            EventType.TRAIN_ARRIVAL,
+            EventType.TRAIN_DEPARTURE,
+            EventType.TRAIN_ENTER_EDGE,
+            EventType.TRAIN_LEAVE_EDGE,
+        ]:
+            self.callback_handles.append(
+                self.event_bus.register_callback(self.record_train, event_type)
+            )
 
     def __del__(self):
         for handle in self.callback_handles:
@@ -145,6 +163,30 @@ class Logger(Component):
     def next_tick(self, tick: int):
         pass
 
+    def finish(self):
+        """
+        Marks the run as finished, so results computed from its logs may be cached.
+        """
+        Run.update(finished_at=datetime.now()).where(
+            Run.id == self.event_bus.run_id
+        ).execute()
+
+    def record_train(self, event: Event) -> Type[None]:
+        """
+        This function adds the train of an arrival, departure, edge enter or edge leave to the
+        trains of the run, unless it is already recorded.
+        :param event: the event containing all relevant info
+        """
+        self.dimension_writer.record(RunTrain, event.arguments["train_id"])
+
+    def record_station(self, event: Event) -> Type[None]:
+        """
+        This function adds the station of an arrival or departure to the stations of the run,
+        unless it is already recorded.
+        :param event: the event containing all relevant info
+        """
+        self.dimension_writer.record(RunStation, event.arguments["station_id"])
+
     def spawn_train(self, event: Event) -> Type[None]:
         """
         This function should be called when a train is being spawned. This should include a train
@@ -539,3 +581,89 @@ class Logger(Component):
                 "train_speed_fault_configuration"
             ],
         )
+
+
+class CompactLogger(Logger):
+    """
+    A logger that stores train, edge, station, signal and fahrstrasse events in the compact
+    log table. Faults are still logged into their regular tables.
+    """
+
+    writer: CompactLogWriter
+
+    def __init__(self, event_bus: EventBus):
+        """
+        The constructor of the compact logger class
+        """
+        super().__init__(event_bus)
+        self.writer = CompactLogWriter(self.event_bus.run_id)
+
+    def spawn_train(self, event: Event) -> Type[None]:
+        self.writer.write(
+            EventType.TRAIN_SPAWN,
+            event.arguments["tick"],
+            train=event.arguments["train_id"],
+        )
+
+    def remove_train(self, event: Event) -> Type[None]:
+        self.writer.write(
+            EventType.TRAIN_REMOVE,
+            event.arguments["tick"],
+            train=event.arguments["train_id"],
+        )
+
+    def arrival_train(self, event: Event) -> Type[None]:
+        self.writer.write(
+            EventType.TRAIN_ARRIVAL,
+            event.arguments["tick"],
+            train=event.arguments["train_id"],
+            station=event.arguments["station_id"],
+        )
+
+    def departure_train(self, event: Event) -> Type[None]:
+        self.writer.write(
+            EventType.TRAIN_DEPARTURE,
+            event.arguments["tick"],
+            train=event.arguments["train_id"],
+            station=event.arguments["station_id"],
+        )
+
+    def create_fahrstrasse(self, event: Event) -> Type[None]:
+        self.writer.write(
+            EventType.CREATE_FAHRSTRASSE,
+            event.arguments["tick"],
+            fahrstrasse=event.arguments["fahrstrasse"],
+        )
+
+    def remove_fahrstrasse(self, event: Event) -> Type[None]:
+        self.writer.write(
+            EventType.REMOVE_FAHRSTRASSE,
+            event.arguments["tick"],
+            fahrstrasse=event.arguments["fahrstrasse"],
+        )
+
+    def set_signal(self, event: Event) -> Type[None]:
+        self.writer.write(
+            EventType.SET_SIGNAL,
+            event.arguments["tick"],
+            signal=event.arguments["signal_id"],
+            state_before=event.arguments["state_before"],
+            state_after=event.arguments["state_after"],
+        )
+
+    def train_enter_edge(self, event: Event) -> Type[None]:
+        self.writer.write(
+            EventType.TRAIN_ENTER_EDGE,
+            event.arguments["tick"],
+            train=event.arguments["train_id"],
+            edge=event.arguments["edge_id"],
+            edge_length=event.arguments["edge_length"],
+        )
+
+    def train_leave_edge(self, event: Event) -> Type[None]:
+        self.writer.write(
+            EventType.TRAIN_LEAVE_EDGE,
+            event.arguments["tick"],
+            train=event.arguments["train_id"],
+            edge=event.arguments["edge_id"],
+        )
@@ -0,0 +1,450 @@
+"""
+This module contains the cache of results computed from the logs of a run. The logs of a
+finished run never change, so its results are cached until the run is deleted. Results of
+runs that are still in progress are never cached. The finish time of a run is recorded by
+its logger, so runs logged before it was recorded are only cached once
+scripts/backfill_run_finished_at.py marked them as finished. Results of a
+simulation configuration are cached once all of its runs have finished, and removed when
+a run is added to or deleted from the configuration.
+
+The cache has an in-process LRU tier that is bounded by the memory usage of the cached
+DataFrames and an optional Parquet tier on disk, that is enabled by setting
+RESULT_CACHE_PATH.
+"""
+import functools
+import hashlib
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+from uuid import UUID, uuid4
+
+import pandas as pd
+from pyarrow import ArrowException
+
+from src.data_science.single_flight import single_flight
+from src.implementor.models import Run
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Results of multiple simulation configurations are stored under this name instead of
+# the id of a run or configuration
+MULTI_CONFIG = "multi_config"
+
+
+def result_cache_directory() -> Optional[str]:
+    """Returns the directory of the disk tier of the result cache.
+
+    :return: The directory or None if the disk tier is disabled
+    """
+    return os.getenv("RESULT_CACHE_PATH")
+
+
+def result_cache_max_bytes() -> int:
+    """Returns the maximum memory usage of the in-process tier of the result cache.
+
+    :return: The maximum number of bytes
+    """
+    return int(os.getenv("RESULT_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
+
+
+def run_finished(run_id: UUID) -> bool:
+    """Checks whether a run has finished, so its logs won't change anymore.
+
+    :param run_id: The id of the run
+    :return: True if the run exists and has finished
+    """
+    run = Run.select(Run.finished_at).where(Run.id == run_id).first()
+    return run is not None and run.finished_at is not None
+
+
+def config_run_markers(config_id: UUID) -> Optional[tuple]:
+    """Returns the ids and finish times of the runs of a simulation configuration, which
+    identify the logs results of the configuration are computed from.
+
+    :param config_id: The id of the simulation configuration
+    :return: The markers of the runs or None if a run is still in progress
+    """
+    runs = list(
+        Run.select(Run.id, Run.finished_at)
+        .where(Run.simulation_configuration == config_id)
+        .order_by(Run.id)
+    )
+    if any(run.finished_at is None for run in runs):
+        return None
+    return tuple((str(run.id), str(run.finished_at)) for run in runs)
+
+
+class CacheStatistics:
+    """The number of hits of both tiers, misses and evictions of a result cache."""
+
+    hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self):
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def to_dict(self) -> dict[str, int]:
+        """Returns the statistics as a dictionary.
+
+        :return: The statistics
+        """
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class ResultCache:
+    """Caches DataFrames by the function that computed them, the run and the
+    parameters of the function."""
+
+    max_bytes: int
+    directory: Optional[str]
+    _statistics: CacheStatistics
+    _entries: OrderedDict
+    _size: int
+    _lock: threading.Lock
+
+    def __init__(self, max_bytes: int, directory: Optional[str] = None):
+        """
+        :param max_bytes: The maximum memory usage of the in-process tier
+        :param directory: The directory of the disk tier, defaults to no disk tier
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._statistics = CacheStatistics()
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key: tuple) -> str:
+        """Returns the path of an entry in the disk tier.
+
+        :param key: The key of the entry
+        :return: The path of the Parquet file
+        """
+        function_name, run_id, params = key
+        digest = hashlib.sha1(repr(params).encode()).hexdigest()
+        return os.path.join(
+            self.directory, str(run_id), f"{function_name}-{digest}.parquet"
+        )
+
+    def _read_disk(self, key: tuple) -> Optional[pd.DataFrame]:
+        """Reads an entry from the disk tier.
+
+        :param key: The key of the entry
+        :return: The DataFrame or None if it is not on disk
+        """
+        if self.directory is None:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except (ArrowException, OSError):
+            return None
+
+    def _write_disk(self, key: tuple, value: pd.DataFrame):
+        """Writes an entry to the disk tier. DataFrames that can not be stored as
+        Parquet are only kept in memory.
+
+        :param key: The key of the entry
+        :param value: The DataFrame
+        """
+        if self.directory is None:
+            return
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{uuid4().hex}"
+        try:
+            value.to_parquet(temporary_path)
+            os.replace(temporary_path, path)
+        except (ArrowException, TypeError, ValueError, OSError):
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def _put_memory(self, key: tuple, value: pd.DataFrame):
+        """Adds an entry to the in-process tier and evicts the least recently used
+        entries until the tier fits into max_bytes.
+
+        :param key: The key of the entry
+        :param value: The DataFrame
+        """
+        size = int(value.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._statistics.evictions += 1
+
+    def get(self, key: tuple) -> Optional[pd.DataFrame]:
+        """Returns a copy of a cached DataFrame.
+
+        :param key: The key of the entry
+        :return: The DataFrame or None if it is not cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._statistics.hits += 1
+                return entry[0].copy()
+        value = self._read_disk(key)
+        if value is None:
+            with self._lock:
+                self._statistics.misses += 1
+            return None
+        with self._lock:
+            self._statistics.disk_hits += 1
+        self._put_memory(key, value)
+        return value.copy()
+
+    def put(self, key: tuple, value: pd.DataFrame):
+        """Caches a copy of a DataFrame.
+
+        :param key: The key of the entry
+        :param value: The DataFrame
+        """
+        value = value.copy()
+        self._put_memory(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(
+        self,
+        function_name: str,
+        run_id: UUID,
+        params: tuple,
+        compute: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Returns the cached result of a function or computes it. Results are only
+        cached if the run has finished. Concurrent computations of the same result are
+        coalesced.
+
+        :param function_name: The name of the function
+        :param run_id: The id of the run
+        :param params: The other parameters of the function
+        :param compute: Computes the result
+        :return: The result
+        """
+        key = (function_name, str(run_id), params)
+        if not run_finished(run_id):
+            return single_flight.do(
+                ("in_progress", *key), compute, f"{function_name}:{run_id}"
+            )
+        return self._get_or_compute_cached(key, compute, f"{function_name}:{run_id}")
+
+    def get_or_compute_by_config(
+        self,
+        function_name: str,
+        config_id: UUID,
+        params: tuple,
+        compute: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Returns the cached result of a function of a simulation configuration or
+        computes it. Results are only cached if all runs of the configuration have
+        finished and are cached by the runs, so they are recomputed when a run is added
+        or deleted.
+
+        :param function_name: The name of the function
+        :param config_id: The id of the simulation configuration
+        :param params: The other parameters of the function
+        :param compute: Computes the result
+        :return: The result
+        """
+        label = f"{function_name}:{config_id}"
+        markers = config_run_markers(config_id)
+        if markers is None:
+            return single_flight.do(
+                ("in_progress", function_name, str(config_id), params), compute, label
+            )
+        return self._get_or_compute_cached(
+            (function_name, str(config_id), (params, markers)), compute, label
+        )
+
+    def get_or_compute_by_multi_config(
+        self,
+        function_name: str,
+        config_ids: list[UUID],
+        params: tuple,
+        compute: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Returns the cached result of a function of multiple simulation configurations
+        or computes it. Results are cached by the sorted ids of the configurations like
+        results of a single configuration.
+
+        :param function_name: The name of the function
+        :param config_ids: The ids of the simulation configurations
+        :param params: The other parameters of the function
+        :param compute: Computes the result
+        :return: The result
+        """
+        config_ids = tuple(sorted({str(config_id) for config_id in config_ids}))
+        label = f"{function_name}:{','.join(config_ids)}"
+        markers = tuple(config_run_markers(config_id) for config_id in config_ids)
+        if any(config_markers is None for config_markers in markers):
+            return single_flight.do(
+                ("in_progress", function_name, config_ids, params), compute, label
+            )
+        return self._get_or_compute_cached(
+            (function_name, MULTI_CONFIG, (config_ids, params, markers)),
+            compute,
+            label,
+        )
+
+    def _get_or_compute_cached(
+        self, key: tuple, compute: Callable[[], pd.DataFrame], label: str
+    ) -> pd.DataFrame:
+        """Returns a cached result or computes and caches it. Concurrent computations
+        of the same result are coalesced.
+
+        :param key: The key of the entry
+        :param compute: Computes the result
+        :param label: The label the coalesced computations are reported by
+        :return: The result
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        return single_flight.do(key, lambda: self._compute_and_put(key, compute), label)
+
+    def _compute_and_put(
+        self, key: tuple, compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """Computes a result and caches it if it is a DataFrame.
+
+        :param key: The key of the entry
+        :param compute: Computes the result
+        :return: The result
+        """
+        value = compute()
+        if isinstance(value, pd.DataFrame):
+            self.put(key, value)
+        return value
+
+    def _remove(self, names: list[str]):
+        """Removes all entries stored under the given run or configuration ids from both
+        tiers.
+
+        :param names: The ids of runs or configurations, or MULTI_CONFIG
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[1] in names]:
+                self._size -= self._entries.pop(key)[1]
+        if self.directory is not None:
+            for name in names:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def invalidate_run(self, run_id: UUID):
+        """Removes all entries of a run from both tiers.
+
+        :param run_id: The id of the run
+        """
+        self._remove([str(run_id)])
+
+    def invalidate_config(self, config_id: UUID):
+        """Removes all entries of a simulation configuration and of multiple
+        configurations from both tiers. Their keys contain the runs they were computed
+        from, so this only frees the entries that can't be hit anymore after a run was
+        added or deleted.
+
+        :param config_id: The id of the simulation configuration
+        """
+        self._remove([str(config_id), MULTI_CONFIG])
+
+    def clear(self):
+        """Removes all entries from the in-process tier and resets the stats."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._statistics = CacheStatistics()
+
+    def stats(self) -> dict[str, int]:
+        """Returns the hit and miss counts and the size of the in-process tier.
+
+        :return: The stats of the cache
+        """
+        with self._lock:
+            return {
+                **self._statistics.to_dict(),
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+result_cache = ResultCache(result_cache_max_bytes(), result_cache_directory())
+
+
+def cached_by_run(method):
+    """Caches the DataFrames returned by a method, whose first parameter after self is
+    the id of a run, in the result cache.
+
+    :param method: The method
+    :return: The cached method
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, run_id: UUID, *args, **kwargs):
+        return result_cache.get_or_compute(
+            method.__qualname__,
+            run_id,
+            (args, tuple(sorted(kwargs.items()))),
+            lambda: method(self, run_id, *args, **kwargs),
+        )
+
+    return wrapper
+
+
+def cached_by_config(method):
+    """Caches the DataFrames returned by a method, whose first parameter after self is
+    the id of a simulation configuration, in the result cache.
+
+    :param method: The method
+    :return: The cached method
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, config_id: UUID, *args, **kwargs):
+        return result_cache.get_or_compute_by_config(
+            method.__qualname__,
+            config_id,
+            (args, tuple(sorted(kwargs.items()))),
+            lambda: method(self, config_id, *args, **kwargs),
+        )
+
+    return wrapper
+
+
+def cached_by_multi_config(method):
+    """Caches the DataFrames returned by a method, whose first parameter after self is
+    a list of ids of simulation configurations, in the result cache.
+
+    :param method: The method
+    :return: The cached method
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, config_ids: list[UUID], *args, **kwargs):
+        return result_cache.get_or_compute_by_multi_config(
+            method.__qualname__,
+            config_ids,
+            (args, tuple(sorted(kwargs.items()))),
+            lambda: method(self, config_ids, *args, **kwargs),
+        )
+
+    return wrapper
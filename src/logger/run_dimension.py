@@ -0,0 +1,136 @@
+"""
+This module contains the dimension tables of the logs. They hold the distinct trains
+and stations of every run, so lookups of all trains or stations don't have to scan the
+log tables.
+"""
+from typing import Optional, Type
+from uuid import UUID
+
+from peewee import ForeignKeyField, Model, TextField
+
+from src.base_model import db
+from src.implementor.models import Run
+from src.logger.log_entry import (
+    TrainArrivalLogEntry,
+    TrainDepartureLogEntry,
+    TrainEnterEdgeLogEntry,
+    TrainLeaveEdgeLogEntry,
+)
+
+
+class DimensionModel(Model):
+    """Base class of the dimension tables. They don't inherit from BaseModel because
+    a row only consists of its run and its identifier."""
+
+    class Meta:
+        """Set Database"""
+
+        database = db
+
+    run_id = ForeignKeyField(Run, null=False, on_delete="CASCADE")
+    name = TextField(null=False)
+
+    @classmethod
+    def names(
+        cls, run_id: Optional[UUID] = None, config_id: Optional[UUID] = None
+    ) -> list[str]:
+        """Returns the distinct identifiers, optionally scoped to a run or a
+        simulation configuration.
+
+        :param run_id: The id of the run, defaults to all runs
+        :param config_id: The id of the simulation configuration, defaults to all
+            simulation configurations
+        :return: The list of identifiers
+        """
+        query = cls.select(cls.name).distinct()
+        if run_id is not None:
+            query = query.where(cls.run_id == run_id)
+        if config_id is not None:
+            query = query.join(Run).where(Run.simulation_configuration == config_id)
+        # pylint will not recognize that peewee results are iterable
+        # pylint: disable=not-an-iterable
+        return [entry.name for entry in query]
+
+
+class RunTrain(DimensionModel):
+    """The trains that arrived, departed, entered or left an edge in a run."""
+
+    class Meta:
+        """Set table name and indexes"""
+
+        table_name = "run_train"
+        indexes = (
+            (("run_id", "name"), True),
+            (("name",), False),
+        )
+
+
+class RunStation(DimensionModel):
+    """The stations a train arrived at or departed from in a run."""
+
+    class Meta:
+        """Set table name and indexes"""
+
+        table_name = "run_station"
+        indexes = (
+            (("run_id", "name"), True),
+            (("name",), False),
+        )
+
+
+DIMENSION_SOURCES: dict[Type[DimensionModel], list[tuple[Type[Model], str]]] = {
+    RunTrain: [
+        (TrainArrivalLogEntry, "train_id"),
+        (TrainDepartureLogEntry, "train_id"),
+        (TrainEnterEdgeLogEntry, "train_id"),
+        (TrainLeaveEdgeLogEntry, "train_id"),
+    ],
+    RunStation: [
+        (TrainArrivalLogEntry, "station_id"),
+        (TrainDepartureLogEntry, "station_id"),
+    ],
+}
+
+
+class RunDimensionWriter:
+    """Adds the identifiers of a run to the dimension tables. Every identifier is
+    only inserted once per run."""
+
+    run_id: UUID
+    _recorded: dict[Type[DimensionModel], set[str]]
+
+    def __init__(self, run_id: UUID):
+        """
+        :param run_id: The id of the run
+        """
+        self.run_id = run_id
+        self._recorded = {}
+
+    def record(self, dimension: Type[DimensionModel], name: str):
+        """Adds an identifier to a dimension table if it is not recorded yet.
+
+        :param dimension: The dimension table
+        :param name: The identifier
+        """
+        recorded = self._recorded.setdefault(dimension, set())
+        if name in recorded:
+            return
+        dimension.insert(run_id=self.run_id, name=name).on_conflict_ignore().execute()
+        recorded.add(name)
+
+
+def backfill_run_dimensions(run_id: Optional[UUID] = None):
+    """Fills the dimension tables from the log tables, e.g. for runs that were logged
+    before the dimension tables existed.
+
+    :param run_id: The id of the run, defaults to all runs
+    """
+    with db.atomic():
+        for dimension, sources in DIMENSION_SOURCES.items():
+            for model, column in sources:
+                query = model.select(model.run_id, getattr(model, column)).distinct()
+                if run_id is not None:
+                    query = query.where(model.run_id == run_id)
+                dimension.insert_from(
+                    query, [dimension.run_id, dimension.name]
+                ).on_conflict_ignore().execute()
@@ -0,0 +1,142 @@
+from typing import Iterator, Optional
+from uuid import UUID
+
+import pandas as pd
+
+from src.implementor.models import Run
+from src.logger.archive_log_collector import ArchiveLogCollector
+from src.logger.compact_log_collector import CompactLogCollector
+from src.logger.log_collector import (
+    DEPARTURES_ARRIVALS_COLUMNS,
+    DEPARTURES_ARRIVALS_DTYPES,
+    EDGE_TIMES_COLUMNS,
+    LogCollector,
+)
+from src.logger.log_stream import DEFAULT_CHUNK_SIZE, concat_chunks
+
+
+class RunLogCollector(LogCollector):
+    """The RunLogCollector reads the logs of every run with the collector of the layout
+    the run was logged in. Runs logged with COMPACT_LOGGING are read from the compact
+    log table, archived runs from their Parquet archive and all other runs from the
+    log tables. The layout is stored on the run, so runs stay readable when the
+    configuration changes."""
+
+    def __init__(self):
+        """Constructor of the RunLogCollector"""
+        self._database_collector = LogCollector()
+        self._archive_collector = ArchiveLogCollector()
+        self._compact_collector = CompactLogCollector()
+
+    def _group_by_collector(
+        self, run_ids: list[UUID]
+    ) -> list[tuple[LogCollector, list[UUID]]]:
+        """Groups runs by the collector of their log layout.
+        :param run_ids: The ids of the runs.
+        :return: The collectors with the ids of the runs they read, in the order of
+        the given runs within every group."""
+
+        # pylint will not recognize that peewee results are iterable
+        # pylint: disable=not-an-iterable
+        layouts = {
+            str(run.id): run
+            for run in Run.select(Run.id, Run.compact_log, Run.archive_path).where(
+                Run.id.in_(run_ids)
+            )
+        }
+        groups = {}
+        for run_id in run_ids:
+            run = layouts.get(str(run_id))
+            if run is not None and run.compact_log:
+                collector = self._compact_collector
+            elif run is not None and run.archive_path is not None:
+                collector = self._archive_collector
+            else:
+                collector = self._database_collector
+            groups.setdefault(collector, []).append(run_id)
+        return list(groups.items())
+
+    def _get_collector(self, run_id: UUID) -> LogCollector:
+        """Returns the collector of the log layout of a run.
+        :param run_id: The id of the run.
+        :return: The collector."""
+
+        return self._group_by_collector([run_id])[0][0]
+
+    def _get_of_runs(
+        self,
+        run_ids: list[UUID],
+        method_name: str,
+        columns: list[str],
+        dtypes: Optional[dict[str, str]],
+        sort_column: str,
+    ) -> pd.DataFrame:
+        """Collects a DataFrame of the given runs with the collectors of their layouts.
+        :param run_ids: The ids of the runs.
+        :param method_name: The name of the collector method returning the DataFrame
+        of runs.
+        :param columns: The columns of the result.
+        :param dtypes: The types of the columns.
+        :param sort_column: The column to sort by after the run_id and train_id.
+        :return: The DataFrame of all trains in the given runs."""
+
+        groups = self._group_by_collector(run_ids)
+        if len(groups) == 1:
+            collector, group_run_ids = groups[0]
+            return getattr(collector, method_name)(group_run_ids)
+        runs_df = concat_chunks(
+            [
+                run_df
+                for collector, group_run_ids in groups
+                if len(run_df := getattr(collector, method_name)(group_run_ids)) > 0
+            ],
+            columns,
+            dtypes,
+        )
+        runs_df.sort_values(["run_id", "train_id", sort_column], inplace=True)
+        return runs_df.reset_index(drop=True)
+
+    def get_departures_arrivals_of_train(
+        self, run_id: UUID, train_id: str
+    ) -> pd.DataFrame:
+        return self._get_collector(run_id).get_departures_arrivals_of_train(
+            run_id, train_id
+        )
+
+    def get_departures_arrivals_of_runs(self, run_ids: list[UUID]) -> pd.DataFrame:
+        return self._get_of_runs(
+            run_ids,
+            "get_departures_arrivals_of_runs",
+            DEPARTURES_ARRIVALS_COLUMNS + ["run_id"],
+            DEPARTURES_ARRIVALS_DTYPES,
+            "departure_tick",
+        )
+
+    def iter_departures_arrivals_of_runs(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        for collector, group_run_ids in self._group_by_collector(run_ids):
+            yield from collector.iter_departures_arrivals_of_runs(
+                group_run_ids, chunk_size
+            )
+
+    def get_edge_times_of_train(self, run_id: UUID, train_id: str) -> pd.DataFrame:
+        return self._get_collector(run_id).get_edge_times_of_train(run_id, train_id)
+
+    def get_edge_times_of_runs(self, run_ids: list[UUID]) -> pd.DataFrame:
+        return self._get_of_runs(
+            run_ids,
+            "get_edge_times_of_runs",
+            EDGE_TIMES_COLUMNS + ["run_id"],
+            None,
+            "leave_tick",
+        )
+
+    def iter_edge_times_of_runs(
+        self, run_ids: list[UUID], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        for collector, group_run_ids in self._group_by_collector(run_ids):
+            yield from collector.iter_edge_times_of_runs(group_run_ids, chunk_size)
+
+    def get_train_spawn_times(self, run_id: UUID) -> pd.DataFrame:
+        return self._get_collector(run_id).get_train_spawn_times(run_id)
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from typing import Iterator
 
 from src.schedule.schedule_configuration import ScheduleConfiguration
 from src.schedule.schedule_strategy import ScheduleStrategy
@@ -135,3 +136,16 @@ class DemandScheduleStrategy(ScheduleStrategy):
     def should_spawn(self, seconds: int) -> bool:
         """Returns whether a train should spawn at the given tick."""
         return super().should_spawn(seconds) and seconds in self.spawn_seconds
+
+    def spawn_calendar(self) -> Iterator[int]:
+        """Returns the seconds at which trains should spawn in ascending order
+
+        :return: The spawn seconds between the start and end time
+        """
+        return iter(
+            sorted(
+                seconds
+                for seconds in set(self.spawn_seconds)
+                if self._in_time_range(seconds)
+            )
+        )
@@ -1,4 +1,8 @@
+from itertools import count
 from random import Random
+from typing import Iterator, Optional
+
+import numpy as np
 
 from src.schedule.schedule_configuration import ScheduleConfiguration
 from src.schedule.schedule_strategy import ScheduleStrategy
@@ -22,10 +26,26 @@ class RandomScheduleStrategy(ScheduleStrategy):
             end_time=schedule_configuration.strategy_end_time,
             trains_per_1000_seconds=schedule_configuration.random_strategy_trains_per_1000_seconds,
             seed=schedule_configuration.random_strategy_seed,
+            arrival_process=schedule_configuration.random_strategy_arrival_process,
         )
 
+    # draws one random number per second, the seeds of existing schedules keep
+    # spawning at the same seconds
+    SEQUENTIAL: str = "sequential"
+    # samples whether a train spawns in every second in one step
+    BERNOULLI: str = "bernoulli"
+    # samples the exponentially distributed gaps between spawns
+    POISSON: str = "poisson"
+    ARRIVAL_PROCESSES: tuple[str, ...] = (SEQUENTIAL, BERNOULLI, POISSON)
+    # the seconds of schedules without an end time are sampled per day
+    SAMPLING_WINDOW: int = 86_400
+
     trains_per_1000_seconds: float
+    seed: Optional[int]
+    arrival_process: str
     _random_number_generator: Random
+    _sampled_calendar: Optional[Iterator[int]]
+    _next_sampled_second: Optional[int]
 
     def __init__(
         self,
@@ -33,6 +53,7 @@ class RandomScheduleStrategy(ScheduleStrategy):
         end_time: int,
         trains_per_1000_seconds: float,
         seed: int = None,
+        arrival_process: Optional[str] = None,
     ):
         """Constructs a RandomScheduleStrategy
 
@@ -41,19 +62,133 @@ class RandomScheduleStrategy(ScheduleStrategy):
         :param trains_per_1000_seconds: The probability that a train will spawn
         in a given amout of time
         :param seed: Seed for the random number generator, defaults to None
+        :param arrival_process: How the spawn seconds are drawn, one of
+            ARRIVAL_PROCESSES, defaults to sequential
+        :raises ValueError: when the arrival process is unknown
         """
         super().__init__(start_time, end_time)
+        if arrival_process is None:
+            arrival_process = self.SEQUENTIAL
+        if arrival_process not in self.ARRIVAL_PROCESSES:
+            raise ValueError(f"Unknown arrival process {arrival_process}")
         self.trains_per_1000_seconds = trains_per_1000_seconds
+        self.seed = seed
+        self.arrival_process = arrival_process
         self._random_number_generator = Random(seed)
+        self._sampled_calendar = None
+        self._next_sampled_second = None
 
     def should_spawn(self, seconds: int) -> bool:
-        """Determines whether a vehicle should be spawned at the current tick
+        """Determines whether a vehicle should be spawned at the current tick. The
+        sampled arrival processes expect the seconds in ascending order.
 
         :param seconds: The elapsed seconds
         :return: True if a vehicle should be spawned, False otherwise
         """
+        if self.arrival_process != self.SEQUENTIAL:
+            return self._is_sampled_second(seconds)
         return (
             super().should_spawn(seconds)
             and self._random_number_generator.random() * 1000
             < self.trains_per_1000_seconds
         )
+
+    def _is_sampled_second(self, seconds: int) -> bool:
+        """Advances the sampled spawn seconds past the given second.
+
+        :param seconds: The elapsed seconds
+        :return: True if the given second was sampled
+        """
+        if self._sampled_calendar is None:
+            self._sampled_calendar = self.spawn_calendar()
+            self._next_sampled_second = next(self._sampled_calendar, None)
+        is_sampled_second = False
+        while (
+            self._next_sampled_second is not None
+            and self._next_sampled_second <= seconds
+        ):
+            is_sampled_second = self._next_sampled_second == seconds
+            self._next_sampled_second = next(self._sampled_calendar, None)
+        return is_sampled_second
+
+    def spawn_calendar(self) -> Iterator[int]:
+        """Returns the seconds at which vehicles should be spawned in ascending order.
+        They are drawn from a generator of their own with the seed of the strategy, so
+        the same seed always results in the same seconds. With the sequential arrival
+        process they are the seconds should_spawn returns True for when it is asked
+        every second from the start time.
+
+        :return: The spawn seconds, drawn lazily
+        """
+        if self.trains_per_1000_seconds <= 0:
+            return iter(())
+        if self.arrival_process == self.BERNOULLI:
+            return self._bernoulli_arrivals()
+        if self.arrival_process == self.POISSON:
+            return self._poisson_arrivals()
+        return self._sequential_arrivals()
+
+    def _sequential_arrivals(self) -> Iterator[int]:
+        """Draws whether a vehicle spawns with one random number per second.
+
+        :return: The spawn seconds
+        """
+        random_number_generator = Random(self.seed)
+        for seconds in self._seconds_in_time_range():
+            if random_number_generator.random() * 1000 < self.trains_per_1000_seconds:
+                yield seconds
+
+    def _sampling_windows(self) -> Iterator[tuple[int, int]]:
+        """Returns the windows the spawn seconds are sampled in. A time range with an
+        end time is a single window.
+
+        :return: The first and last second of the windows
+        """
+        first_second = self.start_time if self.start_time else 0
+        if self.end_time:
+            if first_second <= self.end_time:
+                yield first_second, self.end_time
+            return
+        for window_start in count(first_second, self.SAMPLING_WINDOW):
+            yield window_start, window_start + self.SAMPLING_WINDOW - 1
+
+    def _bernoulli_arrivals(self) -> Iterator[int]:
+        """Samples whether a vehicle spawns in every second of a window at once, each
+        second with the probability trains_per_1000_seconds / 1000.
+
+        :return: The spawn seconds
+        """
+        random_number_generator = np.random.default_rng(self.seed)
+        for window_start, window_end in self._sampling_windows():
+            spawns = (
+                random_number_generator.random(window_end - window_start + 1) * 1000
+                < self.trains_per_1000_seconds
+            )
+            yield from (window_start + np.flatnonzero(spawns)).tolist()
+
+    def _poisson_arrivals(self) -> Iterator[int]:
+        """Samples the gaps between spawns of a window at once from an exponential
+        distribution with a mean of 1000 / trains_per_1000_seconds seconds. At most one
+        vehicle spawns per second, arrivals within the same second are merged.
+
+        :return: The spawn seconds
+        """
+        random_number_generator = np.random.default_rng(self.seed)
+        mean_gap = 1000 / self.trains_per_1000_seconds
+        for window_start, window_end in self._sampling_windows():
+            # the arrivals of a window don't depend on the arrivals before it, so
+            # every window starts without an arrival
+            arrival_time = float(window_start)
+            previous_second = None
+            expected_arrivals = (window_end + 1 - window_start) / mean_gap
+            batch_size = int(expected_arrivals + 4 * np.sqrt(expected_arrivals)) + 16
+            while arrival_time < window_end + 1:
+                arrival_times = arrival_time + np.cumsum(
+                    random_number_generator.exponential(mean_gap, batch_size)
+                )
+                arrival_time = float(arrival_times[-1])
+                seconds = np.unique(np.floor(arrival_times).astype(np.int64))
+                for second in seconds[seconds <= window_end].tolist():
+                    if second != previous_second:
+                        yield second
+                        previous_second = second
@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from src.schedule.schedule_configuration import ScheduleConfiguration
 from src.schedule.schedule_strategy import ScheduleStrategy
 
@@ -43,3 +45,10 @@ class RegularScheduleStrategy(ScheduleStrategy):
             super().should_spawn(seconds)
             and (seconds - self.start_time) % self.frequency == 0
         )
+
+    def spawn_calendar(self) -> Iterator[int]:
+        """Returns the seconds at which vehicles should be spawned in ascending order
+
+        :return: The spawn seconds, every frequency seconds from the start time
+        """
+        return iter(self._seconds_in_time_range(self.frequency))
@@ -1,5 +1,6 @@
+import os
 from abc import ABC, abstractmethod
-from typing import Protocol
+from typing import Iterator, Optional, Protocol
 
 from src.schedule.demand_schedule_strategy import DemandScheduleStrategy
 from src.schedule.random_schedule_strategy import RandomScheduleStrategy
@@ -8,6 +9,101 @@ from src.schedule.schedule_configuration import ScheduleConfiguration
 from src.schedule.schedule_strategy import ScheduleStrategy
 from src.wrapper.train_builder import TrainBuilder
 
+DEFAULT_SPAWN_RETRY_INITIAL_BACKOFF = 1
+DEFAULT_SPAWN_RETRY_MAX_BACKOFF = 60
+
+
+def spawn_retry_initial_backoff() -> int:
+    """Returns the number of seconds a failed spawn waits before it is retried,
+    configured by SPAWN_RETRY_INITIAL_BACKOFF.
+
+    :return: The backoff after the first failed attempt in seconds
+    """
+    return max(
+        1,
+        int(
+            os.getenv(
+                "SPAWN_RETRY_INITIAL_BACKOFF", str(DEFAULT_SPAWN_RETRY_INITIAL_BACKOFF)
+            )
+        ),
+    )
+
+
+def spawn_retry_max_backoff() -> int:
+    """Returns the maximum number of seconds a failed spawn waits before it is retried,
+    configured by SPAWN_RETRY_MAX_BACKOFF.
+
+    :return: The maximum backoff in seconds
+    """
+    return max(
+        1,
+        int(os.getenv("SPAWN_RETRY_MAX_BACKOFF", str(DEFAULT_SPAWN_RETRY_MAX_BACKOFF))),
+    )
+
+
+class SpawnCalendar:
+    """The seconds a schedule spawns vehicles at. They are drawn lazily from the spawn
+    calendar of its strategy."""
+
+    _seconds: Iterator[int]
+    next_second: Optional[int]
+
+    def __init__(self, seconds: Iterator[int]):
+        """
+        :param seconds: The spawn seconds in ascending order
+        """
+        self._seconds = seconds
+        self.next_second = next(self._seconds, None)
+
+    def advance(self, seconds: int) -> bool:
+        """Advances the calendar past the given second. Seconds of the calendar that
+        were not asked for are skipped.
+
+        :param seconds: The elapsed seconds
+        :return: True if a vehicle should be spawned at the given second
+        """
+        is_spawn_second = False
+        while self.next_second is not None and self.next_second <= seconds:
+            is_spawn_second = self.next_second == seconds
+            self.next_second = next(self._seconds, None)
+        return is_spawn_second
+
+
+class SpawnRetry:
+    """The retry of the spawns of a schedule that failed. The backoff between two
+    attempts doubles with every consecutive failed attempt."""
+
+    second: Optional[int]
+    consecutive_failures: int
+    failed_attempts: int
+
+    def __init__(self):
+        self.second = None
+        self.consecutive_failures = 0
+        self.failed_attempts = 0
+
+    def backoff(self) -> int:
+        """Returns the number of seconds until the next retry, which doubles with
+        every consecutive failed attempt up to SPAWN_RETRY_MAX_BACKOFF.
+
+        :return: The backoff in seconds
+        """
+        return min(
+            spawn_retry_initial_backoff() * 2 ** max(self.consecutive_failures - 1, 0),
+            spawn_retry_max_backoff(),
+        )
+
+    def add_attempt(self, spawned: bool):
+        """Counts an attempt to spawn a vehicle.
+
+        :param spawned: Whether the vehicle was spawned
+        """
+        if spawned:
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+            self.failed_attempts += 1
+
 
 class SpawnerProtocol(Protocol):
     """Protocol for the Spawner"""
@@ -21,6 +117,8 @@ class Schedule(ABC):
     id: str
     _blocked: bool
     _seconds_to_be_spawned: list[int]
+    _calendar: SpawnCalendar
+    _retry: SpawnRetry
     strategy: ScheduleStrategy
 
     STRATEGY_CLASSES: dict[str, type] = {
@@ -49,6 +147,16 @@ class Schedule(ABC):
         self._seconds_to_be_spawned = []
         self.strategy = strategy
         self.id = id_  # pylint: disable=invalid-name
+        self._calendar = SpawnCalendar(strategy.spawn_calendar())
+        self._retry = SpawnRetry()
+
+    @property
+    def failed_spawn_attempts(self) -> int:
+        """Returns the number of attempts to spawn a vehicle that failed.
+
+        :return: The number of failed attempts
+        """
+        return self._retry.failed_attempts
 
     @abstractmethod
     def _spawn(self, spawner: SpawnerProtocol, seconds: int) -> bool:
@@ -59,18 +167,74 @@ class Schedule(ABC):
         """
         raise NotImplementedError()
 
+    def start_track_id(
+        self, spawner: SpawnerProtocol  # pylint: disable=unused-argument
+    ) -> Optional[str]:
+        """Returns the track vehicles of the schedule spawn on. Spawns waiting for a
+        retry are woken early when a vehicle leaves it.
+
+        :param spawner: The calling Spawner.
+        :return: The id of the track or None if it is unknown
+        """
+        return None
+
+    def pending_spawn_count(self) -> int:
+        """Returns the number of vehicles that could not be spawned yet.
+
+        :return: The number of spawns waiting for a retry
+        """
+        return len(self._seconds_to_be_spawned)
+
+    def next_attempt_second(self) -> Optional[int]:
+        """Returns the next second the schedule has to be asked to spawn, either
+        because of its spawn calendar or to retry a failed spawn.
+
+        :return: The second or None if no more vehicles will be spawned
+        """
+        if self._retry.second is None:
+            return self._calendar.next_second
+        if self._calendar.next_second is None:
+            return self._retry.second
+        return min(self._calendar.next_second, self._retry.second)
+
+    def wake(self, seconds: int) -> bool:
+        """Retries the waiting spawns at the given second instead of waiting for the
+        backoff, e.g. because their start track was freed.
+
+        :param seconds: The elapsed seconds
+        :return: True if a waiting retry was brought forward
+        """
+        if self._retry.second is None or self._retry.second <= seconds:
+            return False
+        self._retry.second = seconds
+        return True
+
     def maybe_spawn(self, seconds: int, spawner: SpawnerProtocol):
-        """Spawns a vehicle if the schedule strategy allows it.
+        """Spawns a vehicle if the spawn calendar of the schedule strategy contains
+        the given second. Otherwise the latest vehicle that could not be spawned yet is
+        retried once its backoff has passed.
 
         :param seconds: The elapsed seconds
         :param spawner: The calling spawner.
         """
-        if not self._blocked and self.strategy.should_spawn(seconds):
+        is_spawn_second = self._calendar.advance(seconds) and not self._blocked
+        if is_spawn_second:
             self._seconds_to_be_spawned.append(seconds)
 
-        if len(self._seconds_to_be_spawned) > 0:
-            if self._spawn(spawner, self._seconds_to_be_spawned[-1]):
-                self._seconds_to_be_spawned.pop()
+        if len(self._seconds_to_be_spawned) == 0:
+            return
+        if not is_spawn_second and (
+            self._retry.second is None or seconds < self._retry.second
+        ):
+            return
+        spawned = self._spawn(spawner, self._seconds_to_be_spawned[-1])
+        if spawned:
+            self._seconds_to_be_spawned.pop()
+        self._retry.add_attempt(spawned)
+        if len(self._seconds_to_be_spawned) == 0:
+            self._retry.second = None
+        else:
+            self._retry.second = seconds + self._retry.backoff()
 
     def block(self):
         """Blocks the schedule.
@@ -18,6 +18,7 @@ class ScheduleConfiguration(SerializableBaseModel):
 
     random_strategy_trains_per_1000_seconds = FloatField(null=True)
     random_strategy_seed = IntegerField(null=True)
+    random_strategy_arrival_process = TextField(null=True)
 
     demand_strategy_power_station = TextField(null=True)
     demand_strategy_scaling_factor = FloatField(null=True)
@@ -43,6 +44,7 @@ class ScheduleConfiguration(SerializableBaseModel):
             "regular_strategy_frequency": self.regular_strategy_frequency,
             "random_strategy_trains_per_1000_seconds": self.random_strategy_trains_per_1000_seconds,
             "random_strategy_seed": self.random_strategy_seed,
+            "random_strategy_arrival_process": self.random_strategy_arrival_process,
             "demand_strategy_power_station": self.demand_strategy_power_station,
             "demand_strategy_scaling_factor": self.demand_strategy_scaling_factor,
             "demand_strategy_start_datetime": self.demand_strategy_start_datetime,
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from itertools import count
+from typing import Iterable, Iterator
 
 from src.schedule.schedule_configuration import ScheduleConfiguration
 
@@ -32,11 +34,39 @@ class ScheduleStrategy(ABC):
         """
         raise NotImplementedError()
 
-    def should_spawn(self, seconds: int) -> bool:
-        """Determines whether a vehicle should be spawned at the current time
+    def _in_time_range(self, seconds: int) -> bool:
+        """Determines whether the given time is between the start and end time
 
         :param seconds: The elapsed seconds
+        :return: True if the time is in the time range, False otherwise
         """
         is_after_start_second = seconds >= (self.start_time if self.start_time else 0)
         is_before_end_second = seconds <= (self.end_time if self.end_time else seconds)
         return is_after_start_second and is_before_end_second
+
+    def _seconds_in_time_range(self, step: int = 1) -> Iterable[int]:
+        """Returns the seconds between the start and end time, without an end time
+        the seconds never end
+
+        :param step: The number of seconds between two returned seconds
+        :return: The seconds
+        """
+        first_second = self.start_time if self.start_time else 0
+        if not self.end_time:
+            return count(first_second, step)
+        return range(first_second, self.end_time + 1, step)
+
+    def should_spawn(self, seconds: int) -> bool:
+        """Determines whether a vehicle should be spawned at the current time
+
+        :param seconds: The elapsed seconds
+        """
+        return self._in_time_range(seconds)
+
+    def spawn_calendar(self) -> Iterator[int]:
+        """Returns the seconds at which vehicles should be spawned in ascending
+        order, so a schedule doesn't have to ask the strategy every second.
+
+        :return: The spawn seconds, computed lazily
+        """
+        return iter(self._seconds_in_time_range())
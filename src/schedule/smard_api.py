@@ -1,10 +1,23 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 import requests
-from peewee import DateTimeField, FloatField, ForeignKeyField
+from peewee import JOIN, DateTimeField, FloatField, ForeignKeyField, chunked, fn
+from requests.adapters import HTTPAdapter
 
-from src.base_model import BaseModel
+from src.base_model import BaseModel, db
+from src.schedule.smard_dataset import (
+    MILLISECONDS_PER_SECOND,
+    SmardDataPoint,
+    SmardDataset,
+    open_smard_dataset,
+    smard_dataset_path,
+)
 
 
 class SmardApiIndex(BaseModel):
@@ -58,7 +71,28 @@ class SmardDataAvailability:
     end: datetime
 
 
-MILLISECONDS_PER_SECOND: int = 1000
+INSERT_BATCH_SIZE: int = 1000
+DEFAULT_FETCH_WORKERS: int = 4
+DEFAULT_INDEX_TTL: int = 3600
+
+
+def smard_fetch_workers() -> int:
+    """Returns the number of data batches that are downloaded from the smard api at the
+    same time, configured by SMARD_FETCH_WORKERS.
+
+    :return: The number of concurrent downloads, 1 if batches are downloaded one after
+        another
+    """
+    return max(1, int(os.getenv("SMARD_FETCH_WORKERS", str(DEFAULT_FETCH_WORKERS))))
+
+
+def smard_index_ttl() -> float:
+    """Returns the number of seconds the index timestamps of the smard api are reused
+    before they are requested again, configured by SMARD_INDEX_TTL.
+
+    :return: The time to live in seconds
+    """
+    return float(os.getenv("SMARD_INDEX_TTL", str(DEFAULT_INDEX_TTL)))
 
 
 class SmardApi:
@@ -71,9 +105,54 @@ class SmardApi:
     REGION: str = "50Hertz"  # name of the electricity grid company in eastern Germany
     BASE_URL: str = f"https://www.smard.de/app/chart_data/{FILTER}/{REGION}"
 
+    _dataset: SmardDataset | None
+    # shared by all instances, so connections to the api are reused and the index
+    # timestamps are only requested again when they expired
+    _session: Optional[requests.Session] = None
+    _session_lock: threading.Lock = threading.Lock()
+    _indices_updated_at: Optional[float] = None
+
     def __init__(self):
-        """Constructs a SmardApi"""
-        self._update_indices()
+        """Constructs a SmardApi. If SMARD_DATASET_PATH is set, the data is read from
+        the local dataset instead of the API and the database. Otherwise the index
+        timestamps are updated if they are older than SMARD_INDEX_TTL seconds."""
+        path = smard_dataset_path()
+        self._dataset = None if path is None else open_smard_dataset(path)
+        if self._dataset is None and not self._indices_are_fresh():
+            self._update_indices()
+
+    def _indices_are_fresh(self) -> bool:
+        """Checks whether the index timestamps were updated within SMARD_INDEX_TTL
+        seconds and are still stored in the database
+
+        :return: True if the index timestamps don't have to be updated
+        """
+        updated_at = SmardApi._indices_updated_at
+        return (
+            updated_at is not None
+            and time.monotonic() - updated_at < smard_index_ttl()
+            # pylint: disable-next=no-value-for-parameter
+            and SmardApiIndex.select().exists()
+        )
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Returns the session all requests to the smard api are sent with. Its
+        connection pool holds a connection for every concurrent download.
+
+        :return: The session
+        """
+        with cls._session_lock:
+            if cls._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=smard_fetch_workers()
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["Accept"] = "application/json"
+                cls._session = session
+            return cls._session
 
     def _timestamp_to_dt(self, timestamp: int) -> datetime:
         """Converts a timestamp to a datetime object
@@ -91,38 +170,85 @@ class SmardApi:
         """
         return int(date_time.timestamp() * MILLISECONDS_PER_SECOND)
 
-    def _request(self, url: str) -> dict:  # pragma: no cover
+    def _readable_id(self, kind: str, timestamp: int) -> str:
+        """Returns the readable id of an index or entry, which is derived from its
+        timestamp, so they can be inserted in bulk
+
+        :param kind: Either index or entry
+        :param timestamp: The timestamp
+        :return: The readable id
+        """
+        return f"smard-{kind}-{timestamp}"
+
+    def _request(self, url: str) -> dict:
         """Sends a get request to the given url and returns the response as a dict
 
         :param url: The url
         :return: The response as a dict
         """
-        response = requests.get(url, timeout=10, headers={"Accept": "application/json"})
+        response = self._get_session().get(url, timeout=10)
+        response.raise_for_status()
         return response.json()
 
-    def _request_data(self, index: SmardApiIndex):
-        """Requests the data of the given index timestamp and
-        writes it to the database
+    def _download_data(self, index: SmardApiIndex) -> list[dict]:
+        """Requests the data of the given index timestamp. It doesn't access the
+        database, so batches can be downloaded concurrently.
 
         :param index: The index timestamp
+        :return: The rows of the entries
         """
         url = (
             f"{self.BASE_URL}/{self.FILTER}_{self.REGION}"
             f"_{self.RESOLUTION}_{self._dt_to_timestamp(index.timestamp)}.json"
         )
-        for timestamp, value in self._request(url)["series"]:
-            SmardApiEntry.get_or_create(
-                timestamp=self._timestamp_to_dt(timestamp), value=value, index_id=index
-            )
+        now = datetime.now()
+        return [
+            {
+                "timestamp": self._timestamp_to_dt(timestamp),
+                "value": value,
+                "index_id": index.id,
+                "readable_id": self._readable_id("entry", timestamp),
+                "updated_at": now,
+            }
+            for timestamp, value in self._request(url)["series"]
+        ]
+
+    def _request_data(self, index: SmardApiIndex):
+        """Requests the data of the given index timestamp and
+        writes it to the database
+
+        :param index: The index timestamp
+        """
+        self._store_data(self._download_data(index))
+
+    def _store_data(self, rows: list[dict]):
+        """Writes the downloaded entries to the database
+
+        :param rows: The rows of the entries
+        """
+        # values of the last batch are published over time, so existing entries
+        # are updated
+        with db.atomic():
+            for batch in chunked(rows, INSERT_BATCH_SIZE):
+                SmardApiEntry.insert_many(batch).on_conflict(
+                    conflict_target=[SmardApiEntry.timestamp],
+                    preserve=[SmardApiEntry.value, SmardApiEntry.updated_at],
+                ).execute()
 
     def _update_indices(self):
         """Updates the database with the index timestamps of the smard api"""
         url = f"{self.BASE_URL}/index_{self.RESOLUTION}.json"
-        index_timestamps = self._request(url)["timestamps"]
-        for index_timestamp in index_timestamps:
-            SmardApiIndex.get_or_create(
-                timestamp=self._timestamp_to_dt(index_timestamp)
-            )
+        rows = [
+            {
+                "timestamp": self._timestamp_to_dt(index_timestamp),
+                "readable_id": self._readable_id("index", index_timestamp),
+            }
+            for index_timestamp in self._request(url)["timestamps"]
+        ]
+        with db.atomic():
+            for batch in chunked(rows, INSERT_BATCH_SIZE):
+                SmardApiIndex.insert_many(batch).on_conflict_ignore().execute()
+        SmardApi._indices_updated_at = time.monotonic()
 
     def _start_index_from_timestamp(
         self, start: datetime, end: datetime
@@ -174,36 +300,56 @@ class SmardApi:
             return None, True
         return end_index, True
 
-    def _is_last_index(self, index: SmardApiIndex) -> bool:
-        """Returns True if the given index is the last index timestamp
+    def _last_index(self) -> SmardApiIndex | None:
+        """Returns the last index timestamp
 
-        :param index: The index timestamp
-        :return: True if the given index is the last index timestamp
+        :return: The last index timestamp
         """
-        return (
-            index
-            == SmardApiIndex.select().order_by(SmardApiIndex.timestamp.desc()).first()
-        )
+        return SmardApiIndex.select().order_by(SmardApiIndex.timestamp.desc()).first()
 
     def _request_indices_between(
         self, start_index: SmardApiIndex, end_index: SmardApiIndex
     ):
-        """Requests the data of all indices between the given start and end index
+        """Requests the data of all indices between the given start and end index,
+        that have no entries yet. The data of the last index is always requested,
+        because it is still being published. Up to SMARD_FETCH_WORKERS batches are
+        downloaded at the same time, they are written to the database by the calling
+        thread.
 
         :param start_index: The start index timestamp
         :param end_index: The end index timestamp
         """
-        indices = SmardApiIndex.select().where(
-            SmardApiIndex.timestamp >= start_index.timestamp,
-            SmardApiIndex.timestamp <= end_index.timestamp,
+        last_index = self._last_index()
+        indices = (
+            SmardApiIndex.select(
+                SmardApiIndex, fn.COUNT(SmardApiEntry.id).alias("entry_count")
+            )
+            .join(
+                SmardApiEntry,
+                JOIN.LEFT_OUTER,
+                on=(SmardApiEntry.index_id == SmardApiIndex.id),
+            )
+            .where(
+                SmardApiIndex.timestamp >= start_index.timestamp,
+                SmardApiIndex.timestamp <= end_index.timestamp,
+            )
+            .group_by(SmardApiIndex.id)
         )
         # I don't now why the linter complains here.
         # It says that indices is not iterable.
         # But it obiously is, the code works fine.
         # pylint: disable=not-an-iterable
-        for index in indices:
-            if self._is_last_index(index) or len(index.entries) == 0:
+        missing = [
+            index for index in indices if index == last_index or index.entry_count == 0
+        ]
+        workers = min(smard_fetch_workers(), len(missing))
+        if workers <= 1:
+            for index in missing:
                 self._request_data(index)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for rows in executor.map(self._download_data, missing):
+                self._store_data(rows)
 
     def _get_data(self, start: datetime, end: datetime) -> list[SmardApiEntry]:
         """Returns the data between the given start and end timestamp
@@ -229,6 +375,8 @@ class SmardApi:
         """
         if start > end:
             return SmardDataAvailability.none()
+        if self._dataset is not None:
+            return self._dataset_availability(start, end)
 
         start_index, altered_interval = self._start_index_from_timestamp(start, end)
         if start_index is None:
@@ -254,13 +402,33 @@ class SmardApi:
         )
         return SmardDataAvailability(True, altered_interval, found_start, found_end)
 
-    def get_data(self, start: datetime, end: datetime) -> list[SmardApiEntry]:
+    def _dataset_availability(
+        self, start: datetime, end: datetime
+    ) -> SmardDataAvailability:
+        """Returns the data availability between the given start and end timestamp in
+        the offline dataset
+
+        :param start: The start timestamp
+        :param end: The end timestamp
+        :return: The data availability between the given start and end timestamp
+        """
+        interval = self._dataset.find_interval(start, end)
+        if interval is None:
+            return SmardDataAvailability.none()
+        found_start, found_end, altered_interval = interval
+        return SmardDataAvailability(True, altered_interval, found_start, found_end)
+
+    def get_data(
+        self, start: datetime, end: datetime
+    ) -> list[SmardApiEntry] | list[SmardDataPoint]:
         """Returns the data between the given start and end timestamp
 
         :param start: The start timestamp
         :param end: The end timestamp
         :return: The data between the given start and end timestamp
         """
+        if self._dataset is not None:
+            return self._dataset.get_data(start, end)
         availability = self.data_availability(start, end)
         if not availability.available:
             return []
@@ -0,0 +1,201 @@
+"""
+This module contains a packed local copy of the SMARD data, so demand schedules can be
+computed without network access and without reading SmardApiEntry rows. The dataset is a
+file containing a header with the timestamp of its first quarter hour followed by a
+contiguous float32 array of the values of all quarter hours, missing values are NaN.
+The file is memory-mapped, so only the pages of the requested intervals are read.
+"""
+import functools
+import glob
+import json
+import os
+import struct
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+MILLISECONDS_PER_SECOND: int = 1000
+MAGIC: bytes = b"SMRD"
+VERSION: int = 1
+HEADER = struct.Struct("<4sIq")  # magic, version, first timestamp in milliseconds
+MILLISECONDS_PER_QUARTER_HOUR: int = 15 * 60 * MILLISECONDS_PER_SECOND
+
+
+def smard_dataset_path() -> Optional[str]:
+    """Returns the path of the SMARD dataset, configured by SMARD_DATASET_PATH.
+
+    :return: The path or None if the SMARD API is used
+    """
+    return os.getenv("SMARD_DATASET_PATH")
+
+
+class SmardDataPoint(NamedTuple):
+    """The amount of electricity produced from coal in a quarter hour, like a
+    SmardApiEntry without a database row."""
+
+    timestamp: datetime
+    value: Optional[float]
+
+
+def write_smard_dataset(path: str, series: Iterable[tuple[int, Optional[float]]]):
+    """Packs a series of quarter hour values into a dataset file.
+
+    :param path: The path of the dataset
+    :param series: The timestamps in milliseconds and values, None for missing values
+    """
+    series = sorted(series)
+    if len(series) == 0:
+        raise ValueError("Can't write an empty SMARD dataset")
+    start = series[0][0]
+    timestamps = np.array([timestamp for timestamp, _ in series], dtype=np.int64)
+    values = np.array(
+        [np.nan if value is None else value for _, value in series], dtype="<f4"
+    )
+    data = np.full(
+        (timestamps[-1] - start) // MILLISECONDS_PER_QUARTER_HOUR + 1,
+        np.nan,
+        dtype="<f4",
+    )
+    data[(timestamps - start) // MILLISECONDS_PER_QUARTER_HOUR] = values
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, start))
+        file.write(data.tobytes())
+    os.replace(temporary_path, path)
+
+
+def series_from_json_directory(directory: str) -> list[tuple[int, Optional[float]]]:
+    """Reads the series of the data batches downloaded from the SMARD API, like
+    data/spawner/mock_smard_api_data.
+
+    :param directory: The directory containing the data_<timestamp>.json files
+    :return: The timestamps in milliseconds and values
+    """
+    series = []
+    for filename in sorted(glob.glob(os.path.join(directory, "data_*.json"))):
+        with open(filename, "r", encoding="UTF-8") as file:
+            series.extend(
+                (timestamp, value) for timestamp, value in json.load(file)["series"]
+            )
+    return series
+
+
+class SmardDataset:
+    """A memory-mapped SMARD dataset, which SmardApi reads instead of the API."""
+
+    start: int
+    values: np.ndarray
+
+    def __init__(self, path: str):
+        """Opens a dataset file.
+
+        :param path: The path of the dataset
+        """
+        with open(path, "rb") as file:
+            magic, version, self.start = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a SMARD dataset of version {VERSION}")
+        self.values = np.memmap(path, dtype="<f4", mode="r", offset=HEADER.size)
+
+    def _position(self, date_time: datetime) -> float:
+        """Returns the position of a datetime in the values.
+
+        :param date_time: The datetime
+        :return: The position, fractional between two quarter hours
+        """
+        return (
+            date_time.timestamp() * MILLISECONDS_PER_SECOND - self.start
+        ) / MILLISECONDS_PER_QUARTER_HOUR
+
+    def _datetime(self, position: int) -> datetime:
+        """Returns the datetime of a position in the values.
+
+        :param position: The position
+        :return: The datetime
+        """
+        return datetime.fromtimestamp(
+            (self.start + position * MILLISECONDS_PER_QUARTER_HOUR)
+            / MILLISECONDS_PER_SECOND
+        )
+
+    def _found_positions(self, start: datetime, end: datetime) -> tuple[int, int, bool]:
+        """Returns the first and last position with a value between the given start
+        and end timestamp and whether the interval was altered.
+
+        :param start: The start timestamp
+        :param end: The end timestamp
+        :return: The first and last position, -1 if there are no values
+        """
+        first = max(int(np.ceil(self._position(start))), 0)
+        last = min(int(np.floor(self._position(end))), len(self.values) - 1)
+        if start > end or first > last:
+            return -1, -1, True
+        valid = np.flatnonzero(~np.isnan(self.values[first : last + 1]))
+        if len(valid) == 0:
+            return -1, -1, True
+        found_first = first + int(valid[0])
+        found_last = first + int(valid[-1])
+        altered = (
+            self._position(start) < 0
+            or self._position(end) > len(self.values) - 1
+            or found_first != first
+            or found_last != last
+        )
+        return found_first, found_last, altered
+
+    def find_interval(
+        self, start: datetime, end: datetime
+    ) -> Optional[tuple[datetime, datetime, bool]]:
+        """Returns the first and last timestamp with a value between the given start
+        and end timestamp and whether the interval was altered
+
+        :param start: The start timestamp
+        :param end: The end timestamp
+        :return: The first and last timestamp and the boolean or None if there is no
+            value
+        """
+        first, last, altered = self._found_positions(start, end)
+        if first < 0:
+            return None
+        return self._datetime(first), self._datetime(last), altered
+
+    def get_data(self, start: datetime, end: datetime) -> list[SmardDataPoint]:
+        """Returns the data between the first and last value between the given start
+        and end timestamp
+
+        :param start: The start timestamp
+        :param end: The end timestamp
+        :return: The data, missing values are None
+        """
+        first, last, _ = self._found_positions(start, end)
+        if first < 0:
+            return []
+        return [
+            SmardDataPoint(
+                self._datetime(position), None if np.isnan(value) else float(value)
+            )
+            for position, value in enumerate(
+                self.values[first : last + 1].tolist(), start=first
+            )
+        ]
+
+
+@functools.lru_cache(maxsize=4)
+def _open_smard_dataset(path: str, _modified: int) -> SmardDataset:
+    """Opens a dataset file once per version of the file.
+
+    :param path: The path of the dataset
+    :param _modified: The modification time of the file
+    :return: The dataset
+    """
+    return SmardDataset(path)
+
+
+def open_smard_dataset(path: str) -> SmardDataset:
+    """Returns the dataset of a file, which is shared while the file is unchanged.
+
+    :param path: The path of the dataset
+    :return: The dataset
+    """
+    return _open_smard_dataset(path, os.stat(path).st_mtime_ns)
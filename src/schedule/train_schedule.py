@@ -51,6 +51,14 @@ class TrainSchedule(Schedule):
         self.platform_ids = platform_ids
         super().__init__(strategy, id_)
 
+    def start_track_id(self, spawner: SpawnerProtocol) -> str:
+        """Returns the track trains of the schedule spawn on.
+
+        :param spawner: The calling Spawner.
+        :return: The id of the track
+        """
+        return spawner.train_spawner.start_track_id(self.platform_ids)
+
     def _spawn(self, spawner: SpawnerProtocol, seconds: int) -> bool:
         """Spawns a vehicle.
 
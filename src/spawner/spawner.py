@@ -1,10 +1,15 @@
+import heapq
 import os
 from abc import ABC, abstractmethod
+from typing import Optional
 
+import pandas as pd
 from peewee import ForeignKeyField
 
 from src.base_model import BaseModel, SerializableBaseModel
 from src.component import Component
+from src.data_science.run_summary import RunSpawnRetrySummary
+from src.event_bus.event import Event, EventType
 from src.event_bus.event_bus import EventBus
 from src.implementor.models import SimulationConfiguration
 from src.schedule.schedule import Schedule
@@ -82,6 +87,72 @@ class ISpawnerDisruptor(ABC):
         raise NotImplementedError()
 
 
+class SpawnHeap:
+    """The next second every schedule has to be asked to spawn. The seconds of all
+    schedules are merged in a heap, so seconds without spawns don't ask every
+    schedule."""
+
+    _order: dict[str, int]
+    _heap: list[tuple[int, int, str]]
+    _seconds: dict[str, Optional[int]]
+
+    def __init__(self, schedule_ids: list[str]):
+        """
+        :param schedule_ids: The ids of the schedules in the order they are asked
+        """
+        self._order = {
+            schedule_id: order for order, schedule_id in enumerate(schedule_ids)
+        }
+        self._heap = []
+        self._seconds = {}
+
+    def push(self, schedule_id: str, seconds: Optional[int]):
+        """Sets the next second a schedule has to be asked to spawn.
+
+        :param schedule_id: The id of the schedule
+        :param seconds: The second or None if the schedule won't spawn anymore
+        """
+        self._seconds[schedule_id] = seconds
+        if seconds is not None:
+            heapq.heappush(self._heap, (seconds, self._order[schedule_id], schedule_id))
+
+    def pop_due(self, seconds: int) -> list[str]:
+        """Removes the schedules that have to be asked to spawn until the given second.
+
+        :param seconds: The elapsed seconds
+        :return: The ids of the schedules in the order they are asked
+        """
+        due_schedules = set()
+        while len(self._heap) > 0 and self._heap[0][0] <= seconds:
+            heap_second, _, schedule_id = heapq.heappop(self._heap)
+            # entries replaced by an early wakeup are skipped
+            if self._seconds[schedule_id] == heap_second:
+                due_schedules.add(schedule_id)
+        return sorted(due_schedules, key=self._order.get)
+
+
+class SpawnRetryStatistics:
+    """The number of spawns waiting for a retry, the most that waited at once and how
+    often waiting spawns were retried early."""
+
+    queued_spawns: int
+    max_queued_spawns: int
+    early_wakeups: int
+
+    def __init__(self):
+        self.queued_spawns = 0
+        self.max_queued_spawns = 0
+        self.early_wakeups = 0
+
+    def add_queued_spawns(self, count: int):
+        """Adds spawns that started or stopped waiting for a retry.
+
+        :param count: The number of spawns, negative if they stopped waiting
+        """
+        self.queued_spawns += count
+        self.max_queued_spawns = max(self.max_queued_spawns, self.queued_spawns)
+
+
 class Spawner(Component, ISpawnerDisruptor):
     """Abstract class for spawners. Spawners can spawn SUMO vehicles
     based on shedules.
@@ -89,6 +160,9 @@ class Spawner(Component, ISpawnerDisruptor):
 
     configuration: SpawnerConfiguration
     _schedules: dict[str, Schedule]
+    _spawn_heap: SpawnHeap
+    _start_tracks: Optional[dict[str, list[str]]]
+    _retry_statistics: SpawnRetryStatistics
     train_spawner: TrainBuilder
 
     PRIORITY: str = "LOW"
@@ -102,8 +176,83 @@ class Spawner(Component, ISpawnerDisruptor):
         """
         if tick % self.TICKS_PER_SECOND != 0:
             return
-        for schedule in self._schedules.values():
-            schedule.maybe_spawn(tick // self.TICKS_PER_SECOND, self)
+        seconds = tick // self.TICKS_PER_SECOND
+        for schedule_id in self._spawn_heap.pop_due(seconds):
+            schedule = self._schedules[schedule_id]
+            pending_spawns = schedule.pending_spawn_count()
+            schedule.maybe_spawn(seconds, self)
+            self._retry_statistics.add_queued_spawns(
+                schedule.pending_spawn_count() - pending_spawns
+            )
+            self._spawn_heap.push(schedule_id, schedule.next_attempt_second())
+
+    def _get_start_tracks(self) -> dict[str, list[str]]:
+        """Returns the schedules by the track their vehicles spawn on.
+
+        :return: The ids of the schedules by the id of the track
+        """
+        if self._start_tracks is None:
+            self._start_tracks = {}
+            for schedule_id, schedule in self._schedules.items():
+                track_id = schedule.start_track_id(self)
+                if track_id is not None:
+                    self._start_tracks.setdefault(track_id, []).append(schedule_id)
+        return self._start_tracks
+
+    def _wake(self, schedule_id: str, tick: int):
+        """Retries the waiting spawns of a schedule in the current second.
+
+        :param schedule_id: The id of the schedule
+        :param tick: The current tick
+        """
+        seconds = tick // self.TICKS_PER_SECOND
+        if self._schedules[schedule_id].wake(seconds):
+            self._retry_statistics.early_wakeups += 1
+            self._spawn_heap.push(schedule_id, seconds)
+
+    def train_leave_edge(self, event: Event):
+        """Wakes the waiting spawns of the schedules starting on the track a train
+        left.
+
+        :param event: The TRAIN_LEAVE_EDGE event
+        """
+        if self._retry_statistics.queued_spawns == 0:
+            return
+        track_id = event.arguments["edge_id"].split("-re")[0]
+        for schedule_id in self._get_start_tracks().get(track_id, []):
+            self._wake(schedule_id, event.arguments["tick"])
+
+    def resolve_fault(self, event: Event):
+        """Wakes the waiting spawns of all schedules, because a resolved fault may
+        have freed their tracks.
+
+        :param event: The RESOLVE_FAULT event
+        """
+        if self._retry_statistics.queued_spawns == 0:
+            return
+        for schedule_id in self._schedules:
+            self._wake(schedule_id, event.arguments["tick"])
+
+    def retry_statistics(self) -> dict[str, int]:
+        """Returns how many spawns are waiting for a retry and how many attempts to
+        spawn failed.
+
+        :return: The statistics
+        """
+        return {
+            "queued_spawns": self._retry_statistics.queued_spawns,
+            "max_queued_spawns": self._retry_statistics.max_queued_spawns,
+            "failed_spawn_attempts": sum(
+                schedule.failed_spawn_attempts for schedule in self._schedules.values()
+            ),
+            "early_wakeups": self._retry_statistics.early_wakeups,
+        }
+
+    def finish(self):
+        """Stores the retry statistics of the run next to its summaries."""
+        RunSpawnRetrySummary.write(
+            self.event_bus.run_id, pd.DataFrame([self.retry_statistics()])
+        )
 
     def __init__(
         self,
@@ -127,7 +276,13 @@ class Spawner(Component, ISpawnerDisruptor):
         )  # calls Component.__init__
         self.configuration = configuration
         self.train_spawner = train_spawner
+        self._retry_statistics = SpawnRetryStatistics()
+        self._start_tracks = None
         self._load_schedules()
+        self.event_bus.register_callback(
+            self.train_leave_edge, EventType.TRAIN_LEAVE_EDGE
+        )
+        self.event_bus.register_callback(self.resolve_fault, EventType.RESOLVE_FAULT)
 
     SCHEDULE_SUBCLASS_MAPPINGS: dict[str, type[Schedule]] = {
         "TrainSchedule": TrainSchedule,
@@ -145,6 +300,9 @@ class Spawner(Component, ISpawnerDisruptor):
                 schedule_configuration
             )
             self._schedules[str(schedule.id)] = schedule
+        self._spawn_heap = SpawnHeap(list(self._schedules))
+        for schedule_id, schedule in self._schedules.items():
+            self._spawn_heap.push(schedule_id, schedule.next_attempt_second())
 
     def get_schedule(self, schedule_id: str) -> Schedule:
         """Returns the schedule with the given id.
@@ -55,6 +55,14 @@ class TrainBuilder:
 
         return True
 
+    def start_track_id(self, timetable: List[str]) -> str:
+        """Returns the track a train with the given timetable spawns on
+
+        :param timetable: The stations the train drives along (as string-ids)
+        :return: The id of the track, which is the id of its edge without -re
+        """
+        return self._convert_timetable(timetable)[0].edge.identifier.split("-re")[0]
+
     def _get_first_route(
         self, timetable: List[Platform], starting_edge: Edge
     ) -> Tuple[str, UninitializedTrain]:
@@ -0,0 +1,49 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import pandas as pd
+
+from src.data_science.data_science import DataScience
+from src.implementor.models import Run
+from tests.decorators import recreate_db_setup
+
+
+class TestApiGrafanaCache:
+    """
+    Test the conditional requests of the Grafana datasource
+    """
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    def test_query_not_modified(self, client, run, monkeypatch):
+        mock = Mock(return_value=pd.DataFrame({"verkehrsarbeit": [1.0]}))
+        monkeypatch.setattr(DataScience, "get_verkehrsarbeit_by_run_id", mock)
+        Run.update(finished_at=datetime.now()).where(Run.id == run.id).execute()
+        body = {
+            "range": {"from": "2020-01-01T00:00:00Z", "to": "2020-01-01T01:00:00Z"},
+            "targets": [{"target": f"get_verkehrsarbeit_by_run_id:{run.readable_id}"}],
+            "maxDataPoints": 500,
+        }
+        response = client.post("/pandas-component/query", json=body)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert "max-age" in response.headers["Cache-Control"]
+
+        response = client.post(
+            "/pandas-component/query", json=body, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert mock.call_count == 1
+
+    def test_query_of_run_in_progress_not_cached(self, client, run, monkeypatch):
+        mock = Mock(return_value=pd.DataFrame({"verkehrsarbeit": [1.0]}))
+        monkeypatch.setattr(DataScience, "get_verkehrsarbeit_by_run_id", mock)
+        body = {
+            "targets": [{"target": f"get_verkehrsarbeit_by_run_id:{run.readable_id}"}],
+        }
+        response = client.post("/pandas-component/query", json=body)
+        assert "ETag" not in response.headers
+        assert response.headers["Cache-Control"] == "no-store"
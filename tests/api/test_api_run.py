@@ -1,9 +1,12 @@
 import uuid
+from datetime import datetime
 from unittest.mock import Mock
 
 import pytest
 
 from src import implementor as impl
+from src.data_science.data_science import DataScience
+from src.implementor.models import Run
 from tests.api.utils import verify_delete, verify_get_single
 
 TOKEN_HEADER = "bp2022-ap1-api-key"
@@ -68,3 +71,46 @@ class TestApiRun:
             token,
             mock,
         )
+
+    def test_get_result_cache_stats(self, client, clear_token, token, monkeypatch):
+        mock = Mock(return_value=({"hits": 0}, 200))
+        monkeypatch.setattr(impl.run, "get_result_cache_stats", mock)
+        response = client.get("/run/cache", headers={TOKEN_HEADER: clear_token})
+        assert response.status_code == 200
+        assert mock.call_args.args == ({}, token)
+
+    def test_get_coalescing_stats(self, client, clear_token, token, monkeypatch):
+        mock = Mock(return_value=({}, 200))
+        monkeypatch.setattr(impl.run, "get_coalescing_stats", mock)
+        response = client.get("/run/coalescing", headers={TOKEN_HEADER: clear_token})
+        assert response.status_code == 200
+        assert mock.call_args.args == ({}, token)
+
+    def test_create_run_summary(self, client, clear_token, token, monkeypatch):
+        mock = Mock(return_value=("Summarized run", 201))
+        monkeypatch.setattr(impl.run, "create_run_summary", mock)
+        run_id = str(uuid.uuid4())
+        response = client.post(
+            f"/run/{run_id}/summary", headers={TOKEN_HEADER: clear_token}
+        )
+        assert response.status_code == 201
+        assert mock.call_args.args == ({"identifier": run_id}, token)
+
+    def test_create_run_summary_of_unfinished_run(
+        self, client, clear_token, run, monkeypatch
+    ):
+        mock = Mock()
+        monkeypatch.setattr(DataScience, "materialize_run_summary", mock)
+        response = client.post(
+            f"/run/{run.id}/summary", headers={TOKEN_HEADER: clear_token}
+        )
+        assert response.status_code == 400
+        assert not mock.called
+        assert Run.get_by_id(run.id).summarized_at is None
+
+        Run.update(finished_at=datetime.now()).where(Run.id == run.id).execute()
+        response = client.post(
+            f"/run/{run.id}/summary", headers={TOKEN_HEADER: clear_token}
+        )
+        assert response.status_code == 201
+        mock.assert_called_once_with(run.id)
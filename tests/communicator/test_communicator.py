@@ -1,12 +1,15 @@
 import os
 from time import sleep
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 import traci
 
-from src.communicator.communicator import Communicator
+from src.communicator.communicator import Communicator, run_simulation_steps
 from src.component import MockComponent
+from src.wrapper.simulation_object_updating_component import (
+    SimulationObjectUpdatingComponent,
+)
 
 
 @pytest.fixture
@@ -131,3 +134,27 @@ def test_components_are_ordered_correctly():
     communicator.add_component(mock2)
 
     assert communicator._components == [mock2, mock1]
+
+
+class FailingFinishComponent(MockComponent):
+    """Mock for a component whose finish fails"""
+
+    def finish(self):
+        raise RuntimeError("finish failed")
+
+
+@patch("src.component.MockComponent.finish")
+def test_failing_finish_does_not_stop_other_components(finish_mock):
+    update_state = Mock()
+    failing_component = FailingFinishComponent()
+    failing_component.priority = 10  # = "VERY_HIGH"
+    components = [
+        SimulationObjectUpdatingComponent(sumo_configuration=None),
+        failing_component,
+        MockComponent(),
+    ]
+
+    run_simulation_steps(components, 0, update_state)
+
+    assert finish_mock.called
+    update_state.assert_called_with(1, 0, False)
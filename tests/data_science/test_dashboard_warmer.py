@@ -0,0 +1,72 @@
+from unittest.mock import Mock
+
+import pandas as pd
+
+from src.data_science.dashboard_warmer import (
+    CONFIG_DASHBOARD_METRICS,
+    MULTI_CONFIG_DASHBOARD_METRICS,
+    RUN_DASHBOARD_METRICS,
+    DashboardWarmer,
+    warm_dashboards,
+    warm_dashboards_task,
+)
+from src.data_science.data_science import DataScience
+from src.event_bus.event_bus import EventBus
+from src.logger.result_cache import result_cache
+from tests.decorators import recreate_db_setup
+
+
+class TestDashboardWarmer:
+    """Tests for warming the dashboards of finished runs."""
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    @staticmethod
+    def _mock_metrics(monkeypatch) -> dict[str, Mock]:
+        mocks = {}
+        for name in (
+            RUN_DASHBOARD_METRICS
+            + CONFIG_DASHBOARD_METRICS
+            + MULTI_CONFIG_DASHBOARD_METRICS
+        ):
+            mocks[name] = Mock(return_value=pd.DataFrame())
+            monkeypatch.setattr(DataScience, name, mocks[name])
+        return mocks
+
+    def test_warm_dashboards(self, run, simulation_configuration, monkeypatch):
+        mocks = self._mock_metrics(monkeypatch)
+        mocks["get_window_by_config_id"].side_effect = ValueError("no logs")
+
+        warmed = warm_dashboards(run.id)
+
+        assert "get_window_by_config_id" not in warmed
+        assert len(warmed) == len(mocks) - 1
+        for name in RUN_DASHBOARD_METRICS:
+            assert mocks[name].call_args.args == (run.id,)
+        for name in CONFIG_DASHBOARD_METRICS:
+            assert mocks[name].call_args.args == (simulation_configuration.id,)
+        for name in MULTI_CONFIG_DASHBOARD_METRICS:
+            assert mocks[name].call_args.args == ([simulation_configuration.id],)
+
+    def test_finish_warms_without_celery(self, run, event_bus: EventBus, monkeypatch):
+        mocks = self._mock_metrics(monkeypatch)
+        monkeypatch.setenv("DISABLE_CELERY", "True")
+        DashboardWarmer(event_bus).finish()
+        assert all(mock.called for mock in mocks.values())
+
+    def test_finish_enqueues_with_disk_tier(
+        self, run, event_bus: EventBus, tmp_path, monkeypatch
+    ):
+        delay = Mock()
+        monkeypatch.setattr(warm_dashboards_task, "delay", delay)
+        monkeypatch.delenv("DISABLE_CELERY", raising=False)
+
+        monkeypatch.setattr(result_cache, "directory", None)
+        DashboardWarmer(event_bus).finish()
+        assert not delay.called
+
+        monkeypatch.setattr(result_cache, "directory", str(tmp_path))
+        DashboardWarmer(event_bus).finish()
+        delay.assert_called_once_with(run.id)
@@ -1,5 +1,6 @@
 import os
 
+import numpy as np
 import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
@@ -127,6 +128,173 @@ class TestDataScience:
         )
         assert_frame_equal(verkehrsleistung_df, verkehrsleistung_momentarily_time_df)
 
+    @staticmethod
+    def random_edge_times_df(run_count: int) -> pd.DataFrame:
+        rng = np.random.default_rng(42)
+        enter_ticks = rng.integers(0, 5000, 400 * run_count)
+        return pd.DataFrame(
+            {
+                "run_id": np.repeat(np.arange(run_count), 400),
+                "enter_tick": enter_ticks,
+                # includes block sections passed within a single tick
+                "leave_tick": enter_ticks + rng.integers(0, 300, 400 * run_count),
+                "edge_length": rng.uniform(10, 2000, 400 * run_count),
+            }
+        )
+
+    def test_verkehrsleistung_momentarily_matches_per_tick(
+        self, data_science: DataScience
+    ):
+        # pylint: disable=protected-access
+        edge_times_df = self.random_edge_times_df(1)
+        delta_tick = self.second_to_tick(10)
+        ticks = np.arange(0, edge_times_df["leave_tick"].max() + 1, delta_tick)
+        np.testing.assert_allclose(
+            data_science._calculate_verkehrsleistung_momentarily(
+                edge_times_df, ticks, delta_tick
+            ),
+            [
+                data_science._calculate_verkehrsleistung_momentarily_by_tick(
+                    edge_times_df, tick, delta_tick
+                )
+                for tick in ticks
+            ],
+            rtol=1e-9,
+            atol=1e-6,
+        )
+
+    def test_verkehrsleistung_momentarily_multiple_runs_matches_per_tick(
+        self, data_science: DataScience
+    ):
+        # pylint: disable=protected-access
+        edge_times_df = self.random_edge_times_df(3)
+        delta_tick = self.second_to_tick(10)
+        ticks = np.arange(0, edge_times_df["leave_tick"].max() + 1, delta_tick)
+        np.testing.assert_allclose(
+            data_science._calculate_verkehrsleistung_momentarily_multiple_runs(
+                edge_times_df, ticks, delta_tick
+            ),
+            [
+                data_science._calculate_verkehrsleistung_momentarily_by_tick_multiple_runs(
+                    edge_times_df, tick, delta_tick
+                )
+                for tick in ticks
+            ],
+            rtol=1e-9,
+            atol=1e-6,
+        )
+
+    def test_window_sizes_by_group_matches_per_group(self, data_science: DataScience):
+        # pylint: disable=protected-access
+        rng = np.random.default_rng(7)
+        values_df = pd.DataFrame(
+            {
+                "station_id": rng.choice(["station_1", "station_2", "station_3"], 500),
+                "train_id": rng.choice([f"ice_{i}_passenger" for i in range(20)], 500),
+                "arrival_tick": pd.array(rng.integers(0, 10000, 500), dtype="Int64"),
+                "departure_tick": pd.array(rng.integers(0, 10000, 500), dtype="Int64"),
+            }
+        )
+        values_df.loc[rng.choice(500, 100), "arrival_tick"] = None
+        for threshold in [0.5, 0.9]:
+            expected_df = values_df.groupby(["station_id", "train_id"]).agg(
+                lambda x, t=threshold: data_science._get_window_size_from_values_threshold(
+                    x, t
+                )
+            )
+            assert_frame_equal(
+                data_science._get_window_sizes_by_group(
+                    values_df, ["station_id", "train_id"], threshold
+                ),
+                expected_df.astype(float),
+            )
+
+    def test_window_sizes_over_time_matches_per_tick(self, data_science: DataScience):
+        # pylint: disable=protected-access
+        rng = np.random.default_rng(3)
+        arrival_ticks = rng.integers(0, 3000, 300)
+        departures_arrivals_df = pd.DataFrame(
+            {
+                "station_id": rng.choice(["station_1", "station_2"], 300),
+                "train_id": rng.choice([f"ice_{i}_passenger" for i in range(10)], 300),
+                "arrival_tick": pd.array(arrival_ticks, dtype="Int64"),
+                "departure_tick": pd.array(
+                    arrival_ticks + rng.integers(1, 200, 300), dtype="Int64"
+                ),
+            }
+        )
+        departures_arrivals_df.loc[rng.choice(300, 30), "arrival_tick"] = None
+        ticks = np.arange(0, 3200, 50)
+        expected_df = pd.DataFrame(
+            [
+                list(
+                    data_science._get_window_size_by_tick_config_id(
+                        departures_arrivals_df, tick
+                    )
+                )
+                for tick in ticks
+            ],
+            columns=["arrival_size", "departure_size"],
+        )
+        assert_frame_equal(
+            data_science._get_window_sizes_over_time(departures_arrivals_df, ticks),
+            expected_df,
+            check_exact=True,
+        )
+
+    def test_aggregate_edge_times_by_train_type_matches_apply(
+        self, data_science: DataScience
+    ):
+        # pylint: disable=protected-access
+        rng = np.random.default_rng(11)
+        edge_times_df = self.random_edge_times_df(5).assign(
+            train_id=rng.choice(
+                [f"ice_{i}_{t}" for i in range(10) for t in ["passenger", "cargo"]],
+                2000,
+            )
+        )
+        edge_times_df.loc[rng.choice(2000, 50), "leave_tick"] = None
+        prepared_df = data_science._prepare_edge_times(edge_times_df)
+        grouped_df = data_science._aggregate_edge_times_by_train_type(
+            prepared_df, ["run_id"]
+        )
+
+        edge_times_df = edge_times_df.dropna()
+        edge_times_df["train_type"] = edge_times_df["train_id"].apply(
+            lambda train_id: train_id.split("_")[2]
+        )
+        expected_df = (
+            edge_times_df.groupby(["run_id", "train_type"])
+            .apply(
+                lambda data: pd.Series(
+                    {
+                        "leave_tick": data["leave_tick"].max(),
+                        "edge_length": data["edge_length"].sum(),
+                    }
+                )
+            )
+            .reset_index()
+        )
+        all_df = (
+            expected_df.groupby("run_id")
+            .apply(
+                lambda data: pd.Series(
+                    {
+                        "train_type": "all",
+                        "leave_tick": data["leave_tick"].max(),
+                        "edge_length": data["edge_length"].sum(),
+                    }
+                )
+            )
+            .reset_index()
+        )
+        expected_df = pd.concat([expected_df, all_df], ignore_index=True)
+        assert_frame_equal(
+            grouped_df.sort_values(["run_id", "train_type"]).reset_index(drop=True),
+            expected_df.sort_values(["run_id", "train_type"]).reset_index(drop=True),
+            check_dtype=False,
+        )
+
     @pytest.mark.skip(
         reason="Test broke due to change of constants. Skipped for time reasons."
     )
@@ -394,3 +562,82 @@ class TestDataScience:
             [simulation_configuration]
         )
         assert_frame_equal(verkehrsleistung_df, verkehrsleistung_by_multi_config_df)
+
+    def test_materialize_run_summary(
+        self,
+        event_bus: EventBus,
+        event_bus2: EventBus,
+        simulation_configuration: SimulationConfiguration,
+        data_science: DataScience,
+    ):
+        setup_logs_edges(event_bus)
+        setup_logs_edges(event_bus2)
+        metrics = [
+            lambda: data_science.get_verkehrsarbeit_by_run_id(event_bus.run_id),
+            lambda: data_science.get_verkehrsleistung_by_run_id(event_bus.run_id),
+            lambda: data_science.get_verkehrsleistung_momentarily_time_by_run_id(
+                event_bus.run_id
+            ),
+            lambda: data_science.get_verkehrsleistung_time_by_config_id(
+                simulation_configuration
+            ),
+            lambda: data_science.get_verkehrsarbeit_by_config_id(
+                simulation_configuration
+            ),
+            lambda: data_science.get_verkehrsleistung_by_config_id(
+                simulation_configuration
+            ),
+            lambda: data_science.get_average_verkehrsarbeit_by_config_id(
+                simulation_configuration
+            ),
+            lambda: data_science.get_average_verkehrsleistung_by_config_id(
+                simulation_configuration
+            ),
+            lambda: data_science.get_verkehrsarbeit_by_multi_config(
+                [simulation_configuration]
+            ),
+            lambda: data_science.get_verkehrsleistung_by_multi_config(
+                [simulation_configuration]
+            ),
+        ]
+        expected_dfs = [metric() for metric in metrics]
+
+        # only the first run is summarized, the other one is still read from its logs
+        data_science.materialize_run_summary(event_bus.run_id)
+        assert Run.get_by_id(event_bus.run_id).summarized_at is not None
+        assert Run.get_by_id(event_bus2.run_id).summarized_at is None
+        for metric, expected_df in zip(metrics, expected_dfs):
+            assert_frame_equal(
+                metric().sort_index(), expected_df.sort_index(), check_dtype=False
+            )
+
+    def test_parallel_runs_match_serial(
+        self,
+        event_bus: EventBus,
+        event_bus2: EventBus,
+        simulation_configuration: SimulationConfiguration,
+        data_science: DataScience,
+        monkeypatch,
+    ):
+        setup_logs_edges(event_bus)
+        setup_logs_edges(event_bus2)
+        setup_logs_departure_arrival(event_bus)
+        setup_logs_departure_arrival_alt(event_bus2)
+        metrics = [
+            lambda: data_science.get_verkehrsleistung_time_by_config_id(
+                simulation_configuration
+            ),
+            lambda: data_science.get_average_verkehrsleistung_by_config_id(
+                simulation_configuration
+            ),
+            lambda: data_science.get_verkehrsarbeit_by_multi_config(
+                [simulation_configuration]
+            ),
+            lambda: data_science.get_window_by_config_id(simulation_configuration),
+            lambda: data_science.get_window_by_multi_config([simulation_configuration]),
+        ]
+        monkeypatch.setenv("ANALYTICS_WORKERS", "1")
+        expected_dfs = [metric() for metric in metrics]
+        monkeypatch.setenv("ANALYTICS_WORKERS", "2")
+        for metric, expected_df in zip(metrics, expected_dfs):
+            assert_frame_equal(metric(), expected_df)
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from src.data_science.downsampling import (
+    downsample,
+    filter_time_range,
+    largest_triangle_three_buckets,
+    to_naive_utc,
+)
+
+
+class TestDownsampling:
+    """Tests for restricting and downsampling time series."""
+
+    @staticmethod
+    def _time_df(values: list[float]) -> pd.DataFrame:
+        return pd.DataFrame(
+            {"value": values},
+            index=pd.date_range("2020-01-01", periods=len(values), freq="10s"),
+        )
+
+    def test_to_naive_utc(self):
+        assert to_naive_utc(
+            pd.Timestamp("2020-01-01 01:00:00", tz="Europe/Berlin")
+        ) == pd.Timestamp("2020-01-01 00:00:00")
+        assert to_naive_utc("2020-01-01T00:00:10Z") == pd.Timestamp(
+            "2020-01-01 00:00:10"
+        )
+
+    def test_filter_time_range(self):
+        time_df = self._time_df(list(range(10)))
+        time_range = (
+            pd.Timestamp("2020-01-01 00:00:20"),
+            to_naive_utc("2020-01-01 00:00:50"),
+        )
+        assert filter_time_range(time_df, time_range)["value"].tolist() == [
+            2,
+            3,
+            4,
+            5,
+        ]
+        assert_frame_equal(filter_time_range(time_df, None), time_df)
+
+    def test_filter_time_range_keeps_overlapping_durations(self):
+        time_df = pd.DataFrame(
+            {
+                "end_time": [
+                    pd.Timestamp("2020-01-01 00:00:05"),
+                    pd.Timestamp("2020-01-01 00:01:00"),
+                    pd.NaT,
+                    pd.Timestamp("2020-01-01 00:03:00"),
+                ],
+                "fault_id": ["a", "b", "c", "d"],
+            },
+            index=pd.to_datetime(
+                [
+                    "2020-01-01 00:00:00",
+                    "2020-01-01 00:00:00",
+                    "2020-01-01 00:00:10",
+                    "2020-01-01 00:02:30",
+                ]
+            ),
+        )
+        time_range = (
+            pd.Timestamp("2020-01-01 00:00:30"),
+            pd.Timestamp("2020-01-01 00:02:00"),
+        )
+        assert filter_time_range(time_df, time_range, "end_time")[
+            "fault_id"
+        ].tolist() == ["b", "c"]
+
+    def test_largest_triangle_three_buckets(self):
+        x = np.arange(100)
+        y = np.zeros(100)
+        y[37] = 10.0
+        y[71] = -5.0
+        selected = largest_triangle_three_buckets(x, y, 10)
+        assert len(selected) == 10
+        assert selected[0] == 0
+        assert selected[-1] == 99
+        assert np.all(np.diff(selected) > 0)
+        assert 37 in selected
+        assert 71 in selected
+
+    def test_largest_triangle_three_buckets_keeps_short_series(self):
+        assert largest_triangle_three_buckets(
+            np.arange(5), np.arange(5), 10
+        ).tolist() == [0, 1, 2, 3, 4]
+
+    def test_downsample(self):
+        values = np.sin(np.linspace(0, 20, 1000))
+        time_df = self._time_df(values.tolist())
+        time_df["other"] = np.cos(np.linspace(0, 20, 1000))
+        downsampled_df = downsample(time_df, 100)
+        assert len(downsampled_df) == 100
+        assert downsampled_df.index.is_monotonic_increasing
+        for column in ["value", "other"]:
+            assert downsampled_df[column].max() > time_df[column].max() - 0.01
+            assert downsampled_df[column].min() < time_df[column].min() + 0.01
+        assert_frame_equal(time_df.loc[downsampled_df.index], downsampled_df)
+        assert_frame_equal(downsample(time_df, None), time_df)
+        assert_frame_equal(downsample(time_df, 1000), time_df)
+
+    def test_downsample_to_less_than_three_points(self):
+        time_df = self._time_df(list(range(10)))
+        assert downsample(time_df, 2)["value"].tolist() == [0, 9]
+        assert downsample(time_df, 1)["value"].tolist() == [0]
+
+    def test_downsample_several_columns(self):
+        value = np.zeros(1000)
+        value[123] = 3.0
+        value[789] = -1.0
+        other = np.zeros(1000)
+        other[456] = -2.0
+        time_df = self._time_df(value.tolist())
+        time_df["other"] = other
+        time_df["third"] = np.linspace(0, 1, 1000)
+        time_df["constant"] = 1.0
+        time_df["label"] = "a"
+        downsampled_df = downsample(time_df, 50)
+        assert len(downsampled_df) == 50
+        assert downsampled_df["value"].max() == 3.0
+        assert downsampled_df["value"].min() == -1.0
+        assert downsampled_df["other"].min() == -2.0
+        assert_frame_equal(time_df.loc[downsampled_df.index], downsampled_df)
@@ -68,6 +68,8 @@ class TestGrafanaDataRegistration:
             "get_spawn_events_by_run_id:${run_id}",
             "get_verkehrsarbeit_by_run_id:${run_id}",
             "get_verkehrsleistung_by_run_id:${run_id}",
+            "get_live_metrics_by_run_id:${run_id}",
+            "get_live_station_dwell_by_run_id:${run_id}",
             "get_window_size_time_by_config_id:${config_id}",
             "get_verkehrsleistung_time_by_config_id:${config_id}",
             "get_coal_demand_by_config_id:${config_id}",
@@ -125,6 +127,27 @@ class TestGrafanaDataRegistration:
             verkehrsleistung_momentarily_time_df,
         )
 
+    def test_get_verkehrsleistung_momentarily_time_by_run_id_in_time_range(
+        self,
+        _run_id: str,
+        event_bus: EventBus,
+        grafana_data_registrator: GrafanaDataRegistrator,
+        verkehrsleistung_momentarily_time_df: pd.DataFrame,
+    ):
+        setup_logs_edges(event_bus)
+        start = verkehrsleistung_momentarily_time_df.index[1]
+        end = verkehrsleistung_momentarily_time_df.index[-2]
+        assert_frame_equal(
+            grafana_data_registrator.get_verkehrsleistung_momentarily_time_by_run_id(
+                _run_id,
+                {
+                    "$gt": start.tz_localize("UTC").to_pydatetime(),
+                    "$lte": end.tz_localize("UTC").to_pydatetime(),
+                },
+            ),
+            verkehrsleistung_momentarily_time_df.iloc[1:-1],
+        )
+
     @pytest.mark.skip(
         reason="Test broke due to change of constants. Skipped for time reasons."
     )
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from src.data_science.grafana_http_cache import compute_etag, get_completion_markers
+from src.implementor.models import Run
+from tests.decorators import recreate_db_setup
+
+
+class TestGrafanaHttpCache:
+    """Tests for the ETags of responses of the Grafana datasource."""
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    @staticmethod
+    def _body(target: str) -> dict:
+        return {
+            "range": {"from": "2020-01-01T00:00:00Z", "to": "2020-01-01T01:00:00Z"},
+            "targets": [{"target": target, "refId": "A"}],
+            "maxDataPoints": 500,
+            "requestId": "Q100",
+        }
+
+    def test_run_in_progress_bypasses_cache(self, run):
+        body = self._body(f"get_verkehrsarbeit_by_run_id:{run.readable_id}")
+        assert compute_etag("/query", body) is None
+
+    def test_unknown_id_bypasses_cache(self):
+        assert (
+            compute_etag("/query", self._body("get_faults_by_run_id:unknown")) is None
+        )
+
+    def test_finished_run_etag(self, run):
+        Run.update(finished_at=datetime.now()).where(Run.id == run.id).execute()
+        body = self._body(f"get_verkehrsarbeit_by_run_id:{run.readable_id}")
+        etag = compute_etag("/query", body)
+        assert etag is not None
+        assert compute_etag("/query", {**body, "requestId": "Q101"}) == etag
+        assert compute_etag("/query", {**body, "maxDataPoints": 100}) != etag
+        assert compute_etag("/annotations", body) != etag
+
+        Run.update(summarized_at=datetime.now()).where(Run.id == run.id).execute()
+        assert compute_etag("/query", body) != etag
+
+    def test_coal_readers_bypass_cache(self, simulation_configuration, run):
+        Run.update(finished_at=datetime.now()).where(Run.id == run.id).execute()
+        readable_id = simulation_configuration.readable_id
+        assert compute_etag(
+            "/query", self._body(f"get_verkehrsarbeit_by_config_id:{readable_id}")
+        )
+        body = self._body(f"get_coal_demand_by_config_id:{readable_id}")
+        assert compute_etag("/query", body) is None
+        body = self._body(f"get_coal_demand_by_run_id:{run.readable_id}")
+        assert compute_etag("/query", body) is None
+        body = self._body(f"get_coal_spawn_events_by_config_id:{readable_id}")
+        assert compute_etag("/annotations", body) is None
+
+    def test_config_with_running_run_bypasses_cache(
+        self, simulation_configuration, run, run2
+    ):
+        Run.update(finished_at=datetime.now()).where(Run.id == run.id).execute()
+        targets = [
+            f"get_verkehrsarbeit_by_config_id:{simulation_configuration.readable_id}"
+        ]
+        assert get_completion_markers(targets) is None
+
+        Run.update(finished_at=datetime.now()).where(Run.id == run2.id).execute()
+        assert len(get_completion_markers(targets)) == 3
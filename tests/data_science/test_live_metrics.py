@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from src.data_science.data_science import DataScience
+from src.data_science.live_metrics import LiveMetricsCollector, LiveMetricSnapshot
+from src.event_bus.event_bus import EventBus
+from tests.decorators import recreate_db_setup
+from tests.fixtures.fixtures_logger import setup_logs_departure_arrival
+
+
+class TestLiveMetrics:
+    """Tests for the live metrics of running simulations"""
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    @staticmethod
+    def second_to_tick(second: int) -> int:
+        return int(float(second) / float(os.getenv("TICK_LENGTH")))
+
+    @pytest.fixture
+    def collector(self, event_bus: EventBus) -> LiveMetricsCollector:
+        return LiveMetricsCollector(event_bus, self.second_to_tick(60))
+
+    def test_aggregates_edges_and_faults(
+        self, event_bus: EventBus, collector: LiveMetricsCollector
+    ):
+        event_bus.train_enter_edge(1, "ice_1_passenger", "section_1", 500.0)
+        event_bus.train_enter_edge(2, "ice_2_passenger", "section_2", 300.0)
+        event_bus.train_leave_edge(3, "ice_1_passenger", "section_1", 500.0)
+        assert collector.trains_on_edges == 1
+        assert collector.passed_length == 500.0
+
+        collector.next_tick(self.second_to_tick(30))
+        assert LiveMetricSnapshot.select().count() == 0
+        collector.next_tick(self.second_to_tick(60))
+        snapshot = LiveMetricSnapshot.get()
+        assert snapshot.tick == self.second_to_tick(60)
+        assert snapshot.verkehrsarbeit == pytest.approx(0.5)
+        assert snapshot.verkehrsleistung == pytest.approx(500.0 * 3.6 / 60)
+        assert snapshot.trains_on_edges == 1
+        assert snapshot.active_faults == 0
+
+    def test_publishes_station_dwell_times(
+        self,
+        event_bus: EventBus,
+        collector: LiveMetricsCollector,
+        data_science: DataScience,
+    ):
+        setup_logs_departure_arrival(event_bus)
+        collector.finish()
+        station_df = data_science.get_live_station_dwell_by_run_id(event_bus.run_id)
+        assert list(station_df.columns) == [
+            "station_id",
+            "dwell_count",
+            "dwell_mean",
+            "dwell_min",
+            "dwell_max",
+        ]
+        station_1 = station_df[station_df["station_id"] == "station_1"].iloc[0]
+        assert station_1["dwell_min"] == pytest.approx(10, abs=1)
+        assert len(data_science.get_live_metrics_by_run_id(event_bus.run_id)) == 1
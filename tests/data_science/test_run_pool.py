@@ -0,0 +1,42 @@
+import os
+
+from src.data_science import run_pool
+from src.data_science.run_pool import analytics_workers, map_runs
+
+
+def square_in_worker(value: int) -> tuple[int, int]:
+    return value * value, os.getpid()
+
+
+class TestRunPool:
+    """Tests for the worker pool of data science"""
+
+    def test_analytics_workers(self, monkeypatch):
+        monkeypatch.delenv("ANALYTICS_WORKERS", raising=False)
+        assert analytics_workers() == 1
+        monkeypatch.setenv("ANALYTICS_WORKERS", "4")
+        assert analytics_workers() == 4
+        monkeypatch.setenv("ANALYTICS_WORKERS", "0")
+        assert analytics_workers() == 1
+        monkeypatch.setenv("ANALYTICS_WORKERS", "four")
+        assert analytics_workers() == 1
+
+    def test_map_runs_serial(self):
+        results = map_runs(square_in_worker, [3, 1, 2], workers=1)
+        assert [result for result, _ in results] == [9, 1, 4]
+        assert {pid for _, pid in results} == {os.getpid()}
+
+    def test_map_runs_keeps_order_of_runs(self):
+        values = list(range(20))
+        results = map_runs(square_in_worker, values, workers=3)
+        assert [result for result, _ in results] == [value * value for value in values]
+        assert os.getpid() not in {pid for _, pid in results}
+
+    def test_map_runs_reuses_spawned_pool(self):
+        map_runs(square_in_worker, [1, 2], workers=2)
+        # pylint: disable=protected-access
+        executor = run_pool._POOL.executor
+        assert executor._mp_context.get_start_method() == "spawn"
+
+        map_runs(square_in_worker, [3, 4, 5], workers=2)
+        assert run_pool._POOL.executor is executor
@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.data_science.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent computations."""
+
+    @staticmethod
+    def _call_concurrently(flight: SingleFlight, key, compute, count: int) -> list:
+        results = [None] * count
+        started = threading.Barrier(count)
+
+        def call(index: int):
+            started.wait()
+            try:
+                results[index] = flight.do(key, compute, "label")
+            except ValueError as exception:
+                results[index] = exception
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_are_coalesced(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(timeout=5)
+            return pd.DataFrame({"value": [1, 2, 3]})
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results = self._call_concurrently(flight, "key", compute, 4)
+        timer.join()
+
+        assert len(calls) == 1
+        assert all(result["value"].tolist() == [1, 2, 3] for result in results)
+        assert len({id(result) for result in results}) == 4
+        stats = flight.stats()["label"]
+        assert stats["calls"] == 4
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 3
+        assert stats["max_concurrency"] == 4
+        assert stats["wait_seconds"] > 0
+        assert flight.in_flight() == 0
+
+    def test_leader_changes_result_while_followers_wait(self, monkeypatch):
+        flight = SingleFlight()
+        leader = []
+        changed = threading.Event()
+        # pylint: disable-next=protected-access
+        share = SingleFlight._share
+
+        def compute():
+            leader.append(threading.get_ident())
+            deadline = time.perf_counter() + 5
+            while (
+                flight.stats()["label"]["coalesced"] < 2
+                and time.perf_counter() < deadline
+            ):
+                time.sleep(0.01)
+            return pd.DataFrame({"value": [1, 2, 3]})
+
+        def share_after_leader_changed_result(result):
+            if threading.get_ident() != leader[0]:
+                changed.wait(timeout=5)
+            return share(result)
+
+        monkeypatch.setattr(flight, "_share", share_after_leader_changed_result)
+        results = {}
+        started = threading.Barrier(3)
+
+        def call(index: int):
+            started.wait()
+            result = flight.do("key", compute, "label")
+            if threading.get_ident() == leader[0]:
+                result["value"] = 0
+                changed.set()
+            results[index] = result
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        values = sorted(result["value"].tolist() for result in results.values())
+        assert values == [[0, 0, 0], [1, 2, 3], [1, 2, 3]]
+
+    def test_sequential_calls_are_computed(self):
+        flight = SingleFlight()
+        assert flight.do("key", lambda: 1) == 1
+        assert flight.do("key", lambda: 2) == 2
+        stats = flight.stats()["key"]
+        assert stats["executions"] == 2
+        assert stats["coalesced"] == 0
+
+    def test_exception_is_raised_to_coalesced_calls(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def compute():
+            release.wait(timeout=5)
+            raise ValueError("failed")
+
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+        results = self._call_concurrently(flight, "key", compute, 3)
+        timer.join()
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.in_flight() == 0
+        with pytest.raises(ValueError):
+            flight.do("key", compute)
+
+    def test_statistics_are_bounded(self):
+        flight = SingleFlight(max_labels=2)
+        for key in ["a", "b", "c"]:
+            flight.do(key, lambda: None)
+        assert list(flight.stats().keys()) == ["b", "c"]
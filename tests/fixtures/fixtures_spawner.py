@@ -1,6 +1,8 @@
 import json
 import os
+import threading
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
@@ -661,6 +663,52 @@ def monkeypatched_smard_api(monkeypatch) -> object:
     return SmardApi()
 
 
+class SmardApiRequestHandler(BaseHTTPRequestHandler):
+    """Serves the mock SMARD data like the SMARD API and records the requested paths."""
+
+    data_directory = "data/spawner/mock_smard_api_data"
+    requested_paths: list[str] = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        filename = self.path.rsplit("/", 1)[-1]
+        if filename.startswith("index"):
+            filename = "index.json"
+        else:
+            filename = f"data_{filename.split('_')[-1]}"
+        self.requested_paths.append(self.path)
+        path = os.path.join(self.data_directory, filename)
+        if not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as file:
+            body = file.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+@pytest.fixture
+def smard_api_server(monkeypatch) -> list[str]:
+    requested_paths = []
+    monkeypatch.setattr(SmardApiRequestHandler, "requested_paths", requested_paths)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SmardApiRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        SmardApi, "BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/chart_data"
+    )
+    monkeypatch.setattr(SmardApi, "_session", None)
+    monkeypatch.setattr(SmardApi, "_indices_updated_at", None)
+    yield requested_paths
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.fixture
 def demand_strategy(
     monkeypatch,
@@ -735,18 +783,23 @@ def mock_train_spawner() -> object:
         timetable: list[str]
         train_type: str
         spawn_history: list[int]
-        _next_spawn_fails: bool
+        attempt_history: list[int]
+        _failing_spawns: int
 
         def __init__(self):
-            self._next_spawn_fails = False
+            self._failing_spawns = 0
             self.spawn_history = []
+            self.attempt_history = []
 
         def spawn_train(
             self, identifier: str, timetable: list[str], train_type: str
         ) -> bool:
             ticks_per_second = int(1.0 / float(os.environ["TICK_LENGTH"]))
-            if self._next_spawn_fails:
-                self._next_spawn_fails = False
+            self.attempt_history.append(
+                int(identifier.split("_")[1]) // ticks_per_second
+            )
+            if self._failing_spawns > 0:
+                self._failing_spawns -= 1
                 return False
             self.spawn_history.append(int(identifier.split("_")[1]) // ticks_per_second)
             self.identifier = identifier
@@ -754,8 +807,11 @@ def mock_train_spawner() -> object:
             self.train_type = train_type
             return True
 
-        def let_next_spawn_fail(self):
-            self._next_spawn_fails = True
+        def let_next_spawn_fail(self, count: int = 1):
+            self._failing_spawns = count
+
+        def start_track_id(self, timetable: list[str]) -> str:
+            return timetable[0]
 
     return MockTrainSpawner()
 
@@ -123,6 +123,32 @@ class TestRunImplementor:
     # Test skipped, because the fixtures of celery aren't working properly
     # That's why we have to use the real celery app instead and cannot mock the components
     @pytest.mark.skip(reason="Celery fixtures not working properly")
+    def test_backfill_finished_runs(self, empty_simulation_configuration, monkeypatch):
+        running_run = Run.create(
+            simulation_configuration=empty_simulation_configuration,
+            process_id=uuid.UUID("00000000-0000-0000-0000-000000000001"),
+        )
+        stopped_run = Run.create(
+            simulation_configuration=empty_simulation_configuration,
+            process_id=uuid.UUID("00000000-0000-0000-0000-000000000002"),
+        )
+        monkeypatch.setattr(
+            Communicator,
+            "state",
+            lambda process_id: "PROGRESS"
+            if process_id == str(running_run.process_id)
+            else "REVOKED",
+        )
+        run_without_process = Run.create(
+            simulation_configuration=empty_simulation_configuration
+        )
+
+        assert impl.run.backfill_finished_runs() == 2
+        assert Run.get_by_id(running_run.id).finished_at is None
+        assert Run.get_by_id(stopped_run.id).finished_at is not None
+        assert Run.get_by_id(run_without_process.id).finished_at is not None
+        assert impl.run.backfill_finished_runs() == 0
+
     def test_get_run(self, token, empty_simulation_configuration, monkeypatch):
         monkeypatch.setattr(
             "src.interlocking_component.route_controller.RouteController.next_tick",
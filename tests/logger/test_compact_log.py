@@ -0,0 +1,123 @@
+from src.event_bus.event import Event, EventType
+from src.event_bus.event_bus import EventBus
+from src.implementor.models import Run
+from src.logger.compact_log import CompactLogEvent, CompactLogWriter, TrainDictionary
+from src.logger.compact_log_collector import CompactLogCollector
+from src.logger.logger import CompactLogger, Logger
+from src.logger.run_log_collector import RunLogCollector
+from tests.decorators import recreate_db_setup
+
+
+class TestCompactLog:
+    """Tests for the compact storage layout of the logs."""
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    def test_intern_once(self, run, train_id):
+        writer = CompactLogWriter(run.id)
+        first = writer.intern(TrainDictionary, train_id)
+        second = CompactLogWriter(run.id).intern(TrainDictionary, train_id)
+        assert first == second
+        assert TrainDictionary.select().count() == 1
+
+    def test_spawn_train(self, run, tick, train_id, event_bus):
+        logger = CompactLogger(event_bus=event_bus)
+        logger.spawn_train(
+            Event(EventType.TRAIN_SPAWN, {"tick": tick, "train_id": train_id})
+        )
+        event = CompactLogEvent.select().first()
+        assert event.run_id.id == run.id
+        assert event.tick == tick
+        assert EventType(event.event_type) == EventType.TRAIN_SPAWN
+        assert event.train.name == train_id
+        assert event.message == f"Train with ID {train_id} spawned"
+
+    def test_set_signal(self, tick, signal_id, state_before, state_after, event_bus):
+        logger = CompactLogger(event_bus=event_bus)
+        logger.set_signal(
+            Event(
+                EventType.SET_SIGNAL,
+                {
+                    "tick": tick,
+                    "signal_id": signal_id,
+                    "state_before": state_before,
+                    "state_after": state_after,
+                },
+            )
+        )
+        event = CompactLogEvent.select().first()
+        assert event.signal.name == signal_id
+        assert (
+            event.message
+            == f"Signal with ID {signal_id} changed from {state_before} to {state_after}"
+        )
+
+    def test_compact_logger_records_dimensions(
+        self, run, train_id, station_id, event_bus
+    ):
+        CompactLogger(event_bus=event_bus)
+        event_bus.arrival_train(2, train_id, station_id)
+        collector = CompactLogCollector()
+        assert collector.get_trains(run_id=run.id) == [train_id]
+        assert collector.get_stations(run_id=run.id) == [station_id]
+
+    def test_collector_departures_arrivals(
+        self, run, train_id, station_id, edge_id, edge_length, event_bus
+    ):
+        logger = CompactLogger(event_bus=event_bus)
+        arguments = {"train_id": train_id, "station_id": station_id}
+        logger.arrival_train(Event(EventType.TRAIN_ARRIVAL, {"tick": 2, **arguments}))
+        logger.departure_train(
+            Event(EventType.TRAIN_DEPARTURE, {"tick": 5, **arguments})
+        )
+        arguments = {"train_id": train_id, "edge_id": edge_id}
+        logger.train_enter_edge(
+            Event(
+                EventType.TRAIN_ENTER_EDGE,
+                {"tick": 1, "edge_length": edge_length, **arguments},
+            )
+        )
+        logger.train_leave_edge(
+            Event(EventType.TRAIN_LEAVE_EDGE, {"tick": 7, **arguments})
+        )
+
+        collector = CompactLogCollector()
+        departures_arrivals = collector.get_departures_arrivals_of_train(
+            run.id, train_id
+        )
+        assert departures_arrivals.arrival_tick.tolist() == [2]
+        assert departures_arrivals.departure_tick.tolist() == [5]
+        assert departures_arrivals.station_id.tolist() == [station_id]
+        edge_times = collector.get_edge_times_of_train(run.id, train_id)
+        assert edge_times.enter_tick.tolist() == [1]
+        assert edge_times.leave_tick.tolist() == [7]
+        assert edge_times.edge_length.tolist() == [edge_length]
+
+    def test_run_log_collector_reads_layout_of_run(
+        self, run, run2, train_id, station_id, monkeypatch
+    ):
+        monkeypatch.setenv("COMPACT_LOGGING", "1")
+        Run.update(compact_log=True).where(Run.id == run.id).execute()
+        compact_event_bus = EventBus(run_id=run.id)
+        CompactLogger(event_bus=compact_event_bus)
+        event_bus = EventBus(run_id=run2.id)
+        Logger(event_bus=event_bus)
+        for bus in [compact_event_bus, event_bus]:
+            bus.arrival_train(2, train_id, station_id)
+            bus.departure_train(5, train_id, station_id)
+
+        # the runs are read in their layout whatever the current flag is
+        monkeypatch.delenv("COMPACT_LOGGING")
+        collector = RunLogCollector()
+        departures_arrivals = collector.get_departures_arrivals_of_runs(
+            [run.id, run2.id]
+        )
+        assert sorted(departures_arrivals.run_id.tolist()) == sorted([run.id, run2.id])
+        assert departures_arrivals.arrival_tick.tolist() == [2, 2]
+        assert departures_arrivals.departure_tick.tolist() == [5, 5]
+        for run_id in [run.id, run2.id]:
+            chunks = list(collector.iter_departures_arrivals_of_runs([run_id]))
+            assert len(chunks) == 1
+            assert chunks[0].station_id.tolist() == [station_id]
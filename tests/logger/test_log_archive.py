@@ -0,0 +1,107 @@
+import os
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+from src.implementor.models import Run
+from src.logger.archive_log_collector import ArchiveLogCollector
+from src.logger.log_archive import export_run_logs, read_archive
+from src.logger.log_entry import (
+    TrainArrivalLogEntry,
+    TrainEnterEdgeLogEntry,
+    TrainLeaveEdgeLogEntry,
+)
+from tests.decorators import recreate_db_setup
+from tests.logger.test_log_collector import TestLogCollector
+
+
+class TestLogArchive:
+    """Tests for the archive of finished runs."""
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    @pytest.fixture
+    def archive_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("LOG_ARCHIVE_PATH", str(tmp_path))
+        return tmp_path
+
+    @pytest.fixture
+    def archived_event_bus(self, archive_directory, event_bus):
+        # pylint: disable=unused-argument
+        TestLogCollector.setup_departure_arrival_1(event_bus)
+        TestLogCollector.setup_departure_arrival_4(event_bus)
+        TestLogCollector.setup_enter_leave_edge_1(event_bus)
+        TestLogCollector.setup_enter_leave_edge_4(event_bus)
+        TestLogCollector.setup_logs_spawn_trains(event_bus)
+        export_run_logs(event_bus.run_id)
+        return event_bus
+
+    def test_export_records_archive_path(self, archive_directory, event_bus):
+        archive_path = export_run_logs(event_bus.run_id)
+        assert archive_path == os.path.join(archive_directory, str(event_bus.run_id))
+        assert Run.get_by_id(event_bus.run_id).archive_path == archive_path
+        assert os.path.exists(
+            os.path.join(
+                archive_path, f"{TrainArrivalLogEntry._meta.table_name}.parquet"
+            )
+        )
+
+    def test_read_archive_prunes_columns(self, archived_event_bus):
+        archive_path = Run.get_by_id(archived_event_bus.run_id).archive_path
+        arrivals = read_archive(
+            archive_path,
+            TrainArrivalLogEntry,
+            ["tick", "station_id"],
+            filters=[("train_id", "==", "ice_1_passenger")],
+        )
+        assert list(arrivals.columns) == ["tick", "station_id"]
+        assert sorted(arrivals.station_id) == ["station_1", "station_2", "station_3"]
+
+    def test_collector_matches_database(self, archived_event_bus, log_collector):
+        run_id = archived_event_bus.run_id
+        archive_log_collector = ArchiveLogCollector()
+        assert_frame_equal(
+            archive_log_collector.get_departures_arrivals_all_trains(run_id),
+            log_collector.get_departures_arrivals_all_trains(run_id),
+        )
+        assert_frame_equal(
+            archive_log_collector.get_edge_times_all_trains(run_id),
+            log_collector.get_edge_times_all_trains(run_id),
+        )
+        assert_frame_equal(
+            archive_log_collector.get_train_spawn_times(run_id),
+            log_collector.get_train_spawn_times(run_id),
+        )
+
+    def test_collector_of_runs_matches_database(
+        self, archived_event_bus, event_bus2, log_collector
+    ):
+        TestLogCollector.setup_departure_arrival_1(event_bus2)
+        TestLogCollector.setup_enter_leave_edge_1(event_bus2)
+        run_ids = [archived_event_bus.run_id, event_bus2.run_id]
+        archive_log_collector = ArchiveLogCollector()
+        assert_frame_equal(
+            archive_log_collector.get_departures_arrivals_of_runs(run_ids),
+            log_collector.get_departures_arrivals_of_runs(run_ids),
+        )
+        assert_frame_equal(
+            archive_log_collector.get_edge_times_of_runs(run_ids),
+            log_collector.get_edge_times_of_runs(run_ids),
+        )
+
+    def test_collector_reads_archive_once_per_table(
+        self, archived_event_bus, monkeypatch
+    ):
+        read_tables = []
+
+        def counting_read_archive(archive_path, model, columns, filters=None):
+            read_tables.append(model)
+            return read_archive(archive_path, model, columns, filters)
+
+        monkeypatch.setattr(
+            "src.logger.archive_log_collector.read_archive", counting_read_archive
+        )
+        ArchiveLogCollector().get_edge_times_of_runs([archived_event_bus.run_id])
+        assert read_tables == [TrainEnterEdgeLogEntry, TrainLeaveEdgeLogEntry]
@@ -7,6 +7,7 @@ from pandas.testing import assert_frame_equal
 from src.event_bus.event_bus import EventBus
 from src.implementor.models import Run
 from src.logger.log_collector import LogCollector
+from src.logger.log_entry import TrainEnterEdgeLogEntry
 from tests.decorators import recreate_db_setup
 
 
@@ -871,6 +872,106 @@ class TestLogCollector:
             _departure_arrival_all_df,
         )
 
+    def test_departure_arrival_of_runs(
+        self,
+        event_bus: EventBus,
+        event_bus2: EventBus,
+        log_collector: LogCollector,
+        _departure_arrival_all_df,
+    ):
+        self.setup_departure_arrival_1(event_bus)
+        self.setup_departure_arrival_2(event_bus)
+        self.setup_departure_arrival_3(event_bus)
+        self.setup_departure_arrival_4(event_bus)
+        self.setup_departure_arrival_1(event_bus2)
+        self.setup_departure_arrival_2(event_bus2)
+        self.setup_departure_arrival_3(event_bus2)
+        self.setup_departure_arrival_4(event_bus2)
+
+        departures_arrivals_df = log_collector.get_departures_arrivals_of_runs(
+            [event_bus.run_id, event_bus2.run_id]
+        )
+        for run_id in [event_bus.run_id, event_bus2.run_id]:
+            run_df = departures_arrivals_df[
+                departures_arrivals_df["run_id"] == run_id
+            ].drop(columns="run_id")
+            assert_frame_equal(run_df.reset_index(drop=True), _departure_arrival_all_df)
+
+    def test_iter_departures_arrivals_of_runs(
+        self, event_bus: EventBus, event_bus2: EventBus, log_collector: LogCollector
+    ):
+        self.setup_departure_arrival_1(event_bus)
+        self.setup_departure_arrival_2(event_bus)
+        self.setup_departure_arrival_1(event_bus2)
+        run_ids = [event_bus.run_id, event_bus2.run_id]
+
+        chunks = list(log_collector.iter_departures_arrivals_of_runs(run_ids, 2))
+        assert all(len(chunk) <= 2 for chunk in chunks)
+        assert_frame_equal(
+            pd.concat(chunks, ignore_index=True)
+            .sort_values(["run_id", "train_id", "departure_tick"])
+            .reset_index(drop=True),
+            log_collector.get_departures_arrivals_of_runs(run_ids),
+        )
+
+    def test_iter_edge_times_of_runs(
+        self, event_bus: EventBus, log_collector: LogCollector
+    ):
+        self.setup_enter_leave_edge_1(event_bus)
+        self.setup_enter_leave_edge_4(event_bus)
+
+        chunks = list(log_collector.iter_edge_times_of_runs([event_bus.run_id], 3))
+        assert all(len(chunk) <= 3 for chunk in chunks)
+        assert_frame_equal(
+            pd.concat(chunks, ignore_index=True)
+            .sort_values(["run_id", "train_id", "leave_tick"])
+            .reset_index(drop=True),
+            log_collector.get_edge_times_of_runs([event_bus.run_id]),
+        )
+
+    def test_abandoned_iter_closes_cursor(
+        self, event_bus: EventBus, event_bus2: EventBus, log_collector: LogCollector
+    ):
+        self.setup_enter_leave_edge_1(event_bus)
+        self.setup_enter_leave_edge_4(event_bus)
+        self.setup_enter_leave_edge_1(event_bus2)
+        database = TrainEnterEdgeLogEntry._meta.database
+
+        first_chunks = log_collector.iter_edge_times_of_runs([event_bus.run_id], 1)
+        second_chunks = log_collector.iter_edge_times_of_runs([event_bus2.run_id], 1)
+        assert len(next(first_chunks)) == 1
+        second_chunk_list = [next(second_chunks)]
+        assert len(next(first_chunks)) == 1
+        first_chunks.close()
+        second_chunk_list += list(second_chunks)
+
+        assert database.transaction_depth() == 0
+        open_cursors = database.execute_sql(
+            "SELECT COUNT(*) FROM pg_cursors WHERE name LIKE %s", ["log_stream_%"]
+        ).fetchone()[0]
+        assert open_cursors == 0
+        assert_frame_equal(
+            pd.concat(second_chunk_list, ignore_index=True)
+            .sort_values(["run_id", "train_id", "leave_tick"])
+            .reset_index(drop=True),
+            log_collector.get_edge_times_of_runs([event_bus2.run_id]),
+        )
+
+    def test_departure_arrival_all_matches_per_train(
+        self, event_bus: EventBus, log_collector: LogCollector
+    ):
+        self.setup_departure_arrival_1_alt(event_bus)
+        self.setup_departure_arrival_2_alt(event_bus)
+        self.setup_departure_arrival_3_alt(event_bus)
+        self.setup_departure_arrival_4_alt(event_bus)
+        # pylint: disable=protected-access
+        assert_frame_equal(
+            log_collector.get_departures_arrivals_all_trains(event_bus.run_id),
+            log_collector._get_departures_arrivals_all_trains_per_train(
+                event_bus.run_id
+            ),
+        )
+
     def test_enter_leave_edge_all(
         self, _enter_leave_edge_all_df, event_bus, log_collector: LogCollector
     ):
@@ -883,6 +984,40 @@ class TestLogCollector:
             _enter_leave_edge_all_df,
         )
 
+    def test_enter_leave_edge_of_runs(
+        self,
+        _enter_leave_edge_all_df,
+        event_bus: EventBus,
+        event_bus2: EventBus,
+        log_collector: LogCollector,
+    ):
+        for bus in [event_bus, event_bus2]:
+            self.setup_enter_leave_edge_1(bus)
+            self.setup_enter_leave_edge_2(bus)
+            self.setup_enter_leave_edge_3(bus)
+            self.setup_enter_leave_edge_4(bus)
+        edge_times_df = log_collector.get_edge_times_of_runs(
+            [event_bus.run_id, event_bus2.run_id]
+        )
+        for run_id in [event_bus.run_id, event_bus2.run_id]:
+            run_df = edge_times_df[edge_times_df["run_id"] == run_id].drop(
+                columns="run_id"
+            )
+            assert_frame_equal(run_df.reset_index(drop=True), _enter_leave_edge_all_df)
+
+    def test_enter_leave_edge_all_matches_per_train(
+        self, event_bus: EventBus, log_collector: LogCollector
+    ):
+        self.setup_enter_leave_edge_1(event_bus)
+        self.setup_enter_leave_edge_2(event_bus)
+        self.setup_enter_leave_edge_3(event_bus)
+        self.setup_enter_leave_edge_4(event_bus)
+        # pylint: disable=protected-access
+        assert_frame_equal(
+            log_collector.get_edge_times_all_trains(event_bus.run_id),
+            log_collector._get_edge_times_all_trains_per_train(event_bus.run_id),
+        )
+
     def test_get_train_spawn_times(
         self,
         train_spawn_times_df: pd.DataFrame,
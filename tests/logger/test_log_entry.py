@@ -6,6 +6,7 @@ import pytest
 from marshmallow import ValidationError
 from peewee import IntegrityError
 
+from src.base_model import db
 from src.fault_injector.fault_configurations.platform_blocked_fault_configuration import (
     PlatformBlockedFaultConfiguration,
 )
@@ -38,6 +39,8 @@ from src.logger.log_entry import (
     TrainLeaveEdgeLogEntry,
     TrainRemoveLogEntry,
     TrainSpawnLogEntry,
+    create_log_partitions,
+    drop_log_partitions,
 )
 from tests.decorators import recreate_db_setup
 
@@ -838,3 +841,36 @@ class TestLogEntry:
             """Test that Remove Fault Log Entry cannot be created with no fields set."""
             with pytest.raises(IntegrityError):
                 ResolveFaultLogEntry.create(**empty_resolve_fault_log_entry_as_dict)
+
+    class TestLogPartitions:
+        """Tests for the partitioning of the log tables by run."""
+
+        @recreate_db_setup
+        def setup_method(self):
+            pass
+
+        def test_create_partitions(self, run):
+            """Test that every log table gets a partition for the run."""
+            create_log_partitions(run.id)
+            for model in [TrainSpawnLogEntry, TrainEnterEdgeLogEntry, LogEntry]:
+                assert db.table_exists(model.partition_name(run.id))
+
+        def test_drop_partitions(self, run, run2, tick, message, train_id):
+            """Test that dropping the partitions of a run only removes its logs."""
+            create_log_partitions(run.id)
+            for run_id in [run.id, run2.id]:
+                TrainSpawnLogEntry.create(
+                    tick=tick, message=message, run_id=run_id, train_id=train_id
+                )
+            drop_log_partitions(run.id)
+            assert not db.table_exists(TrainSpawnLogEntry.partition_name(run.id))
+            assert (
+                not TrainSpawnLogEntry.select()
+                .where(TrainSpawnLogEntry.run_id == run.id)
+                .exists()
+            )
+            assert (
+                TrainSpawnLogEntry.select()
+                .where(TrainSpawnLogEntry.run_id == run2.id)
+                .exists()
+            )
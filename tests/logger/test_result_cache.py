@@ -0,0 +1,166 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from src.implementor.models import Run
+from src.logger.logger import Logger
+from src.logger.result_cache import MULTI_CONFIG, ResultCache
+from tests.decorators import recreate_db_setup
+
+
+class TestResultCache:
+    """Tests for the cache of results of finished runs."""
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    @pytest.fixture
+    def finished_run(self, run):
+        Run.update(finished_at=datetime.now()).where(Run.id == run.id).execute()
+        return run
+
+    @pytest.fixture
+    def result_df(self):
+        return pd.DataFrame({"tick": [1, 2, 3], "train_id": ["a", "b", "c"]})
+
+    def test_logger_finish_marks_run(self, run, event_bus):
+        Logger(event_bus=event_bus).finish()
+        assert Run.get_by_id(run.id).finished_at is not None
+
+    def test_run_in_progress_not_cached(self, run, result_df):
+        cache = ResultCache(1024 * 1024)
+        compute = Mock(return_value=result_df)
+        cache.get_or_compute("function", run.id, (), compute)
+        cache.get_or_compute("function", run.id, (), compute)
+        assert compute.call_count == 2
+        assert cache.stats()["entries"] == 0
+
+    def test_run_in_progress_keeps_entries(self, run, result_df, tmp_path):
+        cache = ResultCache(1024 * 1024, str(tmp_path))
+        cache.put(("other_function", str(run.id), ()), result_df)
+        cache.get_or_compute("function", run.id, (), Mock(return_value=result_df))
+        assert cache.stats()["entries"] == 1
+        assert (tmp_path / str(run.id)).exists()
+
+    def test_finished_run_cached(self, finished_run, result_df):
+        cache = ResultCache(1024 * 1024)
+        compute = Mock(return_value=result_df)
+        first = cache.get_or_compute("function", finished_run.id, (), compute)
+        first["tick"] = 0
+        second = cache.get_or_compute("function", finished_run.id, (), compute)
+        assert compute.call_count == 1
+        assert second.tick.tolist() == [1, 2, 3]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        cache.get_or_compute("function", finished_run.id, (1,), compute)
+        assert compute.call_count == 2
+
+    def test_lru_bounded_by_bytes(self, finished_run, result_df):
+        size = int(result_df.memory_usage(deep=True).sum())
+        cache = ResultCache(size * 2)
+        for params in [(1,), (2,), (3,)]:
+            cache.get_or_compute(
+                "function", finished_run.id, params, Mock(return_value=result_df)
+            )
+        stats = cache.stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+        assert stats["bytes"] <= size * 2
+        assert cache.get(("function", str(finished_run.id), (1,))) is None
+
+    def test_disk_tier(self, finished_run, result_df, tmp_path):
+        ResultCache(1024 * 1024, str(tmp_path)).get_or_compute(
+            "function", finished_run.id, (), Mock(return_value=result_df)
+        )
+        cache = ResultCache(1024 * 1024, str(tmp_path))
+        compute = Mock(return_value=result_df)
+        assert_frame_equal(
+            cache.get_or_compute("function", finished_run.id, (), compute), result_df
+        )
+        assert not compute.called
+        assert cache.stats()["disk_hits"] == 1
+
+    def test_invalidate_run(self, finished_run, result_df, tmp_path):
+        cache = ResultCache(1024 * 1024, str(tmp_path))
+        compute = Mock(return_value=result_df)
+        cache.get_or_compute("function", finished_run.id, (), compute)
+        cache.invalidate_run(finished_run.id)
+        cache.get_or_compute("function", finished_run.id, (), compute)
+        assert compute.call_count == 2
+
+    def test_config_cached_while_runs_finished(
+        self, simulation_configuration, finished_run, run2, result_df
+    ):
+        cache = ResultCache(1024 * 1024)
+        compute = Mock(return_value=result_df)
+        cache.get_or_compute_by_config(
+            "function", simulation_configuration.id, (), compute
+        )
+        assert cache.stats()["entries"] == 0
+
+        Run.update(finished_at=datetime.now()).where(Run.id == run2.id).execute()
+        cache.get_or_compute_by_config(
+            "function", simulation_configuration.id, (), compute
+        )
+        cache.get_or_compute_by_config(
+            "function", simulation_configuration.id, (), compute
+        )
+        assert compute.call_count == 2
+        assert cache.stats()["hits"] == 1
+
+        Run.create(
+            simulation_configuration=simulation_configuration.id,
+            finished_at=datetime.now(),
+        )
+        cache.get_or_compute_by_config(
+            "function", simulation_configuration.id, (), compute
+        )
+        assert compute.call_count == 3
+
+    def test_multi_config_cached_by_sorted_ids(
+        self,
+        simulation_configuration,
+        simulation_configuration2,
+        finished_run,
+        result_df,
+    ):
+        cache = ResultCache(1024 * 1024)
+        compute = Mock(return_value=result_df)
+        config_ids = [simulation_configuration.id, simulation_configuration2.id]
+        cache.get_or_compute_by_multi_config("function", config_ids, (), compute)
+        cache.get_or_compute_by_multi_config(
+            "function", list(reversed(config_ids)), (), compute
+        )
+        assert compute.call_count == 1
+
+        run = Run.create(simulation_configuration=simulation_configuration2.id)
+        cache.get_or_compute_by_multi_config("function", config_ids, (), compute)
+        assert compute.call_count == 2
+        assert cache.stats()["entries"] == 1
+
+        Run.update(finished_at=datetime.now()).where(Run.id == run.id).execute()
+        cache.get_or_compute_by_multi_config("function", config_ids, (), compute)
+        assert compute.call_count == 3
+
+    def test_invalidate_config_removes_stale_files(
+        self, simulation_configuration, finished_run, result_df, tmp_path
+    ):
+        cache = ResultCache(1024 * 1024, str(tmp_path))
+        compute = Mock(return_value=result_df)
+        cache.get_or_compute_by_config(
+            "function", simulation_configuration.id, (), compute
+        )
+        cache.get_or_compute_by_multi_config(
+            "function", [simulation_configuration.id], (), compute
+        )
+        assert (tmp_path / str(simulation_configuration.id)).exists()
+        assert (tmp_path / MULTI_CONFIG).exists()
+
+        cache.invalidate_config(simulation_configuration.id)
+        assert not (tmp_path / str(simulation_configuration.id)).exists()
+        assert not (tmp_path / MULTI_CONFIG).exists()
+        assert cache.stats()["entries"] == 0
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from src.logger.log_collector import LogCollector
+from src.logger.log_entry import TrainArrivalLogEntry, TrainEnterEdgeLogEntry
+from src.logger.run_dimension import RunStation, RunTrain, backfill_run_dimensions
+from tests.decorators import recreate_db_setup
+from tests.logger.test_log_collector import TestLogCollector
+
+
+class TestRunDimension:
+    """Tests for the dimension tables of trains and stations per run."""
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    def test_logger_records_once(self, run, event_bus):
+        TestLogCollector.setup_departure_arrival_1(event_bus)
+        assert RunTrain.select().count() == 1
+        assert RunStation.select().count() == 3
+        assert RunTrain.names(run_id=run.id) == ["ice_1_passenger"]
+
+    def test_scoped_to_run(
+        self, run, run2, event_bus, event_bus2, log_collector: LogCollector
+    ):
+        TestLogCollector.setup_departure_arrival_1(event_bus)
+        TestLogCollector.setup_departure_arrival_2(event_bus2)
+        assert log_collector.get_trains(run_id=run.id) == ["ice_1_passenger"]
+        assert log_collector.get_trains(run_id=run2.id) == ["ice_2_passenger"]
+        assert sorted(
+            log_collector.get_trains(config_id=run.simulation_configuration)
+        ) == ["ice_1_passenger", "ice_2_passenger"]
+
+    def test_backfill(self, run):
+        TrainArrivalLogEntry.create(
+            timestamp=datetime.now(),
+            tick=1,
+            message="",
+            run_id=run.id,
+            train_id="ice_1_passenger",
+            station_id="station_1",
+        )
+        TrainEnterEdgeLogEntry.create(
+            timestamp=datetime.now(),
+            tick=2,
+            message="",
+            run_id=run.id,
+            train_id="ice_2_passenger",
+            edge_id="edge_1",
+            edge_length=100,
+        )
+        backfill_run_dimensions(run.id)
+        backfill_run_dimensions(run.id)
+        assert sorted(RunTrain.names()) == ["ice_1_passenger", "ice_2_passenger"]
+        assert RunStation.names() == ["station_1"]
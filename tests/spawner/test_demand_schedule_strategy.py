@@ -22,3 +22,10 @@ class TestDemandScheduleStrategy:
         for seconds in range(0, demand_strategy.end_time * 2):
             if demand_strategy.should_spawn(seconds):
                 assert seconds in demand_strategy_spawn_seconds
+
+    def test_spawn_calendar(self, demand_strategy: DemandScheduleStrategy):
+        assert list(demand_strategy.spawn_calendar()) == [
+            seconds
+            for seconds in range(0, demand_strategy.end_time * 2)
+            if demand_strategy.should_spawn(seconds)
+        ]
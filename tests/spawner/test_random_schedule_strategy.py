@@ -1,3 +1,7 @@
+import numpy as np
+import pytest
+from scipy import stats
+
 from src.schedule.random_schedule_strategy import RandomScheduleStrategy
 from tests.decorators import recreate_db_setup
 
@@ -18,3 +22,94 @@ class TestRandomScheduleStrategy:
         for seconds in range(0, strategy_end_time * 2):
             if random_strategy.should_spawn(seconds):
                 assert seconds in random_strategy_spawn_seconds
+
+    def test_spawn_calendar(
+        self,
+        random_strategy: RandomScheduleStrategy,
+        random_strategy_spawn_seconds: list[int],
+    ):
+        assert list(random_strategy.spawn_calendar()) == random_strategy_spawn_seconds
+        assert list(random_strategy.spawn_calendar()) == random_strategy_spawn_seconds
+
+
+class TestSampledArrivalProcesses:
+    """Test the arrival processes of the random schedule strategy that sample the spawn
+    seconds at once"""
+
+    SPAWN_RATE = 10.0  # trains per 1000 seconds
+    DURATION = 50_000
+    SEEDS = range(20)
+
+    def _spawn_seconds(self, arrival_process: str, seed: int) -> np.ndarray:
+        strategy = RandomScheduleStrategy(
+            0, self.DURATION - 1, self.SPAWN_RATE, seed, arrival_process
+        )
+        return np.array(list(strategy.spawn_calendar()))
+
+    @pytest.mark.parametrize("arrival_process", ["bernoulli", "poisson"])
+    def test_reproducible(self, arrival_process: str):
+        first = self._spawn_seconds(arrival_process, 42)
+        second = self._spawn_seconds(arrival_process, 42)
+        assert len(first) > 0
+        assert first.tolist() == second.tolist()
+        assert first.tolist() != self._spawn_seconds(arrival_process, 43).tolist()
+
+    @pytest.mark.parametrize("arrival_process", ["bernoulli", "poisson"])
+    def test_sorted_unique_in_time_range(self, arrival_process: str):
+        strategy = RandomScheduleStrategy(1000, 2000, 500.0, 42, arrival_process)
+        spawn_seconds = list(strategy.spawn_calendar())
+        assert spawn_seconds == sorted(set(spawn_seconds))
+        assert spawn_seconds[0] >= 1000
+        assert spawn_seconds[-1] <= 2000
+
+    @pytest.mark.parametrize("arrival_process", ["bernoulli", "poisson"])
+    def test_should_spawn_follows_calendar(self, arrival_process: str):
+        strategy = RandomScheduleStrategy(1000, 2000, 10.0, 42, arrival_process)
+        calendar = list(
+            RandomScheduleStrategy(
+                1000, 2000, 10.0, 42, arrival_process
+            ).spawn_calendar()
+        )
+        assert [
+            seconds for seconds in range(0, 4000) if strategy.should_spawn(seconds)
+        ] == calendar
+
+    @pytest.mark.parametrize("arrival_process", ["bernoulli", "poisson"])
+    def test_without_end_time(self, arrival_process: str):
+        strategy = RandomScheduleStrategy(0, None, 30.0, 42, arrival_process)
+        calendar = strategy.spawn_calendar()
+        spawn_seconds = [next(calendar) for _ in range(10_000)]
+        assert spawn_seconds == sorted(set(spawn_seconds))
+        assert spawn_seconds[-1] > RandomScheduleStrategy.SAMPLING_WINDOW
+
+    @pytest.mark.parametrize("arrival_process", ["bernoulli", "poisson"])
+    def test_statistically_equivalent(self, arrival_process: str):
+        sequential = [self._spawn_seconds("sequential", seed) for seed in self.SEEDS]
+        sampled = [self._spawn_seconds(arrival_process, seed) for seed in self.SEEDS]
+        expected_count = self.SPAWN_RATE * self.DURATION / 1000
+        assert np.mean([len(seconds) for seconds in sampled]) == pytest.approx(
+            expected_count, rel=0.05
+        )
+        assert (
+            stats.ttest_ind(
+                [len(seconds) for seconds in sequential],
+                [len(seconds) for seconds in sampled],
+            ).pvalue
+            > 0.01
+        )
+        assert (
+            stats.ks_2samp(
+                np.concatenate([np.diff(seconds) for seconds in sequential]),
+                np.concatenate([np.diff(seconds) for seconds in sampled]),
+            ).pvalue
+            > 0.01
+        )
+
+    def test_no_spawns_without_rate(self):
+        for arrival_process in RandomScheduleStrategy.ARRIVAL_PROCESSES:
+            strategy = RandomScheduleStrategy(0, 1000, 0.0, 42, arrival_process)
+            assert not list(strategy.spawn_calendar())
+
+    def test_unknown_arrival_process(self):
+        with pytest.raises(ValueError):
+            RandomScheduleStrategy(0, 1000, 10.0, 42, "uniform")
@@ -48,3 +48,12 @@ class TestRegularScheduleStrategy:
         seconds: int,
     ):
         assert not regular_strategy.should_spawn(seconds=seconds)
+
+    def test_spawn_calendar(
+        self, regular_strategy: RegularScheduleStrategy, strategy_end_time: int
+    ):
+        assert list(regular_strategy.spawn_calendar()) == [
+            seconds
+            for seconds in range(0, strategy_end_time * 2)
+            if regular_strategy.should_spawn(seconds)
+        ]
@@ -2,9 +2,11 @@ from datetime import datetime
 
 import peewee
 import pytest
+import requests
 
-from src.schedule.smard_api import SmardApiEntry, SmardApiIndex
+from src.schedule.smard_api import SmardApi, SmardApiEntry, SmardApiIndex
 from tests.decorators import recreate_db_setup
+from tests.fixtures.fixtures_spawner import SmardApiRequestHandler
 
 
 @pytest.mark.parametrize(
@@ -180,3 +182,113 @@ class TestSmardApi:
         start, end = demand_strategy_not_available_past_interval
         data = monkeypatched_smard_api.get_data(start, end)
         assert len(data) == 0
+
+    def test_repeated_requests_insert_once(
+        self,
+        monkeypatched_smard_api: object,
+        demand_strategy_available_interval: tuple[datetime, datetime],
+    ):
+        start, end = demand_strategy_available_interval
+        monkeypatched_smard_api.get_data(start, end)
+        index_count = SmardApiIndex.select().count()
+        entry_count = SmardApiEntry.select().count()
+        assert entry_count > 0
+
+        SmardApi._update_indices(monkeypatched_smard_api)
+        monkeypatched_smard_api.get_data(start, end)
+        assert SmardApiIndex.select().count() == index_count
+        assert SmardApiEntry.select().count() == entry_count
+
+    def test_request_data_updates_values(
+        self, monkeypatched_smard_api: object, monkeypatch
+    ):
+        index = SmardApiIndex.select().order_by(SmardApiIndex.timestamp.asc()).first()
+        timestamp = int(index.timestamp.timestamp() * 1000)
+
+        monkeypatch.setattr(
+            SmardApi, "_request", lambda _, url: {"series": [[timestamp, None]]}
+        )
+        SmardApi._request_data(monkeypatched_smard_api, index)
+        monkeypatch.setattr(
+            SmardApi, "_request", lambda _, url: {"series": [[timestamp, 42.0]]}
+        )
+        SmardApi._request_data(monkeypatched_smard_api, index)
+
+        entries = list(SmardApiEntry.select().where(SmardApiEntry.index_id == index))
+        assert len(entries) == 1
+        assert entries[0].value == 42.0
+        assert entries[0].timestamp == index.timestamp
+
+
+class TestSmardApiFetching:
+    """Test fetching the SMARD data over HTTP from a local stand-in server"""
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    @pytest.mark.parametrize("workers", ["1", "4"])
+    def test_fetch_batches(
+        self,
+        smard_api_server: list[str],
+        monkeypatch,
+        demand_strategy_available_interval: tuple[datetime, datetime],
+        workers: str,
+    ):
+        monkeypatch.setenv("SMARD_FETCH_WORKERS", workers)
+        start, end = demand_strategy_available_interval
+        availability = SmardApi().data_availability(start, end)
+        assert availability.available
+        assert not availability.interval_altered
+
+        data_paths = [path for path in smard_api_server if "index" not in path]
+        assert len(data_paths) > 1
+        assert len(data_paths) == len(set(data_paths))
+        assert SmardApiEntry.select().count() > 0
+        assert SmardApiEntry.select(SmardApiEntry.index_id).distinct().count() == len(
+            data_paths
+        )
+
+    def test_fetch_concurrently_like_sequentially(
+        self,
+        smard_api_server: list[str],
+        monkeypatch,
+        demand_strategy_available_interval: tuple[datetime, datetime],
+    ):
+        start, end = demand_strategy_available_interval
+        monkeypatch.setenv("SMARD_FETCH_WORKERS", "1")
+        sequential = [
+            (entry.timestamp, entry.value) for entry in SmardApi().get_data(start, end)
+        ]
+        SmardApiEntry.delete().execute()
+        monkeypatch.setenv("SMARD_FETCH_WORKERS", "4")
+        concurrent = [
+            (entry.timestamp, entry.value) for entry in SmardApi().get_data(start, end)
+        ]
+        assert len(concurrent) > 0
+        assert concurrent == sequential
+
+    def test_index_cached_within_ttl(self, smard_api_server: list[str], monkeypatch):
+        monkeypatch.setenv("SMARD_INDEX_TTL", "3600")
+        SmardApi()
+        SmardApi()
+        assert sum("index" in path for path in smard_api_server) == 1
+
+        monkeypatch.setenv("SMARD_INDEX_TTL", "0")
+        SmardApi()
+        assert sum("index" in path for path in smard_api_server) == 2
+
+    def test_index_requested_without_stored_indices(
+        self, smard_api_server: list[str], monkeypatch
+    ):
+        monkeypatch.setenv("SMARD_INDEX_TTL", "3600")
+        SmardApi()
+        SmardApiIndex.delete().execute()
+        SmardApi()
+        assert sum("index" in path for path in smard_api_server) == 2
+        assert SmardApiIndex.select().count() > 0
+
+    def test_missing_batch_raises(self, smard_api_server: list[str], monkeypatch):
+        monkeypatch.setattr(SmardApiRequestHandler, "data_directory", "data")
+        with pytest.raises(requests.HTTPError):
+            SmardApi()
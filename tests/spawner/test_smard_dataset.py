@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest
+
+from src.schedule.smard_api import SmardApi
+from src.schedule.smard_dataset import (
+    SmardDataset,
+    series_from_json_directory,
+    write_smard_dataset,
+)
+from tests.decorators import recreate_db_setup
+
+MOCK_DATA_DIRECTORY = "data/spawner/mock_smard_api_data"
+
+
+class TestSmardDataset:
+    """Test the packed SMARD dataset"""
+
+    @recreate_db_setup
+    def setup_method(self):
+        pass
+
+    @pytest.fixture
+    def dataset_path(self, tmp_path) -> str:
+        path = str(tmp_path / "smard.bin")
+        write_smard_dataset(path, series_from_json_directory(MOCK_DATA_DIRECTORY))
+        return path
+
+    @pytest.fixture
+    def dataset_smard_api(self, dataset_path: str, monkeypatch) -> SmardApi:
+        monkeypatch.setenv("SMARD_DATASET_PATH", dataset_path)
+
+        def _request_patch(_: object, url: str) -> dict:
+            raise AssertionError(f"Requested {url}")
+
+        monkeypatch.setattr(SmardApi, "_request", _request_patch)
+        return SmardApi()
+
+    def test_write_and_read(self, dataset_path: str):
+        series = series_from_json_directory(MOCK_DATA_DIRECTORY)
+        dataset = SmardDataset(dataset_path)
+        assert dataset.start == min(timestamp for timestamp, _ in series)
+        assert len(dataset.values) >= len(series)
+
+    @pytest.mark.parametrize(
+        "interval_fixture",
+        [
+            "demand_strategy_available_interval",
+            "demand_strategy_not_available_past_interval",
+            "demand_strategy_start_not_available_interval",
+            "demand_strategy_end_not_available_interval",
+            "demand_strategy_all_none_interval",
+        ],
+    )
+    def test_matches_smard_api(
+        self,
+        request,
+        interval_fixture: str,
+        monkeypatched_smard_api: SmardApi,
+        dataset_smard_api: SmardApi,
+    ):
+        start, end = request.getfixturevalue(interval_fixture)
+        expected = monkeypatched_smard_api.data_availability(start, end)
+        availability = dataset_smard_api.data_availability(start, end)
+        assert availability.available == expected.available
+        assert availability.start == expected.start
+        assert availability.end == expected.end
+
+        expected_data = monkeypatched_smard_api.get_data(start, end)
+        data = dataset_smard_api.get_data(start, end)
+        assert [entry.timestamp for entry in data] == [
+            entry.timestamp for entry in expected_data
+        ]
+        assert [entry.value for entry in data] == pytest.approx(
+            [entry.value for entry in expected_data], rel=1e-6
+        )
+
+    def test_negative_length_interval(self, dataset_smard_api: SmardApi):
+        availability = dataset_smard_api.data_availability(
+            datetime(2015, 1, 20), datetime(2015, 1, 19)
+        )
+        assert not availability.available
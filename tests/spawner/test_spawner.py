@@ -1,7 +1,9 @@
 import os
 from itertools import zip_longest
 
-from src.implementor.models import SimulationConfiguration
+from src.data_science.run_summary import RunSpawnRetrySummary
+from src.event_bus.event import Event, EventType
+from src.implementor.models import Run, SimulationConfiguration
 from src.schedule.random_schedule_strategy import RandomScheduleStrategy
 from src.schedule.regular_schedule_strategy import RegularScheduleStrategy
 from src.schedule.schedule_configuration import ScheduleConfiguration
@@ -91,6 +93,107 @@ class TestSpawner:
             )
         )
 
+    def test_next_tick_skips_seconds_without_spawns(
+        self,
+        spawner: Spawner,
+        monkeypatch,
+        strategy_start_time: int,
+        strategy_end_time: int,
+        regular_strategy_frequency: int,
+        random_strategy_spawn_seconds: list[int],
+    ):
+        # pylint: disable=protected-access
+        asked_seconds = []
+
+        def record_maybe_spawn(maybe_spawn):
+            def recorded_maybe_spawn(seconds: int, caller: Spawner):
+                asked_seconds.append(seconds)
+                maybe_spawn(seconds, caller)
+
+            return recorded_maybe_spawn
+
+        for schedule in spawner._schedules.values():
+            monkeypatch.setattr(
+                schedule, "maybe_spawn", record_maybe_spawn(schedule.maybe_spawn)
+            )
+        ticks_per_second = int(1 / float(os.environ["TICK_LENGTH"]))
+        for seconds in range(0, strategy_end_time * 2):
+            spawner.next_tick(seconds * ticks_per_second)
+        regular_spawn_seconds = list(
+            range(
+                strategy_start_time, strategy_end_time + 1, regular_strategy_frequency
+            )
+        )
+        assert sorted(asked_seconds) == sorted(
+            regular_spawn_seconds + random_strategy_spawn_seconds
+        )
+
+    def test_next_tick_retries_failed_spawns(
+        self,
+        spawner: Spawner,
+        mock_train_spawner: object,
+        strategy_start_time: int,
+    ):
+        ticks_per_second = int(1 / float(os.environ["TICK_LENGTH"]))
+        mock_train_spawner.let_next_spawn_fail()
+        spawner.next_tick(strategy_start_time * ticks_per_second)
+        assert not mock_train_spawner.spawn_history
+        spawner.next_tick((strategy_start_time + 1) * ticks_per_second)
+        assert mock_train_spawner.spawn_history == [strategy_start_time]
+
+    def test_train_leaving_start_track_wakes_retries(
+        self,
+        spawner: Spawner,
+        mock_train_spawner: object,
+        strategy_start_time: int,
+        platform_ids: list[str],
+        monkeypatch,
+    ):
+        monkeypatch.setenv("SPAWN_RETRY_INITIAL_BACKOFF", "10")
+        ticks_per_second = int(1 / float(os.environ["TICK_LENGTH"]))
+        mock_train_spawner.let_next_spawn_fail()
+        spawner.next_tick(strategy_start_time * ticks_per_second)
+        assert spawner.retry_statistics()["queued_spawns"] == 1
+
+        for edge_id in ["another_track", f"{platform_ids[0]}-re"]:
+            spawner.train_leave_edge(
+                Event(
+                    EventType.TRAIN_LEAVE_EDGE,
+                    {
+                        "tick": (strategy_start_time + 2) * ticks_per_second,
+                        "train_id": "train",
+                        "edge_id": edge_id,
+                        "edge_length": 100.0,
+                    },
+                )
+            )
+            spawner.next_tick((strategy_start_time + 2) * ticks_per_second)
+        assert mock_train_spawner.spawn_history == [strategy_start_time]
+        assert spawner.retry_statistics() == {
+            "queued_spawns": 0,
+            "max_queued_spawns": 1,
+            "failed_spawn_attempts": 1,
+            "early_wakeups": 1,
+        }
+
+    def test_finish_stores_retry_statistics(
+        self,
+        spawner: Spawner,
+        mock_train_spawner: object,
+        strategy_start_time: int,
+        run: Run,
+    ):
+        ticks_per_second = int(1 / float(os.environ["TICK_LENGTH"]))
+        mock_train_spawner.let_next_spawn_fail()
+        spawner.next_tick(strategy_start_time * ticks_per_second)
+        spawner.finish()
+        spawner.finish()
+
+        summary_df = RunSpawnRetrySummary.read([run.id])
+        assert len(summary_df) == 1
+        statistics = summary_df.drop(columns=["run_id"]).iloc[0].to_dict()
+        assert statistics == spawner.retry_statistics()
+
 
 class TestSpawnerConfiguration:
     """Tests for the SpawnerConfiguration"""
@@ -55,6 +55,49 @@ class TestTrainSchedule:
         )
         assert mock_train_spawner.spawn_history == [seconds1, seconds3, seconds2]
 
+    def test_retry_backoff(
+        self,
+        spawner: Spawner,
+        regular_train_schedule: TrainSchedule,
+        mock_train_spawner: object,
+        strategy_start_time: int,
+        monkeypatch,
+    ):
+        monkeypatch.setenv("SPAWN_RETRY_INITIAL_BACKOFF", "1")
+        monkeypatch.setenv("SPAWN_RETRY_MAX_BACKOFF", "8")
+        mock_train_spawner.let_next_spawn_fail(5)
+        attempt_seconds = []
+        for seconds in range(strategy_start_time, strategy_start_time + 60):
+            attempts = len(mock_train_spawner.attempt_history)
+            regular_train_schedule.maybe_spawn(seconds, spawner)
+            if len(mock_train_spawner.attempt_history) > attempts:
+                attempt_seconds.append(seconds - strategy_start_time)
+        assert attempt_seconds == [0, 1, 3, 7, 15, 23]
+        assert mock_train_spawner.spawn_history == [strategy_start_time]
+        assert regular_train_schedule.failed_spawn_attempts == 5
+        assert regular_train_schedule.pending_spawn_count() == 0
+
+    def test_wake_retry(
+        self,
+        spawner: Spawner,
+        regular_train_schedule: TrainSchedule,
+        mock_train_spawner: object,
+        strategy_start_time: int,
+        monkeypatch,
+    ):
+        monkeypatch.setenv("SPAWN_RETRY_INITIAL_BACKOFF", "10")
+        mock_train_spawner.let_next_spawn_fail()
+        regular_train_schedule.maybe_spawn(strategy_start_time, spawner)
+        assert regular_train_schedule.next_attempt_second() == strategy_start_time + 10
+        regular_train_schedule.maybe_spawn(strategy_start_time + 2, spawner)
+        assert mock_train_spawner.spawn_history == []
+
+        assert regular_train_schedule.wake(strategy_start_time + 2)
+        assert not regular_train_schedule.wake(strategy_start_time + 3)
+        regular_train_schedule.maybe_spawn(strategy_start_time + 2, spawner)
+        assert mock_train_spawner.spawn_history == [strategy_start_time]
+        assert not regular_train_schedule.wake(strategy_start_time + 3)
+
     def test_block_blocked_fails(self, regular_train_schedule: TrainSchedule):
         regular_train_schedule.block()
         with pytest.raises(RuntimeError):